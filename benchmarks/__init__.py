@@ -0,0 +1 @@
+"""Benchmarks - Medições de desempenho do pipeline de captura/decodificação."""
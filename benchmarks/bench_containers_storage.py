@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark - ContainersStorage.get_by_uuid / delete_by_uuid
+Compara a busca linear original (referência) com o índice por uuid, com o
+storage cheio de containers como numa sessão longa.
+
+Uso:
+    python benchmarks/bench_containers_storage.py [--containers 10000 50000] [--lookups 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Callable, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.containers_storage import ContainersStorage, Container
+
+
+# ============================================
+# REFERÊNCIA (implementação anterior por busca linear)
+# ============================================
+
+def legacy_get_by_uuid(storage: ContainersStorage, uuid: bytes) -> Optional[Container]:
+    """Cópia do get_by_uuid original, usada como baseline."""
+    for container in storage.containers.values():
+        if container.uuid == uuid:
+            return container
+    return None
+
+
+def legacy_delete_by_uuid(storage: ContainersStorage, uuid: bytes) -> Optional[Container]:
+    container = legacy_get_by_uuid(storage, uuid)
+    if container:
+        del storage.containers[container.id]
+    return container
+
+
+# ============================================
+# MEDIÇÃO
+# ============================================
+
+def build_storage(count: int) -> Tuple[ContainersStorage, List[bytes]]:
+    storage = ContainersStorage()
+    uuids = [random.randbytes(16) for _ in range(count)]
+    for id, uuid in enumerate(uuids, start=1):
+        storage.add(id, uuid=uuid, type="player", owner=f"Player{id}")
+    return storage, uuids
+
+
+def time_lookups(lookup: Callable, storage: ContainersStorage, keys: List[bytes]) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        lookup(storage, key)
+    return time.perf_counter() - start
+
+
+def time_deletes(delete: Callable, count: int, deletes: int) -> float:
+    storage, uuids = build_storage(count)
+    keys = random.sample(uuids, deletes)
+    start = time.perf_counter()
+    for key in keys:
+        delete(storage, key)
+    return time.perf_counter() - start
+
+
+def report(label: str, legacy: float, indexed: float):
+    """Tempos por operação (segundos)."""
+    print(f"  {label:<16} linear: {legacy * 1e6:>9.2f} µs/op   "
+          f"índice: {indexed * 1e6:>6.3f} µs/op   ({legacy / indexed:,.0f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do índice por uuid do ContainersStorage")
+    parser.add_argument('--containers', type=int, nargs='+', default=[10000, 50000])
+    parser.add_argument('--lookups', type=int, default=20000)
+    args = parser.parse_args()
+    
+    random.seed(1)
+    
+    for count in args.containers:
+        storage, uuids = build_storage(count)
+        
+        # Metade acerta, metade é uuid desconhecido (container ainda não visto)
+        keys = [random.choice(uuids) for _ in range(args.lookups // 2)]
+        keys += [random.randbytes(16) for _ in range(args.lookups - len(keys))]
+        random.shuffle(keys)
+        
+        # A busca linear é lenta demais para o total de operações em storages grandes
+        legacy_keys = keys[:max(100, args.lookups * 1000 // count)]
+        
+        print(f"Containers: {count}")
+        legacy = time_lookups(legacy_get_by_uuid, storage, legacy_keys) / len(legacy_keys)
+        indexed = time_lookups(ContainersStorage.get_by_uuid, storage, keys) / len(keys)
+        report("get_by_uuid", legacy, indexed)
+        
+        deletes = min(len(legacy_keys), count)
+        legacy = time_deletes(legacy_delete_by_uuid, count, deletes) / deletes
+        indexed = time_deletes(ContainersStorage.delete_by_uuid, count, deletes) / deletes
+        report("delete_by_uuid", legacy, indexed)
+
+
+if __name__ == "__main__":
+    main()
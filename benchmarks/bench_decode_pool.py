@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark - DecodePool (decode multiprocesso particionado por fluxo)
+Mede pacotes/s decodificando no próprio processo e com N workers, com o
+tráfego espalhado em vários fluxos (multibox).
+
+Uso:
+    python benchmarks/bench_decode_pool.py [--events 20000] [--flows 8] [--workers 1 2 4]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.flow_table import FlowTable, FlowKey
+from core.photon_decoder import PhotonDecoder
+from core.decode_pool import DecodePool, WorkerConfig
+from services.events_config import EventCodes
+from benchmarks.corpus import build_event_messages, encode_photon_packet, EVENT_PROJECTIONS
+
+
+def build_traffic(events: int, flows: int, per_packet: int = 4) -> List[Tuple[bytes, FlowKey, float]]:
+    """Mesmo corpus repetido em cada fluxo, intercalado como numa captura real."""
+    messages = build_event_messages(events)
+    packets = [
+        encode_photon_packet(messages[i:i + per_packet], start_sequence=i + 1)
+        for i in range(0, len(messages), per_packet)
+    ]
+    keys = [(f"10.0.0.{n + 1}", 5056, "192.168.0.2", 40000 + n) for n in range(flows)]
+    return [(packet, key, 0.0) for packet in packets for key in keys]
+
+
+def run_inline(traffic) -> float:
+    def create_decoder(flow_key: FlowKey) -> PhotonDecoder:
+        decoder = PhotonDecoder()
+        decoder.set_event_projections(EVENT_PROJECTIONS)
+        decoder.on_event(lambda event: None)
+        return decoder
+    
+    flows = FlowTable(create_decoder)
+    start = time.perf_counter()
+    for payload, flow_key, captured_at in traffic:
+        flows.get(flow_key, captured_at).handle_packet(payload)
+    return time.perf_counter() - start
+
+
+def run_pool(traffic, workers: int, batch_size: int = 256) -> float:
+    pool = DecodePool(workers, lambda event: None, WorkerConfig(EventCodes(), None, "EN-US", EVENT_PROJECTIONS))
+    pool.start()
+    
+    # Deixa a subida dos processos fora da medição
+    time.sleep(0.5)
+    
+    start = time.perf_counter()
+    for i in range(0, len(traffic), batch_size):
+        pool.submit(traffic[i:i + batch_size])
+    pool.stop()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do DecodePool")
+    parser.add_argument('--events', type=int, default=20000)
+    parser.add_argument('--flows', type=int, default=8)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+    
+    traffic = build_traffic(args.events, args.flows)
+    
+    inline = run_inline(traffic)
+    print(f"Pacotes: {len(traffic)} em {args.flows} fluxos ({os.cpu_count()} CPUs)")
+    print(f"Mesmo processo:  {len(traffic) / inline:>10,.0f} pacotes/s  ({inline * 1000:.1f} ms)")
+    
+    for workers in args.workers:
+        elapsed = run_pool(traffic, workers)
+        print(f"{workers} worker(s):     {len(traffic) / elapsed:>10,.0f} pacotes/s  ({elapsed * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
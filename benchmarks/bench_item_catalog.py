@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Catálogo de itens: dict de Items x catálogo compilado (mmap)
+Mede a memória que cada processo aloca para ter a lista de itens e o custo
+de get/get_name. O catálogo mapeado não aloca no heap: as páginas do arquivo
+são do page cache e compartilhadas entre todos os processos que o abrem.
+
+Uso:
+    python benchmarks/bench_item_catalog.py [--items 11000] [--lookups 200000]
+    python benchmarks/bench_item_catalog.py --items-json items.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import ItemsService, ItemCatalog, Item, compile_catalog
+from services.item_catalog import CatalogRow
+
+
+LOCALES = ItemsService.SUPPORTED_LOCALES
+
+
+def synthetic_rows(count: int) -> List[CatalogRow]:
+    random.seed(1)
+    families = [f"2H_WEAPON_FAMILY_{n}" for n in range(count // 40 + 1)]
+    rows = []
+    for index in range(count):
+        item_id = f"T{4 + index % 5}_{random.choice(families)}@{index % 4}"
+        rows.append((index, item_id, {
+            "PT-BR": f"Arma de Duas Mãos do Grão-Mestre {index}",
+            "EN-US": f"Grandmaster's Two-Handed Weapon {index}"
+        }))
+    return rows
+
+
+def json_rows(path: str) -> List[CatalogRow]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return list(ItemsService()._json_rows(data))
+
+
+def build_dict(rows: List[CatalogRow]) -> Dict[int, Item]:
+    """Como ItemsService.items era montado antes do catálogo compilado."""
+    return {
+        item_num_id: Item(item_num_id=item_num_id, item_id=item_id, names=dict(names))
+        for item_num_id, item_id, names in rows
+    }
+
+
+def allocated(build: Callable):
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def time_lookups(lookup: Callable, keys: List[int]) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        lookup(key)
+    return (time.perf_counter() - start) / len(keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do catálogo de itens compilado")
+    parser.add_argument('--items', type=int, default=11000)
+    parser.add_argument('--items-json', help="items.json do ao-bin-dumps (em vez de itens sintéticos)")
+    parser.add_argument('--lookups', type=int, default=200000)
+    args = parser.parse_args()
+    
+    rows = json_rows(args.items_json) if args.items_json else synthetic_rows(args.items)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "items.bin")
+        with open(path, 'wb') as f:
+            f.write(compile_catalog(rows, LOCALES))
+        
+        items, dict_bytes = allocated(lambda: build_dict(rows))
+        catalog, catalog_bytes = allocated(lambda: ItemCatalog.open(path))
+        
+        print(f"Itens: {len(rows)}   arquivo compilado: {os.path.getsize(path) / 1024:.0f} KB (compartilhado)")
+        print(f"  Heap por processo   dict: {dict_bytes / 1024:>8.0f} KB   catálogo: {catalog_bytes / 1024:>6.1f} KB")
+        
+        keys = [random.choice(rows)[0] for _ in range(args.lookups)]
+        for label, legacy, compiled in (
+            ("get", items.get, catalog.get),
+            ("get_name", lambda key: items[key].get_name("PT-BR"), lambda key: catalog.get_name(key, "PT-BR")),
+        ):
+            legacy_time = time_lookups(legacy, keys)
+            compiled_time = time_lookups(compiled, keys)
+            print(f"  {label:<10} dict: {legacy_time * 1e6:>6.2f} µs/op   catálogo: {compiled_time * 1e6:>6.2f} µs/op")
+        
+        catalog.close()
+
+
+if __name__ == "__main__":
+    main()
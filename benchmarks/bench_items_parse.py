@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Pico de memória ao carregar o items.json
+Compara o carregamento anterior (response.json(): corpo inteiro em bytes,
+texto decodificado e a lista completa de dicts com todos os idiomas) com a
+leitura em pedaços de iter_json_array. Cada modo roda em um processo novo e
+mede o pico de RSS (ru_maxrss) acima do processo já inicializado.
+
+Uso:
+    python benchmarks/bench_items_parse.py [--items 11000]
+    python benchmarks/bench_items_parse.py --items-json items.json
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import ItemsService, ItemCatalog
+
+
+# Idiomas do items.json do ao-bin-dumps
+DUMP_LOCALES = ["EN-US", "DE-DE", "FR-FR", "RU-RU", "PL-PL", "ES-ES", "PT-BR",
+                "IT-IT", "ZH-CN", "KO-KR", "JA-JP", "ZH-TW", "ID-ID"]
+
+
+class FileResponse:
+    """Corpo do items.json como o requests entrega."""
+    
+    def __init__(self, path: str):
+        self.path = path
+    
+    @property
+    def content(self) -> bytes:
+        with open(self.path, 'rb') as f:
+            return f.read()
+    
+    def json(self):
+        # Mesmo caminho do requests: bytes -> str -> json.loads
+        return json.loads(self.content.decode('utf-8'))
+    
+    def iter_content(self, chunk_size: int):
+        with open(self.path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+
+def write_synthetic(path: str, count: int):
+    """items.json no formato do ao-bin-dumps (nomes e descrições em todos os idiomas)."""
+    random.seed(1)
+    words = ["espada", "grão-mestre", "adepto", "mestre", "elder", "avalon", "bolsa", "capa", "armadura"]
+    
+    def text(length: int) -> str:
+        return " ".join(random.choice(words) for _ in range(length))
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("[\n")
+        for index in range(count):
+            item = {
+                "LocalizationNameVariable": f"@ITEMS_T4_ITEM_{index}",
+                "LocalizationDescriptionVariable": f"@ITEMS_T4_ITEM_{index}_DESC",
+                "LocalizedNames": {locale: text(4) for locale in DUMP_LOCALES},
+                "LocalizedDescriptions": {locale: text(25) for locale in DUMP_LOCALES},
+                "Index": str(index),
+                "UniqueName": f"T{4 + index % 5}_ITEM_{index}@{index % 4}"
+            }
+            f.write(("," if index else "") + json.dumps(item, ensure_ascii=False, indent=2))
+        f.write("\n]")
+
+
+def peak_rss_kb() -> float:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux em KB, macOS em bytes
+    return peak / 1024 if sys.platform == 'darwin' else peak
+
+
+def run_child(mode: str, path: str):
+    service = ItemsService()
+    response = FileResponse(path)
+    baseline = peak_rss_kb()
+    start = time.perf_counter()
+    
+    if mode == "legacy":
+        catalog = ItemCatalog.from_rows(service._json_rows(response.json()), service.SUPPORTED_LOCALES)
+    else:
+        catalog = service._parse_json(response)
+    
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "peak_kb": peak_rss_kb() - baseline,
+        "seconds": elapsed,
+        "items": len(catalog),
+        "catalog_kb": len(catalog.to_bytes()) / 1024
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pico de memória ao carregar items.json")
+    parser.add_argument('--items', type=int, default=11000)
+    parser.add_argument('--items-json', help="items.json do ao-bin-dumps (em vez de um sintético)")
+    parser.add_argument('--child', nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        run_child(*args.child)
+        return
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.items_json
+        if path is None:
+            path = os.path.join(directory, "items.json")
+            write_synthetic(path, args.items)
+        
+        print(f"items.json: {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+        for label, mode in (("response.json()", "legacy"), ("iter_json_array", "stream")):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", mode, path],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"  {label:<16} pico RSS: +{result['peak_kb'] / 1024:>6.1f} MB   "
+                  f"{result['seconds']:>5.2f}s   {result['items']} itens, "
+                  f"catálogo {result['catalog_kb'] / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark - PhotonDecoder.handle_packet
+Mede mensagens/s com decodificação completa e com projeção + pré-filtro.
+
+Uso:
+    python benchmarks/bench_photon_decoder.py [--events 20000] [--rounds 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, FrozenSet, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.photon_decoder import PhotonDecoder
+from benchmarks.corpus import build_event_messages, encode_photon_packet, EVENT_PROJECTIONS
+
+
+def build_packets(count: int, per_packet: int = 4) -> List[bytes]:
+    """Agrupa as mensagens do corpus em datagramas Photon."""
+    messages = build_event_messages(count)
+    return [
+        encode_photon_packet(messages[i:i + per_packet], start_sequence=i + 1)
+        for i in range(0, len(messages), per_packet)
+    ]
+
+
+def run(packets: List[bytes], projections: Optional[Dict[int, FrozenSet[int]]], rounds: int):
+    """Retorna (melhor tempo em segundos, decoder da última passada)."""
+    best = float('inf')
+    decoder = None
+    for _ in range(rounds):
+        decoder = PhotonDecoder()
+        decoder.set_event_projections(projections)
+        decoder.on_event(lambda event: None)
+        
+        start = time.perf_counter()
+        for packet in packets:
+            decoder.handle_packet(packet)
+        best = min(best, time.perf_counter() - start)
+    return best, decoder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do PhotonDecoder")
+    parser.add_argument('--events', type=int, default=20000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    
+    packets = build_packets(args.events)
+    
+    full, _ = run(packets, None, args.rounds)
+    filtered, decoder = run(packets, EVENT_PROJECTIONS, args.rounds)
+    
+    print(f"Mensagens: {args.events} em {len(packets)} pacotes")
+    print(f"Decodificação completa:  {args.events / full:>10,.0f} msg/s  ({full * 1000:.1f} ms)")
+    print(f"Projeção + pré-filtro:   {args.events / filtered:>10,.0f} msg/s  ({filtered * 1000:.1f} ms)")
+    print(f"Speedup: {full / filtered:.2f}x")
+    print(f"Decodificadas: {decoder.stats.messages_decoded} | "
+          f"Pré-filtradas: {decoder.stats.messages_prefiltered}")
+
+
+if __name__ == "__main__":
+    main()
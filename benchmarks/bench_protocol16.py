@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Protocol16.decode_parameter_table
+Compara a cadeia de if/IntEnum original (referência) com a tabela de despacho
+e o unpack em bloco dos slices numéricos.
+
+Uso:
+    python benchmarks/bench_protocol16.py [--events 20000] [--rounds 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+from array import array
+from typing import Any, Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.buffer_reader import BufferReader
+from core.protocol16 import Protocol16, DataType
+from benchmarks.corpus import build_event_tables, EVENT_PROJECTIONS
+
+
+# ============================================
+# REFERÊNCIA (implementação anterior por cadeia de if)
+# ============================================
+
+def legacy_read_param(param_type: int, reader: BufferReader) -> Any:
+    """Cópia do read_param original, usada como baseline."""
+    if param_type == 0 or param_type == DataType.NIL:
+        return None
+    if param_type == DataType.INT8:
+        return reader.read_uint8()
+    if param_type == DataType.FLOAT32:
+        return reader.read_float_be()
+    if param_type == DataType.DOUBLE:
+        return reader.read_double_be()
+    if param_type == DataType.INT32:
+        return reader.read_int32_be()
+    if param_type == 7 or param_type == DataType.INT16:
+        return reader.read_uint16_be()
+    if param_type == DataType.INT64:
+        return reader.read_int64_be()
+    if param_type == DataType.STRING:
+        length = reader.read_uint16_be()
+        return reader.read_string(length)
+    if param_type == DataType.BOOLEAN:
+        value = reader.read_uint8()
+        if value == 0:
+            return False
+        elif value == 1:
+            return True
+        raise ValueError(f"Invalid boolean value: {value}")
+    if param_type == DataType.INT8_SLICE:
+        size = reader.read_uint32_be()
+        return list(reader.read_bytes(size))
+    if param_type == DataType.SLICE:
+        length = reader.read_uint16_be()
+        slice_type = reader.read_uint8()
+        return [legacy_read_param(slice_type, reader) for _ in range(length)]
+    if param_type == DataType.OBJECT_SLICE:
+        length = reader.read_uint16_be()
+        result = []
+        for _ in range(length):
+            item_type = reader.read_uint8()
+            result.append(legacy_read_param(item_type, reader))
+        return result
+    if param_type == DataType.DICTIONARY:
+        key_type = reader.read_uint8()
+        value_type = reader.read_uint8()
+        length = reader.read_uint16_be()
+        result = {}
+        for _ in range(length):
+            key = legacy_read_param(key_type, reader)
+            result[key] = legacy_read_param(value_type, reader)
+        return result
+    if param_type == DataType.HASHTABLE:
+        length = reader.read_uint16_be()
+        result = {}
+        for _ in range(length):
+            key_type = reader.read_uint8()
+            key = legacy_read_param(key_type, reader)
+            value_type = reader.read_uint8()
+            result[key] = legacy_read_param(value_type, reader)
+        return result
+    if param_type == DataType.INT32_SLICE:
+        size = reader.read_uint32_be()
+        return [reader.read_int32_be() for _ in range(size)]
+    if param_type == DataType.STRING_SLICE:
+        length = reader.read_uint16_be()
+        return [legacy_read_param(DataType.STRING, reader) for _ in range(length)]
+    raise ValueError(f"Unknown param type: 0x{param_type:02X}")
+
+
+def legacy_decode_parameter_table(reader: BufferReader) -> dict:
+    parameters = {}
+    for _ in range(reader.read_int16_be()):
+        param_id = reader.read_uint8()
+        param_type = reader.read_uint8()
+        parameters[param_id] = legacy_read_param(param_type, reader)
+    return parameters
+
+
+# ============================================
+# MEDIÇÃO
+# ============================================
+
+def count_values(value: Any) -> int:
+    """Conta valores decodificados (escalares + elementos de coleções)."""
+    if isinstance(value, dict):
+        return sum(1 + count_values(v) for v in value.values())
+    if isinstance(value, array):
+        return len(value) or 1
+    if isinstance(value, (list, tuple)):
+        return sum(count_values(v) for v in value) or 1
+    return 1
+
+
+def as_lists(value: Any) -> Any:
+    """Normaliza array.array/tuplas para listas (comparação com a referência)."""
+    if isinstance(value, dict):
+        return {k: as_lists(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, array)):
+        return [as_lists(v) for v in value]
+    return value
+
+
+def run(decode: Callable[[BufferReader], dict], tables: List[Tuple[int, bytes]], rounds: int) -> float:
+    """Retorna o melhor tempo (segundos) de `rounds` passadas sobre o corpus."""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _, table in tables:
+            decode(BufferReader(table))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de Protocol16.read_param")
+    parser.add_argument('--events', type=int, default=20000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    
+    tables = build_event_tables(args.events)
+    total_values = sum(
+        count_values(Protocol16.decode_parameter_table(BufferReader(table))) for _, table in tables
+    )
+    
+    # Garante que as duas implementações concordam (arrays numéricos viram listas)
+    for _, table in tables[:500]:
+        assert legacy_decode_parameter_table(BufferReader(table)) == \
+            as_lists(Protocol16.decode_parameter_table(BufferReader(table)))
+    
+    before = run(legacy_decode_parameter_table, tables, args.rounds)
+    after = run(Protocol16.decode_parameter_table, tables, args.rounds)
+    projected = run(
+        lambda reader: Protocol16.decode_parameter_table_projected(reader, 252, EVENT_PROJECTIONS),
+        tables, args.rounds
+    )
+    
+    print(f"Eventos: {len(tables)} | Valores: {total_values}")
+    print(f"Antes (if/IntEnum): {total_values / before:>12,.0f} valores/s  ({before * 1000:.1f} ms)")
+    print(f"Depois (despacho):  {total_values / after:>12,.0f} valores/s  ({after * 1000:.1f} ms)")
+    print(f"Speedup: {before / after:.2f}x")
+    print(f"Projeção (handlers): {len(tables) / projected:>10,.0f} eventos/s  ({projected * 1000:.1f} ms, "
+          f"{before / projected:.2f}x vs antes)")
+
+
+if __name__ == "__main__":
+    main()
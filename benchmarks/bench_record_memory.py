@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Memória por LootEvent e por Player
+Compara os registros anteriores (dataclass com __dict__, uma cópia de cada
+string por registro) com os registros com __slots__ + intern_str, no cenário
+de um frontend que guarda todos os eventos recebidos do LootRing/daemon
+(cada campo chega como uma string nova).
+
+Uso:
+    python benchmarks/bench_record_memory.py [--events 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import LootEvent
+from storage import Player
+from utils import intern_str
+
+
+# ============================================
+# REFERÊNCIA (registros anteriores)
+# ============================================
+
+@dataclass
+class LegacyPlayer:
+    name: str
+    guild: str = ""
+    alliance: str = ""
+
+
+@dataclass
+class LegacyLootEvent:
+    timestamp: datetime
+    item_id: str
+    item_name: str
+    quantity: int
+    looted_by: LegacyPlayer
+    looted_from: LegacyPlayer
+
+
+# ============================================
+# CORPUS
+# ============================================
+
+def fresh(text: str) -> str:
+    """Cópia nova da string, como sai do decode de um frame."""
+    return text.encode('utf-8').decode('utf-8')
+
+
+def build_corpus(events: int):
+    random.seed(1)
+    alliances = [f"ALY{n}" for n in range(50)] + [""]
+    guilds = [(f"Guild Number {n}", random.choice(alliances)) for n in range(400)]
+    players = [(f"Player{n:05d}",) + random.choice(guilds) for n in range(events // 20)]
+    items = [(f"T{4 + n % 5}_2H_SWORD_LEVEL{n % 4}@{n % 4}", f"Espada Grande do Adepto {n}") for n in range(800)]
+    
+    start = datetime(2024, 1, 1)
+    return [
+        (start + timedelta(seconds=n), random.choice(items), random.randint(1, 999),
+         random.choice(players), random.choice(players))
+        for n in range(events)
+    ]
+
+
+def make_legacy_event(timestamp, item, quantity, by, source):
+    return LegacyLootEvent(
+        timestamp, fresh(item[0]), fresh(item[1]), quantity,
+        LegacyPlayer(fresh(by[0]), fresh(by[1]), fresh(by[2])),
+        LegacyPlayer(fresh(source[0]), fresh(source[1]), fresh(source[2]))
+    )
+
+
+def make_event(timestamp, item, quantity, by, source):
+    return LootEvent(
+        timestamp, intern_str(fresh(item[0])), intern_str(fresh(item[1])), quantity,
+        Player(intern_str(fresh(by[0])), intern_str(fresh(by[1])), intern_str(fresh(by[2]))),
+        Player(intern_str(fresh(source[0])), intern_str(fresh(source[1])), intern_str(fresh(source[2])))
+    )
+
+
+def make_legacy_player(name, guild, alliance):
+    return LegacyPlayer(fresh(name), fresh(guild), fresh(alliance))
+
+
+def make_player(name, guild, alliance):
+    return Player(intern_str(fresh(name)), intern_str(fresh(guild)), intern_str(fresh(alliance)))
+
+
+def measure(build: Callable, rows: List) -> float:
+    """Bytes alocados por registro mantido."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    records = [build(*row) for row in rows]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Desconta a lista que segura os registros
+    return (after - before - sys.getsizeof(records)) / len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memória dos registros")
+    parser.add_argument('--events', type=int, default=100000)
+    args = parser.parse_args()
+    
+    corpus = build_corpus(args.events)
+    player_rows = [row[3] for row in corpus]
+    
+    legacy = measure(make_legacy_event, corpus)
+    compact = measure(make_event, corpus)
+    print(f"LootEvent ({args.events} eventos): {legacy:>6.0f} B -> {compact:>6.0f} B por evento ({legacy / compact:.1f}x)")
+    
+    legacy = measure(make_legacy_player, player_rows)
+    compact = measure(make_player, player_rows)
+    print(f"Player    ({len(player_rows)} registros): {legacy:>6.0f} B -> {compact:>6.0f} B por jogador ({legacy / compact:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
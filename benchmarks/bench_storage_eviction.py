@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Remoção no MemoryStorage (TTL, LRU e troca de zona)
+Simula uma sessão longa de open world com relógio simulado e mostra, hora a
+hora, a ocupação dos storages e a memória alocada (tracemalloc), com e sem
+a política de remoção.
+
+Uso:
+    python benchmarks/bench_storage_eviction.py [--hours 12] [--items-per-second 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.memory_storage import MemoryStorage, EvictionPolicy
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def simulate(hours: int, items_per_second: int, policy: EvictionPolicy, zone_minutes: int):
+    random.seed(1)
+    clock = SimulatedClock()
+    storage = MemoryStorage(policy, clock)
+    
+    object_id = 0
+    container_id = 0
+    player_id = 0
+    
+    tracemalloc.start()
+    print(f"{'hora':>4} {'itens':>8} {'containers':>10} {'jogadores':>10} {'memória':>10}")
+    
+    for second in range(1, hours * 3600 + 1):
+        clock.now = float(second)
+        
+        # Itens novos (EvNewSimpleItem/EvNewEquipmentItem)
+        for _ in range(items_per_second):
+            object_id += 1
+            storage.loots.add(object_id, "T4_BAG", "Bolsa do Adepto", 1)
+        
+        # Jogadores entrando no alcance (EvNewCharacter)
+        if second % 2 == 0:
+            player_id += 1
+            storage.players.add(f"Player{player_id}", "Guild", "")
+        
+        # Loot bag aberta com parte dos itens recentes (EvAttachItemContainer)
+        if second % 5 == 0:
+            container_id += 1
+            container = storage.containers.add(container_id, uuid=f"uuid-{container_id}", type="monster")
+            for position in range(8):
+                loot = storage.loots.get_by_id(object_id - random.randrange(items_per_second * 5))
+                if loot is not None:
+                    container.items[position] = loot
+        
+        if zone_minutes and second % (zone_minutes * 60) == 0:
+            storage.change_zone()
+        
+        storage.maintain()
+        
+        if second % 3600 == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            print(f"{second // 3600:>4} {len(storage.loots):>8} {len(storage.containers):>10} "
+                  f"{len(storage.players):>10} {current / 1024 / 1024:>8.1f}MB")
+    
+    tracemalloc.stop()
+    
+    stats = storage.stats()
+    for label, store in (("Itens", stats.loots), ("Containers", stats.containers), ("Jogadores", stats.players)):
+        print(f"  {label}: removidos {store.evicted_ttl} por TTL, {store.evicted_lru} por LRU, {store.evicted_zone} na troca de zona")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da remoção no MemoryStorage")
+    parser.add_argument('--hours', type=int, default=12)
+    parser.add_argument('--items-per-second', type=int, default=20)
+    parser.add_argument('--zone-minutes', type=int, default=0,
+                        help="Troca de zona a cada N minutos (0 = sessão inteira na mesma zona)")
+    args = parser.parse_args()
+    
+    print("Sem remoção:")
+    simulate(args.hours, args.items_per_second, EvictionPolicy(0, 0, 0, 0, 0, 0), args.zone_minutes)
+    print()
+    print("Política padrão:")
+    simulate(args.hours, args.items_per_second, EvictionPolicy(), args.zone_minutes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Corpus - Gera mensagens Photon/Protocol16 sintéticas para benchmarks
+Os formatos imitam os eventos reais do Albion (movimento, personagens, itens, containers)
+"""
+
+import random
+import struct
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+from core.protocol16 import DataType
+
+
+# ============================================
+# ENCODER PROTOCOL16 (inverso do decoder)
+# ============================================
+
+def encode_value(param_type: int, value: Any) -> bytes:
+    """Serializa um valor no formato Protocol16 (sem o byte de tipo)."""
+    if param_type == DataType.NIL:
+        return b''
+    if param_type == DataType.INT8:
+        return struct.pack('>B', value)
+    if param_type == DataType.BOOLEAN:
+        return struct.pack('>B', 1 if value else 0)
+    if param_type == DataType.INT16:
+        return struct.pack('>H', value)
+    if param_type == DataType.INT32:
+        return struct.pack('>i', value)
+    if param_type == DataType.INT64:
+        return struct.pack('>q', value)
+    if param_type == DataType.FLOAT32:
+        return struct.pack('>f', value)
+    if param_type == DataType.DOUBLE:
+        return struct.pack('>d', value)
+    if param_type == DataType.STRING:
+        raw = value.encode('utf-8')
+        return struct.pack('>H', len(raw)) + raw
+    if param_type == DataType.INT8_SLICE:
+        return struct.pack('>I', len(value)) + bytes(value)
+    if param_type == DataType.INT32_SLICE:
+        return struct.pack('>I', len(value)) + struct.pack(f'>{len(value)}i', *value)
+    if param_type == DataType.STRING_SLICE:
+        return struct.pack('>H', len(value)) + b''.join(encode_value(DataType.STRING, v) for v in value)
+    if param_type == DataType.SLICE:
+        item_type, items = value
+        return struct.pack('>HB', len(items), item_type) + b''.join(encode_value(item_type, v) for v in items)
+    if param_type == DataType.OBJECT_SLICE:
+        return struct.pack('>H', len(value)) + b''.join(
+            struct.pack('>B', t) + encode_value(t, v) for t, v in value
+        )
+    if param_type == DataType.HASHTABLE:
+        return struct.pack('>H', len(value)) + b''.join(
+            struct.pack('>B', kt) + encode_value(kt, k) + struct.pack('>B', vt) + encode_value(vt, v)
+            for (kt, k), (vt, v) in value
+        )
+    if param_type == DataType.DICTIONARY:
+        key_type, value_type, items = value
+        return struct.pack('>BBH', key_type, value_type, len(items)) + b''.join(
+            encode_value(key_type, k) + encode_value(value_type, v) for k, v in items
+        )
+    raise ValueError(f"Tipo não suportado pelo encoder: 0x{param_type:02X}")
+
+
+def encode_parameter_table(params: Dict[int, Tuple[int, Any]]) -> bytes:
+    """Serializa uma tabela de parâmetros {id: (tipo, valor)}."""
+    out = [struct.pack('>h', len(params))]
+    for param_id, (param_type, value) in params.items():
+        out.append(struct.pack('>BB', param_id, param_type))
+        out.append(encode_value(param_type, value))
+    return b''.join(out)
+
+
+def encode_event(event_code: int, params: Dict[int, Tuple[int, Any]]) -> bytes:
+    """Serializa o corpo de um Event Data (após flag/message type)."""
+    return struct.pack('>B', event_code) + encode_parameter_table(params)
+
+
+def encode_reliable_message(message_type: int, body: bytes) -> bytes:
+    """Prefixa flag 0xF3 + message type (formato de _handle_reliable)."""
+    return struct.pack('>BB', 0xF3, message_type) + body
+
+
+def encode_photon_packet(messages: List[bytes], command_type: int = 0x06,
+                         start_sequence: int = 1, channel_id: int = 0,
+                         peer_id: int = 0) -> bytes:
+    """Monta um datagrama Photon com um comando por mensagem."""
+    header = struct.pack('>HBBIi', peer_id, 0, len(messages), 0, 0)
+    commands = []
+    for i, message in enumerate(messages):
+        extra = b''
+        if command_type == 0x07:
+            extra = struct.pack('>i', 0)
+        length = 12 + len(extra) + len(message)
+        commands.append(
+            struct.pack('>BBBBii', command_type, channel_id, 0, 0, length, start_sequence + i)
+            + extra + message
+        )
+    return header + b''.join(commands)
+
+
+# ============================================
+# EVENTOS REALISTAS
+# ============================================
+
+def _uuid(rng: random.Random) -> List[int]:
+    return [rng.randrange(256) for _ in range(16)]
+
+
+def _name(rng: random.Random, size: int = 10) -> str:
+    return ''.join(rng.choice('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(size))
+
+
+def move_event(rng: random.Random) -> Dict[int, Tuple[int, Any]]:
+    """Evento de movimento (event code 3) - maior parte do tráfego."""
+    return {
+        0: (DataType.INT32, rng.randrange(1, 500000)),
+        1: (DataType.INT8_SLICE, [rng.randrange(256) for _ in range(30)]),
+        252: (DataType.INT16, 3),
+    }
+
+
+def health_update_event(rng: random.Random, event_id: int = 6) -> Dict[int, Tuple[int, Any]]:
+    """Evento de combate (dano/cura) encapsulado em event code 1."""
+    return {
+        0: (DataType.INT32, rng.randrange(1, 500000)),
+        1: (DataType.INT64, rng.randrange(1 << 40)),
+        2: (DataType.FLOAT32, rng.uniform(-500, 0)),
+        3: (DataType.FLOAT32, rng.uniform(0, 3000)),
+        4: (DataType.INT8, rng.randrange(4)),
+        6: (DataType.INT32, rng.randrange(1, 500000)),
+        7: (DataType.INT16, rng.randrange(3000)),
+        252: (DataType.INT16, event_id),
+    }
+
+
+def new_character_event(rng: random.Random, event_id: int = 29) -> Dict[int, Tuple[int, Any]]:
+    """EvNewCharacter - personagem com equipamento, posição e buffs."""
+    return {
+        0: (DataType.INT32, rng.randrange(1, 500000)),
+        1: (DataType.STRING, _name(rng)),
+        5: (DataType.INT8_SLICE, _uuid(rng)),
+        7: (DataType.INT8_SLICE, _uuid(rng)),
+        8: (DataType.STRING, _name(rng, 8)),
+        12: (DataType.SLICE, (DataType.FLOAT32, [rng.uniform(-300, 300), rng.uniform(-300, 300)])),
+        13: (DataType.FLOAT32, rng.uniform(0, 360)),
+        16: (DataType.INT64, rng.randrange(1 << 40)),
+        22: (DataType.FLOAT32, rng.uniform(1000, 5000)),
+        23: (DataType.FLOAT32, rng.uniform(1000, 5000)),
+        26: (DataType.SLICE, (DataType.INT16, [rng.randrange(1, 9000) for _ in range(10)])),
+        28: (DataType.INT32_SLICE, [rng.randrange(1, 500000) for _ in range(40)]),
+        33: (DataType.SLICE, (DataType.INT32, [rng.randrange(0, 100000) for _ in range(16)])),
+        40: (DataType.HASHTABLE, [((DataType.INT8, i), (DataType.INT16, rng.randrange(1000))) for i in range(6)]),
+        43: (DataType.STRING, _name(rng, 6)),
+        51: (DataType.BOOLEAN, rng.random() < 0.5),
+        252: (DataType.INT16, event_id),
+    }
+
+
+def character_stats_event(rng: random.Random, event_id: int = 143) -> Dict[int, Tuple[int, Any]]:
+    """EvCharacterStats - estatísticas com arrays numéricos."""
+    return {
+        0: (DataType.INT32, rng.randrange(1, 500000)),
+        2: (DataType.STRING, _name(rng, 8)),
+        4: (DataType.STRING, _name(rng, 6)),
+        5: (DataType.STRING, _name(rng)),
+        9: (DataType.SLICE, (DataType.DOUBLE, [rng.uniform(0, 1e6) for _ in range(24)])),
+        10: (DataType.SLICE, (DataType.INT64, [rng.randrange(1 << 40) for _ in range(12)])),
+        11: (DataType.STRING_SLICE, [_name(rng, 5) for _ in range(4)]),
+        252: (DataType.INT16, event_id),
+    }
+
+
+def new_simple_item_event(rng: random.Random, event_id: int = 32) -> Dict[int, Tuple[int, Any]]:
+    """EvNewSimpleItem."""
+    return {
+        0: (DataType.INT32, rng.randrange(1, 500000)),
+        1: (DataType.INT16, rng.randrange(1, 9000)),
+        2: (DataType.INT16, rng.randrange(1, 999)),
+        4: (DataType.INT64, rng.randrange(1 << 40)),
+        252: (DataType.INT16, event_id),
+    }
+
+
+def attach_item_container_event(rng: random.Random, event_id: int = 98) -> Dict[int, Tuple[int, Any]]:
+    """EvAttachItemContainer - uuid + inventário de objectIds."""
+    return {
+        0: (DataType.INT32, rng.randrange(1, 500000)),
+        1: (DataType.INT8_SLICE, _uuid(rng)),
+        3: (DataType.SLICE, (DataType.INT32, [rng.randrange(0, 500000) for _ in range(48)])),
+        4: (DataType.INT32, 48),
+        252: (DataType.INT16, event_id),
+    }
+
+
+def other_grabbed_loot_event(rng: random.Random, event_id: int = 275) -> Dict[int, Tuple[int, Any]]:
+    """EvOtherGrabbedLoot."""
+    return {
+        0: (DataType.INT32, rng.randrange(1, 500000)),
+        1: (DataType.STRING, _name(rng)),
+        2: (DataType.STRING, _name(rng)),
+        3: (DataType.BOOLEAN, False),
+        4: (DataType.INT16, rng.randrange(1, 9000)),
+        5: (DataType.INT16, rng.randrange(1, 50)),
+        252: (DataType.INT16, event_id),
+    }
+
+
+# Mistura aproximada de uma luta em mundo aberto
+EVENT_MIX = [
+    (3, move_event, 60),
+    (1, health_update_event, 20),
+    (1, new_character_event, 6),
+    (1, character_stats_event, 4),
+    (1, new_simple_item_event, 5),
+    (1, attach_item_container_event, 3),
+    (1, other_grabbed_loot_event, 2),
+]
+
+
+# Projeções equivalentes a DataHandler.event_projections() para os IDs acima
+# (espelha handlers/events/*.PARAMS)
+EVENT_PROJECTIONS: Dict[int, FrozenSet[int]] = {
+    29: frozenset({0, 1, 8, 43}),
+    143: frozenset({0, 2, 4, 5}),
+    32: frozenset({0, 1, 2, 5}),
+    98: frozenset({0, 1, 3, 4}),
+    275: frozenset({1, 2, 3, 4, 5}),
+}
+
+
+def build_event_tables(count: int, seed: int = 1234) -> List[Tuple[int, bytes]]:
+    """Gera `count` eventos serializados como (event_code, corpo sem event_code)."""
+    rng = random.Random(seed)
+    population = [(code, factory) for code, factory, _ in EVENT_MIX]
+    weights = [weight for _, _, weight in EVENT_MIX]
+    
+    result = []
+    for _ in range(count):
+        code, factory = rng.choices(population, weights)[0]
+        result.append((code, encode_parameter_table(factory(rng))))
+    return result
+
+
+def build_event_messages(count: int, seed: int = 1234) -> List[bytes]:
+    """Gera mensagens reliable completas (flag + EVENT_DATA + evento)."""
+    return [
+        encode_reliable_message(0x04, bytes([code]) + table)
+        for code, table in build_event_tables(count, seed)
+    ]
@@ -2,15 +2,30 @@
 
 from .buffer_reader import BufferReader
 from .protocol16 import Protocol16, DataType
-from .photon_decoder import PhotonDecoder, CommandType, MessageType
-from .sniffer import AlbionSniffer as Sniffer
+from .photon_decoder import PhotonDecoder, DecoderStats, CommandType, MessageType
+from .flow_table import FlowTable
+from .packet_queue import PacketQueue, QueueStats
+from .sniffer import AlbionSniffer as Sniffer, ReplayStats
+from .loot_ring import LootRing, LootRingReader
+from .capture_process import CaptureProcess
+from .loot_daemon import LootDaemon, LootDaemonClient
 
 __all__ = [
     'BufferReader',
     'Protocol16',
     'DataType',
     'PhotonDecoder',
+    'DecoderStats',
     'CommandType',
     'MessageType',
-    'Sniffer'
+    'FlowTable',
+    'PacketQueue',
+    'QueueStats',
+    'Sniffer',
+    'ReplayStats',
+    'LootRing',
+    'LootRingReader',
+    'CaptureProcess',
+    'LootDaemon',
+    'LootDaemonClient'
 ]
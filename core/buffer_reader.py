@@ -1,108 +1,150 @@
 """
 Buffer Reader - Leitor de bytes com suporte a Big Endian
 Baseado no buffer-reader.js do projeto original
+
+O leitor envolve um único memoryview do payload UDP. Sub-readers e
+read_view() são views do mesmo buffer (sem cópia), cada um com seus
+próprios limites.
 """
 
 import struct
-from typing import Optional
+from typing import Optional, Union
+
+
+# Structs pré-compiladas (evita parse do formato a cada leitura)
+_INT8 = struct.Struct('>b')
+_INT16 = struct.Struct('>h')
+_UINT16 = struct.Struct('>H')
+_INT32 = struct.Struct('>i')
+_UINT32 = struct.Struct('>I')
+_INT64 = struct.Struct('>q')
+_FLOAT = struct.Struct('>f')
+_DOUBLE = struct.Struct('>d')
+
+
+BufferLike = Union[bytes, bytearray, memoryview]
 
 
 class BufferReader:
     """Leitor de buffer binário com métodos para leitura Big Endian."""
     
-    def __init__(self, data: bytes):
-        self.buffer = data
+    def __init__(self, data: BufferLike):
+        view = data if isinstance(data, memoryview) else memoryview(data)
+        if view.format != 'B' or view.ndim != 1:
+            view = view.cast('B')
+        
+        self.buffer = view
         self.position = 0
+        self._length = len(view)
     
     @property
     def length(self) -> int:
-        return len(self.buffer)
+        return self._length
     
     @property
     def remaining(self) -> int:
-        return self.length - self.position
+        return self._length - self.position
     
     def _check_bounds(self, size: int):
-        if self.position < 0 or self.position + size > self.length:
-            raise BufferError(f"Out of bounds read: position={self.position}, size={size}, length={self.length}")
+        if self.position < 0 or size < 0 or self.position + size > self._length:
+            self._out_of_bounds(size)
+    
+    def _out_of_bounds(self, size: int):
+        raise BufferError(f"Out of bounds read: position={self.position}, size={size}, length={self._length}")
     
     def read_int8(self) -> int:
         """Lê 1 byte como signed int."""
-        self._check_bounds(1)
-        value = struct.unpack_from('>b', self.buffer, self.position)[0]
-        self.position += 1
-        return value
+        position = self.position
+        if position + 1 > self._length:
+            self._out_of_bounds(1)
+        self.position = position + 1
+        return _INT8.unpack_from(self.buffer, position)[0]
     
     def read_uint8(self) -> int:
         """Lê 1 byte como unsigned int."""
-        self._check_bounds(1)
-        value = struct.unpack_from('>B', self.buffer, self.position)[0]
-        self.position += 1
-        return value
+        position = self.position
+        if position + 1 > self._length:
+            self._out_of_bounds(1)
+        self.position = position + 1
+        return self.buffer[position]
     
     def read_int16_be(self) -> int:
         """Lê 2 bytes como signed int Big Endian."""
-        self._check_bounds(2)
-        value = struct.unpack_from('>h', self.buffer, self.position)[0]
-        self.position += 2
-        return value
+        position = self.position
+        if position + 2 > self._length:
+            self._out_of_bounds(2)
+        self.position = position + 2
+        return _INT16.unpack_from(self.buffer, position)[0]
     
     def read_uint16_be(self) -> int:
         """Lê 2 bytes como unsigned int Big Endian."""
-        self._check_bounds(2)
-        value = struct.unpack_from('>H', self.buffer, self.position)[0]
-        self.position += 2
-        return value
+        position = self.position
+        if position + 2 > self._length:
+            self._out_of_bounds(2)
+        self.position = position + 2
+        return _UINT16.unpack_from(self.buffer, position)[0]
     
     def read_int32_be(self) -> int:
         """Lê 4 bytes como signed int Big Endian."""
-        self._check_bounds(4)
-        value = struct.unpack_from('>i', self.buffer, self.position)[0]
-        self.position += 4
-        return value
+        position = self.position
+        if position + 4 > self._length:
+            self._out_of_bounds(4)
+        self.position = position + 4
+        return _INT32.unpack_from(self.buffer, position)[0]
     
     def read_uint32_be(self) -> int:
         """Lê 4 bytes como unsigned int Big Endian."""
-        self._check_bounds(4)
-        value = struct.unpack_from('>I', self.buffer, self.position)[0]
-        self.position += 4
-        return value
+        position = self.position
+        if position + 4 > self._length:
+            self._out_of_bounds(4)
+        self.position = position + 4
+        return _UINT32.unpack_from(self.buffer, position)[0]
     
     def read_int64_be(self) -> int:
         """Lê 8 bytes como signed int Big Endian."""
-        self._check_bounds(8)
-        value = struct.unpack_from('>q', self.buffer, self.position)[0]
-        self.position += 8
-        return value
+        position = self.position
+        if position + 8 > self._length:
+            self._out_of_bounds(8)
+        self.position = position + 8
+        return _INT64.unpack_from(self.buffer, position)[0]
     
     def read_float_be(self) -> float:
         """Lê 4 bytes como float Big Endian."""
-        self._check_bounds(4)
-        value = struct.unpack_from('>f', self.buffer, self.position)[0]
-        self.position += 4
-        return value
+        position = self.position
+        if position + 4 > self._length:
+            self._out_of_bounds(4)
+        self.position = position + 4
+        return _FLOAT.unpack_from(self.buffer, position)[0]
     
     def read_double_be(self) -> float:
         """Lê 8 bytes como double Big Endian."""
-        self._check_bounds(8)
-        value = struct.unpack_from('>d', self.buffer, self.position)[0]
-        self.position += 8
-        return value
-    
-    def read_bytes(self, length: Optional[int] = None) -> bytes:
-        """Lê N bytes do buffer."""
+        position = self.position
+        if position + 8 > self._length:
+            self._out_of_bounds(8)
+        self.position = position + 8
+        return _DOUBLE.unpack_from(self.buffer, position)[0]
+    
+    def read_view(self, length: Optional[int] = None) -> memoryview:
+        """Lê N bytes como view do buffer (sem cópia)."""
         if length is None:
             length = self.remaining
         
         self._check_bounds(length)
-        data = self.buffer[self.position:self.position + length]
-        self.position += length
-        return data
+        position = self.position
+        self.position = position + length
+        return self.buffer[position:position + length]
+    
+    def read_bytes(self, length: Optional[int] = None) -> bytes:
+        """Lê N bytes do buffer (cópia em bytes)."""
+        return self.read_view(length).tobytes()
     
     def read_string(self, length: int) -> str:
         """Lê N bytes e converte para string UTF-8."""
-        data = self.read_bytes(length)
-        return data.decode('utf-8', errors='replace')
+        return str(self.read_view(length), 'utf-8', 'replace')
+    
+    def sub_reader(self, length: int) -> 'BufferReader':
+        """Retorna um reader para os próximos N bytes (mesmo buffer, limites próprios)."""
+        return BufferReader(self.read_view(length))
     
     def skip(self, length: int):
         """Pula N bytes."""
@@ -110,7 +152,7 @@ class BufferReader:
         self.position += length
     
     def slice(self, end: Optional[int] = None) -> bytes:
-        """Retorna slice do buffer da posição atual até end."""
+        """Retorna cópia do buffer da posição atual até end (sem cópia: read_view)."""
         if end is None:
-            end = self.length
-        return self.buffer[self.position:end]
+            end = self._length
+        return self.buffer[self.position:end].tobytes()
@@ -0,0 +1,65 @@
+"""Capture module - Backends de captura de pacotes UDP."""
+
+from typing import List, Optional
+
+from .base import CaptureBackend, CaptureSettings, CaptureStats, PayloadCallback, PayloadProgress, FlowKey
+from .scapy_backend import ScapyBackend
+from .af_packet import AfPacketBackend
+from .tpacket_v3 import TPacketV3Backend
+from .pcap import PcapReader, PcapReplayBackend, PcapError
+from .recorder import PacketRecorder
+
+
+BACKENDS = {
+    TPacketV3Backend.name: TPacketV3Backend,
+    AfPacketBackend.name: AfPacketBackend,
+    ScapyBackend.name: ScapyBackend,
+    PcapReplayBackend.name: PcapReplayBackend,
+}
+
+# Backends de captura ao vivo, em ordem de preferência para "auto"
+AUTO_BACKENDS = [TPacketV3Backend, AfPacketBackend, ScapyBackend]
+
+
+def open_backend(name: str, ports: List[int],
+                 settings: Optional[CaptureSettings] = None) -> CaptureBackend:
+    """
+    Abre o backend pedido. Com "auto", tenta cada backend suportado em ordem
+    de preferência e cai para o próximo se a abertura falhar (ex.: sem root).
+    """
+    if name != "auto":
+        backend = BACKENDS[name](ports, settings)
+        backend.open()
+        return backend
+    
+    last_error: Optional[Exception] = None
+    for backend_class in AUTO_BACKENDS:
+        if not backend_class.is_supported():
+            continue
+        backend = backend_class(ports, settings)
+        try:
+            backend.open()
+            return backend
+        except OSError as e:
+            last_error = e
+    
+    raise RuntimeError(f"Nenhum backend de captura disponível ({last_error})")
+
+
+__all__ = [
+    'CaptureBackend',
+    'CaptureSettings',
+    'CaptureStats',
+    'PayloadCallback',
+    'FlowKey',
+    'ScapyBackend',
+    'AfPacketBackend',
+    'TPacketV3Backend',
+    'PcapReader',
+    'PcapReplayBackend',
+    'PcapError',
+    'PacketRecorder',
+    'BACKENDS',
+    'AUTO_BACKENDS',
+    'open_backend',
+]
@@ -0,0 +1,163 @@
+"""
+AF_PACKET Backend - Captura raw no Linux com filtro BPF no kernel
+Lê cada datagrama em um buffer reutilizado e recorta o payload UDP por
+aritmética de offsets, sem montar objetos por pacote.
+"""
+
+import socket
+import struct
+import sys
+from typing import Callable, Dict, Optional, Tuple
+
+from .base import CaptureBackend, CaptureSettings, CaptureStats, PayloadCallback, FlowKey
+from .bpf import udp_ports_program, attach_filter
+
+
+# Todos os protocolos: um socket ETH_P_IP não recebe os pacotes que o próprio
+# host envia (dev_queue_xmit_nit só copia a saída para taps ETH_P_ALL), e os
+# requests cliente -> servidor sumiriam. O BPF descarta o que não é IPv4.
+ETH_P_ALL = 0x0003
+
+# linux/if_packet.h
+SOL_PACKET = 263
+PACKET_STATISTICS = 6
+
+# Tamanho máximo de um datagrama IPv4
+RECV_BUFFER_SIZE = 65535
+
+# Buffer de recepção do kernel (SO_RCVBUF)
+SOCKET_RCVBUF = 4 * 1024 * 1024
+
+# Intervalo para checar should_stop() (segundos)
+POLL_TIMEOUT = 0.5
+
+_UDP_HEADER = struct.Struct('>HHH')
+
+# struct tpacket_stats { tp_packets, tp_drops }
+_TPACKET_STATS = struct.Struct('II')
+
+
+def open_packet_socket(ports, interface: Optional[str] = None) -> socket.socket:
+    """
+    Abre um socket AF_PACKET/SOCK_DGRAM com o filtro BPF das portas.
+    
+    SOCK_DGRAM remove o header de enlace: o pacote (e o BPF) começa no header IP.
+    """
+    sock = socket.socket(socket.AF_PACKET, socket.SOCK_DGRAM, socket.htons(ETH_P_ALL))
+    try:
+        attach_filter(sock, udp_ports_program(ports))
+        if interface:
+            sock.bind((interface, 0))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def read_packet_statistics(sock: socket.socket, stats: CaptureStats,
+                           layout: struct.Struct = _TPACKET_STATS):
+    """Soma PACKET_STATISTICS em stats (o kernel zera os contadores a cada leitura)."""
+    values = layout.unpack(sock.getsockopt(SOL_PACKET, PACKET_STATISTICS, layout.size))
+    stats.packets += values[0]
+    stats.drops += values[1]
+    if len(values) > 2:
+        stats.freezes += values[2]
+
+
+def parse_ipv4_udp(view: memoryview, length: int,
+                   flow_cache: Dict[bytes, FlowKey]) -> Optional[Tuple[memoryview, FlowKey]]:
+    """
+    Recorta (payload UDP, fluxo) de um pacote IPv4 começando no header IP.
+    
+    `flow_cache` evita formatar os IPs a cada pacote do mesmo fluxo.
+    """
+    if length < 28 or view[0] >> 4 != 4:
+        return None
+    
+    header_length = (view[0] & 0x0F) * 4
+    if header_length < 20 or header_length + 8 > length:
+        return None
+    
+    src_port, dst_port, udp_length = _UDP_HEADER.unpack_from(view, header_length)
+    
+    payload_start = header_length + 8
+    payload_end = min(header_length + udp_length, length)
+    if payload_end <= payload_start:
+        return None
+    
+    # Endereços (12:20) + portas identificam o fluxo
+    raw_key = bytes(view[12:20]) + bytes(view[header_length:header_length + 4])
+    flow_key = flow_cache.get(raw_key)
+    if flow_key is None:
+        flow_key = (
+            socket.inet_ntoa(raw_key[0:4]), src_port,
+            socket.inet_ntoa(raw_key[4:8]), dst_port
+        )
+        flow_cache[raw_key] = flow_key
+    
+    return view[payload_start:payload_end], flow_key
+
+
+class AfPacketBackend(CaptureBackend):
+    """Captura via socket AF_PACKET (Linux) com BPF anexado por SO_ATTACH_FILTER."""
+    
+    name = "af_packet"
+    
+    def __init__(self, ports, settings: Optional[CaptureSettings] = None):
+        super().__init__(ports, settings)
+        self._sock: Optional[socket.socket] = None
+        self._stats = CaptureStats()
+    
+    @classmethod
+    def is_supported(cls) -> bool:
+        return sys.platform.startswith('linux') and hasattr(socket, 'AF_PACKET')
+    
+    def open(self):
+        sock = open_packet_socket(self.ports, self.settings.interface)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF)
+            sock.settimeout(POLL_TIMEOUT)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+    
+    def run(self, on_payload: PayloadCallback, should_stop: Callable[[], bool]):
+        if self._sock is None:
+            self.open()
+        
+        sock = self._sock
+        buffer = bytearray(RECV_BUFFER_SIZE)
+        view = memoryview(buffer)
+        flow_cache: Dict[bytes, FlowKey] = {}
+        
+        while not should_stop():
+            try:
+                length = sock.recv_into(buffer)
+            except socket.timeout:
+                continue
+            except InterruptedError:
+                continue
+            
+            parsed = parse_ipv4_udp(view, length, flow_cache)
+            if parsed is not None:
+                on_payload(*parsed)
+            
+            # Fluxos antigos não crescem o cache indefinidamente
+            if len(flow_cache) > 4096:
+                flow_cache.clear()
+    
+    def stats(self) -> CaptureStats:
+        sock = self._sock
+        if sock is not None:
+            try:
+                read_packet_statistics(sock, self._stats)
+            except OSError:
+                pass
+        return CaptureStats(self._stats.packets, self._stats.drops, self._stats.freezes)
+    
+    def close(self):
+        if self._sock is not None:
+            self.stats()
+            self._sock.close()
+            self._sock = None
@@ -0,0 +1,91 @@
+"""
+Capture Backend - Interface dos backends de captura
+Um backend entrega o payload UDP de cada datagrama das portas do Albion
+junto com o fluxo (src ip, src port, dst ip, dst port).
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple, Union
+
+
+# (src ip, src port, dst ip, dst port)
+FlowKey = Tuple[str, int, str, int]
+
+# Callback chamado para cada datagrama: (payload UDP, fluxo)
+PayloadCallback = Callable[[Union[bytes, memoryview], FlowKey], None]
+
+# Progresso do consumidor: (payloads aceitos, payloads já processados)
+PayloadProgress = Callable[[], Tuple[int, int]]
+
+
+@dataclass
+class CaptureSettings:
+    """Ajustes dos backends de captura (cada backend usa os que entende)."""
+    # Interface de rede (None = todas)
+    interface: Optional[str] = None
+    
+    # Ring TPACKET_V3: tamanho total, tamanho de cada bloco e tempo máximo
+    # até o kernel entregar um bloco parcialmente cheio
+    ring_size: int = 32 * 1024 * 1024
+    block_size: int = 1024 * 1024
+    retire_timeout_ms: int = 50
+    
+    # Replay offline: arquivo pcap/pcapng e multiplicador de velocidade
+    # (0 = o mais rápido possível, 1 = ritmo original)
+    pcap_path: Optional[str] = None
+    replay_speed: float = 0.0
+
+
+@dataclass
+class CaptureStats:
+    """Contadores do kernel (PACKET_STATISTICS), acumulados desde a abertura."""
+    packets: int = 0
+    drops: int = 0
+    freezes: int = 0
+
+
+class CaptureBackend:
+    """
+    Backend de captura de pacotes.
+    
+    O payload entregue ao callback pode ser uma view de um buffer reutilizado
+    pelo backend: só é válido durante a chamada e deve ser copiado se for
+    guardado.
+    
+    Backends com zero_copy podem segurar o buffer até o consumidor terminar:
+    depois de hold_payloads, um payload entregue continua válido até o
+    progresso informar que ele foi processado.
+    """
+    
+    name = "base"
+    zero_copy = False
+    
+    def __init__(self, ports: List[int], settings: Optional[CaptureSettings] = None):
+        self.ports = list(ports)
+        self.settings = settings or CaptureSettings()
+        self._progress: Optional[PayloadProgress] = None
+    
+    @classmethod
+    def is_supported(cls) -> bool:
+        """Indica se o backend pode ser usado nesta plataforma."""
+        return True
+    
+    def hold_payloads(self, progress: PayloadProgress):
+        """Mantém os payloads entregues válidos até progress() indicar que foram processados."""
+        if not self.zero_copy:
+            raise NotImplementedError(f"Backend {self.name} não segura payloads")
+        self._progress = progress
+    
+    def open(self):
+        """Prepara a captura (abre sockets, compila filtros). Pode lançar OSError."""
+    
+    def run(self, on_payload: PayloadCallback, should_stop: Callable[[], bool]):
+        """Loop de captura; retorna quando should_stop() for True."""
+        raise NotImplementedError
+    
+    def stats(self) -> CaptureStats:
+        """Contadores de captura do kernel (zerados se o backend não os expõe)."""
+        return CaptureStats()
+    
+    def close(self):
+        """Libera os recursos da captura."""
@@ -0,0 +1,84 @@
+"""
+BPF - Montagem de programas classic-BPF para SO_ATTACH_FILTER
+O filtro roda no kernel, então só datagramas UDP das portas do Albion
+chegam ao userspace.
+"""
+
+import ctypes
+import socket
+import struct
+from typing import List, Tuple
+
+
+# Opcodes (linux/filter.h)
+BPF_LD_W_ABS = 0x20     # A = pkt[k:k+4] (k negativo: extensões SKF_AD_*)
+BPF_LD_B_ABS = 0x30     # A = pkt[k]
+BPF_LD_H_ABS = 0x28     # A = pkt[k:k+2]
+BPF_LD_H_IND = 0x48     # A = pkt[X+k:X+k+2]
+BPF_LDX_B_MSH = 0xB1    # X = 4 * (pkt[k] & 0xF)
+BPF_JEQ_K = 0x15        # se A == k
+BPF_JSET_K = 0x45       # se A & k
+BPF_RET_K = 0x06        # retorna k bytes
+
+SO_ATTACH_FILTER = 26
+SO_DETACH_FILTER = 27
+
+# ld #SKF_AD_OFF + SKF_AD_PROTOCOL: ethertype do skb (ordem do host)
+SKF_AD_PROTOCOL = (-0x1000 + 0) & 0xFFFFFFFF
+ETH_P_IP = 0x0800
+
+IPPROTO_UDP = 17
+SNAPLEN = 0x40000
+
+# (code, jt, jf, k)
+Instruction = Tuple[int, int, int, int]
+
+
+def udp_ports_program(ports: List[int]) -> List[Instruction]:
+    """
+    Programa que aceita UDP/IPv4 (não fragmentado) com src ou dst port na lista.
+    
+    Espera o pacote começando no header IP (socket AF_PACKET SOCK_DGRAM).
+    O socket é ETH_P_ALL (senão o kernel não entrega os pacotes enviados pelo
+    host), então o programa começa descartando o que não é IPv4.
+    """
+    # Layout: 7 instruções fixas + (1 + n) src + (1 + n) dst + ret drop + ret accept
+    n = len(ports)
+    drop = 7 + (1 + n) + (1 + n)
+    accept = drop + 1
+    
+    program: List[Instruction] = []
+    
+    def jump(target: int) -> int:
+        return target - len(program) - 1
+    
+    program.append((BPF_LD_W_ABS, 0, 0, SKF_AD_PROTOCOL))    # ethertype
+    program.append((BPF_JEQ_K, 0, jump(drop), ETH_P_IP))
+    program.append((BPF_LD_B_ABS, 0, 0, 9))                  # protocolo IP
+    program.append((BPF_JEQ_K, 0, jump(drop), IPPROTO_UDP))
+    program.append((BPF_LD_H_ABS, 0, 0, 6))                  # flags + fragment offset
+    program.append((BPF_JSET_K, jump(drop), 0, 0x1FFF))      # fragmento não inicial
+    program.append((BPF_LDX_B_MSH, 0, 0, 0))                 # X = tamanho do header IP
+    
+    program.append((BPF_LD_H_IND, 0, 0, 0))                  # porta de origem
+    for port in ports:
+        program.append((BPF_JEQ_K, jump(accept), 0, port))
+    
+    program.append((BPF_LD_H_IND, 0, 0, 2))                  # porta de destino
+    for i, port in enumerate(ports):
+        program.append((BPF_JEQ_K, jump(accept), jump(drop) if i == n - 1 else 0, port))
+    
+    program.append((BPF_RET_K, 0, 0, 0))
+    program.append((BPF_RET_K, 0, 0, SNAPLEN))
+    
+    return program
+
+
+def attach_filter(sock: socket.socket, program: List[Instruction]):
+    """Anexa o programa ao socket via SO_ATTACH_FILTER."""
+    code = b''.join(struct.pack('HBBI', *instruction) for instruction in program)
+    buffer = ctypes.create_string_buffer(code, len(code))
+    
+    # struct sock_fprog { unsigned short len; struct sock_filter *filter; }
+    fprog = struct.pack('HP', len(program), ctypes.addressof(buffer))
+    sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_FILTER, fprog)
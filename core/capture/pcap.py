@@ -0,0 +1,376 @@
+"""
+PCAP - Leitura de capturas pcap/pcapng e backend de replay offline
+O arquivo é mapeado em memória (mmap) e os frames são views do mapa; nada
+de scapy. O backend de replay entrega os payloads UDP das portas do Albion
+ao mesmo callback da captura ao vivo, o mais rápido possível ou no ritmo
+original (com multiplicador de velocidade).
+"""
+
+import gzip
+import mmap
+import socket
+import struct
+import time
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .base import CaptureBackend, CaptureSettings, PayloadCallback, FlowKey
+
+
+# Magic numbers
+PCAP_MAGIC_MICROS = 0xA1B2C3D4
+PCAP_MAGIC_NANOS = 0xA1B23C4D
+PCAPNG_SECTION_HEADER = 0x0A0D0D0A
+PCAPNG_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Blocos pcapng
+PCAPNG_INTERFACE_DESCRIPTION = 0x00000001
+PCAPNG_PACKET = 0x00000002
+PCAPNG_SIMPLE_PACKET = 0x00000003
+PCAPNG_ENHANCED_PACKET = 0x00000006
+
+# Opção if_tsresol do Interface Description Block
+PCAPNG_OPTION_TSRESOL = 9
+
+# Link types (tcpdump.org/linktypes.html)
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW_OPENBSD = 12
+LINKTYPE_RAW = 101
+LINKTYPE_LOOP = 108
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_IPV4 = 228
+LINKTYPE_IPV6 = 229
+LINKTYPE_LINUX_SLL2 = 276
+
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_IPV6 = 0x86DD
+ETHERTYPE_VLAN = (0x8100, 0x88A8)
+
+IPPROTO_UDP = 17
+
+_ETHERTYPE = struct.Struct('>H')
+_UDP_PORTS = struct.Struct('>HHH')
+
+# (timestamp, link type, frame)
+Frame = Tuple[float, int, memoryview]
+
+
+class PcapError(ValueError):
+    """Arquivo de captura inválido ou em formato não suportado."""
+
+
+class PcapReader:
+    """Leitor de pcap clássico e pcapng sobre um arquivo mapeado em memória (ou .gz)."""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file: Optional[BinaryIO] = open(path, 'rb')
+        self._map: Optional[mmap.mmap] = None
+        
+        if self._file.read(2) == GZIP_MAGIC:
+            # Capturas gravadas com compressão (ver PacketRecorder) são lidas em memória
+            self._file.close()
+            self._file = None
+            with gzip.open(path, 'rb') as compressed:
+                self._view = memoryview(compressed.read())
+        else:
+            try:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Arquivo vazio não pode ser mapeado
+                self._file.close()
+                raise PcapError(f"Arquivo vazio: {path}")
+            self._view = memoryview(self._map)
+        
+        if len(self._view) < 4:
+            self.close()
+            raise PcapError(f"Arquivo muito curto: {path}")
+    
+    def __enter__(self) -> 'PcapReader':
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+    
+    def frames(self) -> Iterator[Frame]:
+        """Itera (timestamp, link type, frame) na ordem do arquivo."""
+        magic = struct.unpack_from('<I', self._view, 0)[0]
+        
+        if magic == PCAPNG_SECTION_HEADER:
+            return self._pcapng_frames()
+        
+        if magic in (PCAP_MAGIC_MICROS, PCAP_MAGIC_NANOS):
+            return self._pcap_frames('<')
+        
+        if struct.unpack_from('>I', self._view, 0)[0] in (PCAP_MAGIC_MICROS, PCAP_MAGIC_NANOS):
+            return self._pcap_frames('>')
+        
+        raise PcapError(f"Formato de captura desconhecido: {self.path}")
+    
+    def _pcap_frames(self, endian: str) -> Iterator[Frame]:
+        view = self._view
+        length = len(view)
+        
+        if length < 24:
+            raise PcapError("Header pcap truncado")
+        
+        magic, _, _, _, _, _, link_type = struct.unpack_from(endian + 'IHHiIII', view, 0)
+        resolution = 1e-9 if magic == PCAP_MAGIC_NANOS else 1e-6
+        
+        record = struct.Struct(endian + 'IIII')
+        position = 24
+        
+        while position + 16 <= length:
+            seconds, fraction, captured_length, _ = record.unpack_from(view, position)
+            position += 16
+            
+            end = position + captured_length
+            if end > length:
+                break
+            
+            yield seconds + fraction * resolution, link_type, view[position:end]
+            position = end
+    
+    def _pcapng_frames(self) -> Iterator[Frame]:
+        view = self._view
+        length = len(view)
+        
+        endian = '<'
+        # Por interface: (link type, resolução do timestamp, snaplen)
+        interfaces: List[Tuple[int, float, int]] = []
+        position = 0
+        
+        while position + 12 <= length:
+            block_type = struct.unpack_from(endian + 'I', view, position)[0]
+            
+            if block_type == PCAPNG_SECTION_HEADER:
+                # Nova seção: a ordem de bytes e as interfaces recomeçam
+                if struct.unpack_from('<I', view, position + 8)[0] == PCAPNG_BYTE_ORDER_MAGIC:
+                    endian = '<'
+                elif struct.unpack_from('>I', view, position + 8)[0] == PCAPNG_BYTE_ORDER_MAGIC:
+                    endian = '>'
+                else:
+                    raise PcapError("Byte-order magic pcapng inválido")
+                interfaces = []
+            
+            block_length = struct.unpack_from(endian + 'I', view, position + 4)[0]
+            if block_length < 12 or position + block_length > length:
+                break
+            
+            body = position + 8
+            body_end = position + block_length - 4
+            
+            if block_type == PCAPNG_INTERFACE_DESCRIPTION:
+                link_type, _, snaplen = struct.unpack_from(endian + 'HHI', view, body)
+                resolution = self._read_tsresol(view, body + 8, body_end, endian)
+                interfaces.append((link_type, resolution, snaplen))
+                
+            elif block_type == PCAPNG_ENHANCED_PACKET:
+                interface_id, high, low, captured_length, _ = struct.unpack_from(endian + 'IIIII', view, body)
+                if interface_id < len(interfaces):
+                    link_type, resolution, _ = interfaces[interface_id]
+                    start = body + 20
+                    end = min(start + captured_length, body_end)
+                    yield ((high << 32) | low) * resolution, link_type, view[start:end]
+                
+            elif block_type == PCAPNG_SIMPLE_PACKET:
+                if interfaces:
+                    link_type, _, snaplen = interfaces[0]
+                    original_length = struct.unpack_from(endian + 'I', view, body)[0]
+                    captured_length = min(original_length, snaplen) if snaplen else original_length
+                    start = body + 4
+                    end = min(start + captured_length, body_end)
+                    # Simple Packet Block não tem timestamp
+                    yield 0.0, link_type, view[start:end]
+                
+            elif block_type == PCAPNG_PACKET:
+                interface_id, _, high, low, captured_length, _ = struct.unpack_from(endian + 'HHIIII', view, body)
+                if interface_id < len(interfaces):
+                    link_type, resolution, _ = interfaces[interface_id]
+                    start = body + 20
+                    end = min(start + captured_length, body_end)
+                    yield ((high << 32) | low) * resolution, link_type, view[start:end]
+            
+            position += block_length
+    
+    @staticmethod
+    def _read_tsresol(view: memoryview, position: int, end: int, endian: str) -> float:
+        """Procura if_tsresol nas opções da interface (padrão: microssegundos)."""
+        option = struct.Struct(endian + 'HH')
+        
+        while position + 4 <= end:
+            code, option_length = option.unpack_from(view, position)
+            if code == 0:
+                break
+            
+            if code == PCAPNG_OPTION_TSRESOL and option_length >= 1:
+                value = view[position + 4]
+                if value & 0x80:
+                    return 2.0 ** -(value & 0x7F)
+                return 10.0 ** -value
+            
+            # Opções são alinhadas em 32 bits
+            position += 4 + ((option_length + 3) & ~3)
+        
+        return 1e-6
+    
+    def close(self):
+        self._view.release()
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Ainda há views do arquivo vivas; o mmap é liberado quando forem coletadas
+                pass
+        if self._file is not None:
+            self._file.close()
+
+
+def ip_packet(link_type: int, frame: memoryview) -> Optional[memoryview]:
+    """Remove o header de enlace e retorna o pacote IP (ou None se não for IP)."""
+    if link_type == LINKTYPE_ETHERNET:
+        offset = 12
+        if len(frame) < offset + 2:
+            return None
+        ethertype = _ETHERTYPE.unpack_from(frame, offset)[0]
+        while ethertype in ETHERTYPE_VLAN and len(frame) >= offset + 6:
+            offset += 4
+            ethertype = _ETHERTYPE.unpack_from(frame, offset)[0]
+        if ethertype != ETHERTYPE_IPV4 and ethertype != ETHERTYPE_IPV6:
+            return None
+        return frame[offset + 2:]
+    
+    if link_type in (LINKTYPE_RAW, LINKTYPE_RAW_OPENBSD, LINKTYPE_IPV4, LINKTYPE_IPV6):
+        return frame
+    
+    if link_type == LINKTYPE_LINUX_SLL:
+        return frame[16:]
+    
+    if link_type == LINKTYPE_LINUX_SLL2:
+        return frame[20:]
+    
+    if link_type == LINKTYPE_NULL or link_type == LINKTYPE_LOOP:
+        return frame[4:]
+    
+    return None
+
+
+def udp_payload(packet: memoryview, ports: frozenset,
+                flow_cache: Dict[bytes, FlowKey]) -> Optional[Tuple[memoryview, FlowKey]]:
+    """
+    Recorta (payload UDP, fluxo) de um pacote IPv4/IPv6 se src ou dst port
+    estiver em ports. Faz em userspace o que o filtro BPF faz na captura ao vivo.
+    """
+    length = len(packet)
+    if length < 1:
+        return None
+    
+    version = packet[0] >> 4
+    
+    if version == 4:
+        if length < 28 or packet[9] != IPPROTO_UDP:
+            return None
+        # Fragmentos não iniciais não têm header UDP
+        if (packet[6] & 0x1F) or packet[7]:
+            return None
+        header_length = (packet[0] & 0x0F) * 4
+        address_start, address_end, family, address_size = 12, 20, socket.AF_INET, 4
+        
+    elif version == 6:
+        # Sem extension headers (o tráfego do jogo não usa)
+        if length < 48 or packet[6] != IPPROTO_UDP:
+            return None
+        header_length = 40
+        address_start, address_end, family, address_size = 8, 40, socket.AF_INET6, 16
+        
+    else:
+        return None
+    
+    if header_length + 8 > length:
+        return None
+    
+    src_port, dst_port, udp_length = _UDP_PORTS.unpack_from(packet, header_length)
+    if src_port not in ports and dst_port not in ports:
+        return None
+    
+    payload_start = header_length + 8
+    payload_end = min(header_length + udp_length, length)
+    if payload_end <= payload_start:
+        return None
+    
+    raw_key = bytes(packet[address_start:address_end]) + bytes(packet[header_length:header_length + 4])
+    flow_key = flow_cache.get(raw_key)
+    if flow_key is None:
+        flow_key = (
+            socket.inet_ntop(family, raw_key[0:address_size]), src_port,
+            socket.inet_ntop(family, raw_key[address_size:2 * address_size]), dst_port
+        )
+        flow_cache[raw_key] = flow_key
+    
+    return packet[payload_start:payload_end], flow_key
+
+
+class PcapReplayBackend(CaptureBackend):
+    """
+    Replay de um arquivo pcap/pcapng (CaptureSettings.pcap_path).
+    
+    replay_speed = 0 entrega os pacotes o mais rápido possível; > 0 respeita
+    os intervalos originais divididos pelo multiplicador.
+    """
+    
+    name = "pcap"
+    
+    def __init__(self, ports, settings: Optional[CaptureSettings] = None):
+        super().__init__(ports, settings)
+        self._reader: Optional[PcapReader] = None
+        
+        # Contadores do último replay
+        self.frames_read = 0
+        self.payloads_delivered = 0
+    
+    def open(self):
+        if not self.settings.pcap_path:
+            raise PcapError("pcap_path não definido")
+        self._reader = PcapReader(self.settings.pcap_path)
+    
+    def run(self, on_payload: PayloadCallback, should_stop: Callable[[], bool]):
+        if self._reader is None:
+            self.open()
+        
+        ports = frozenset(self.ports)
+        speed = self.settings.replay_speed
+        flow_cache: Dict[bytes, FlowKey] = {}
+        
+        first_timestamp: Optional[float] = None
+        started_at = time.perf_counter()
+        
+        for timestamp, link_type, frame in self._reader.frames():
+            if should_stop():
+                break
+            
+            self.frames_read += 1
+            
+            packet = ip_packet(link_type, frame)
+            if packet is None:
+                continue
+            
+            parsed = udp_payload(packet, ports, flow_cache)
+            if parsed is None:
+                continue
+            
+            # Ritmo original / speed
+            if speed > 0:
+                if first_timestamp is None:
+                    first_timestamp = timestamp
+                delay = (timestamp - first_timestamp) / speed - (time.perf_counter() - started_at)
+                if delay > 0:
+                    time.sleep(delay)
+            
+            self.payloads_delivered += 1
+            on_payload(*parsed)
+    
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
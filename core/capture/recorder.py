@@ -0,0 +1,203 @@
+"""
+Recorder - Gravação dos payloads capturados em arquivos pcap rotativos
+A thread de captura só copia o payload para uma fila limitada; uma thread
+de escrita monta o pcap (LINKTYPE_RAW, com header IP/UDP sintetizado a
+partir do fluxo), rotaciona por tamanho/tempo e opcionalmente comprime os
+arquivos fechados com gzip. Fila cheia descarta o registro, nunca bloqueia.
+"""
+
+import gzip
+import os
+import queue
+import shutil
+import socket
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import BinaryIO, Optional, Tuple, Union
+
+from .base import FlowKey
+from .pcap import PCAP_MAGIC_NANOS, LINKTYPE_RAW, IPPROTO_UDP
+
+
+# Limites padrão de rotação
+RECORDER_MAX_BYTES = 100 * 1024 * 1024
+RECORDER_MAX_SECONDS = 10 * 60
+
+# Registros aguardando escrita
+RECORDER_QUEUE_SIZE = 10000
+
+# Intervalo máximo entre flushes do arquivo aberto (segundos)
+RECORDER_FLUSH_INTERVAL = 1.0
+
+_PCAP_HEADER = struct.Struct('<IHHiIII')
+_PCAP_RECORD = struct.Struct('<IIII')
+_IPV4_HEADER = struct.Struct('>BBHHHBBH4s4s')
+_IPV6_HEADER = struct.Struct('>IHBB16s16s')
+_UDP_HEADER = struct.Struct('>HHHH')
+
+# (timestamp, fluxo, payload)
+Record = Tuple[float, FlowKey, bytes]
+
+
+def _ip_udp_header(flow_key: FlowKey, payload_length: int) -> bytes:
+    """Sintetiza os headers IP + UDP do fluxo (checksums zerados)."""
+    src_ip, src_port, dst_ip, dst_port = flow_key
+    udp_length = 8 + payload_length
+    udp = _UDP_HEADER.pack(src_port, dst_port, udp_length & 0xFFFF, 0)
+    
+    if ':' in src_ip:
+        ip = _IPV6_HEADER.pack(
+            6 << 28, udp_length & 0xFFFF, IPPROTO_UDP, 64,
+            socket.inet_pton(socket.AF_INET6, src_ip),
+            socket.inet_pton(socket.AF_INET6, dst_ip)
+        )
+    else:
+        ip = _IPV4_HEADER.pack(
+            0x45, 0, (20 + udp_length) & 0xFFFF, 0, 0, 64, IPPROTO_UDP, 0,
+            socket.inet_aton(src_ip), socket.inet_aton(dst_ip)
+        )
+    
+    return ip + udp
+
+
+class PacketRecorder:
+    """Grava (timestamp, fluxo, payload) em pcaps rotativos numa thread própria."""
+    
+    def __init__(self, directory: str, prefix: str = "albion",
+                 max_bytes: int = RECORDER_MAX_BYTES,
+                 max_seconds: float = RECORDER_MAX_SECONDS,
+                 compress: bool = False,
+                 queue_size: int = RECORDER_QUEUE_SIZE):
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.compress = compress
+        
+        self._queue: 'queue.Queue[Optional[Record]]' = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        
+        self._file: Optional[BinaryIO] = None
+        self._file_path: Optional[str] = None
+        self._file_bytes = 0
+        self._file_opened_at = 0.0
+        self._file_index = 0
+        self._last_flush = 0.0
+        
+        # Contadores
+        self.recorded = 0
+        self.dropped = 0
+        self.files_written = 0
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Inicia a thread de escrita."""
+        if self.running:
+            return
+        
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5.0):
+        """Grava o que estiver na fila, fecha o arquivo atual e para a thread."""
+        if not self.running:
+            return
+        
+        # O sentinela precisa entrar mesmo com a fila cheia
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+    
+    def record(self, timestamp: float, flow_key: FlowKey, payload: Union[bytes, memoryview]):
+        """Enfileira um payload (copiado: views do backend não sobrevivem à chamada)."""
+        try:
+            self._queue.put_nowait((timestamp, flow_key, bytes(payload)))
+        except queue.Full:
+            self.dropped += 1
+    
+    def _writer_loop(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=RECORDER_FLUSH_INTERVAL)
+            except queue.Empty:
+                self._flush()
+                continue
+            
+            if item is None:
+                break
+            
+            try:
+                self._write(*item)
+            except OSError as e:
+                print(f"[ERRO] Falha ao gravar captura: {e}")
+                self._close_file()
+        
+        self._close_file()
+    
+    def _write(self, timestamp: float, flow_key: FlowKey, payload: bytes):
+        if self._file is None or self._should_rotate(timestamp):
+            self._close_file()
+            self._open_file(timestamp)
+        
+        header = _ip_udp_header(flow_key, len(payload))
+        length = len(header) + len(payload)
+        seconds = int(timestamp)
+        nanos = int((timestamp - seconds) * 1e9)
+        
+        self._file.write(_PCAP_RECORD.pack(seconds, nanos, length, length))
+        self._file.write(header)
+        self._file.write(payload)
+        
+        self._file_bytes += _PCAP_RECORD.size + length
+        self.recorded += 1
+        
+        if timestamp - self._last_flush >= RECORDER_FLUSH_INTERVAL:
+            self._flush()
+    
+    def _should_rotate(self, timestamp: float) -> bool:
+        if self.max_bytes and self._file_bytes >= self.max_bytes:
+            return True
+        if self.max_seconds and timestamp - self._file_opened_at >= self.max_seconds:
+            return True
+        return False
+    
+    def _open_file(self, timestamp: float):
+        self._file_index += 1
+        stamp = datetime.fromtimestamp(timestamp).strftime('%Y%m%d-%H%M%S')
+        self._file_path = os.path.join(self.directory, f"{self.prefix}-{stamp}-{self._file_index:04d}.pcap")
+        
+        self._file = open(self._file_path, 'wb')
+        self._file.write(_PCAP_HEADER.pack(PCAP_MAGIC_NANOS, 2, 4, 0, 0, 65535, LINKTYPE_RAW))
+        
+        self._file_bytes = _PCAP_HEADER.size
+        self._file_opened_at = timestamp
+        self._last_flush = timestamp
+    
+    def _flush(self):
+        if self._file is not None:
+            self._file.flush()
+            self._last_flush = time.time()
+    
+    def _close_file(self):
+        if self._file is None:
+            return
+        
+        path = self._file_path
+        self._file.close()
+        self._file = None
+        self._file_path = None
+        self.files_written += 1
+        
+        if self.compress and path:
+            try:
+                with open(path, 'rb') as source, gzip.open(path + '.gz', 'wb') as target:
+                    shutil.copyfileobj(source, target)
+                os.remove(path)
+            except OSError as e:
+                print(f"[AVISO] Falha ao comprimir {path}: {e}")
@@ -0,0 +1,58 @@
+"""
+Scapy Backend - Captura via scapy sniff()
+Funciona em qualquer plataforma com Npcap/libpcap; usado como fallback.
+"""
+
+from typing import Callable
+
+from .base import CaptureBackend, PayloadCallback
+
+
+class ScapyBackend(CaptureBackend):
+    """Captura usando scapy (monta um Packet completo por datagrama)."""
+    
+    name = "scapy"
+    
+    @classmethod
+    def is_supported(cls) -> bool:
+        try:
+            import scapy.all  # noqa: F401
+            return True
+        except ImportError:
+            return False
+    
+    def run(self, on_payload: PayloadCallback, should_stop: Callable[[], bool]):
+        from scapy.all import sniff, UDP, IP, IPv6, conf
+        
+        # Filtro BPF para UDP nas portas do Albion
+        port_filter = " or ".join([f"port {p}" for p in self.ports])
+        bpf_filter = f"udp and ({port_filter})"
+        
+        def handle_packet(packet):
+            try:
+                if UDP in packet and packet[UDP].payload:
+                    udp = packet[UDP]
+                    
+                    if IP in packet:
+                        ip = packet[IP]
+                    elif IPv6 in packet:
+                        ip = packet[IPv6]
+                    else:
+                        return
+                    
+                    # Extrai payload UDP
+                    on_payload(bytes(udp.payload), (ip.src, udp.sport, ip.dst, udp.dport))
+            
+            except Exception:
+                # Ignora erros de pacotes malformados
+                pass
+        
+        # Desabilita verbose do scapy
+        conf.verb = 0
+        
+        sniff(
+            filter=bpf_filter,
+            prn=handle_packet,
+            store=False,
+            stop_filter=lambda x: should_stop()
+        )
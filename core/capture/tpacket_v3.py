@@ -0,0 +1,204 @@
+"""
+TPACKET_V3 Backend - Captura por ring buffer mapeado (PACKET_MMAP) no Linux
+O kernel escreve os pacotes em blocos de um ring compartilhado; o loop
+percorre os frames de cada bloco pronto e entrega o payload UDP como view
+do próprio ring, sem syscall nem cópia por pacote.
+
+Com hold_payloads, um bloco só volta ao kernel quando o consumidor terminou
+todos os payloads dele, então as views podem ir direto para a fila de decode.
+"""
+
+import mmap
+import select
+import socket
+import struct
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from .base import CaptureBackend, CaptureSettings, CaptureStats, PayloadCallback, FlowKey
+from .af_packet import (
+    AfPacketBackend, SOL_PACKET, POLL_TIMEOUT,
+    open_packet_socket, parse_ipv4_udp, read_packet_statistics
+)
+
+
+# linux/if_packet.h
+PACKET_RX_RING = 5
+PACKET_VERSION = 10
+TPACKET_V3 = 2
+
+TP_STATUS_KERNEL = 0
+TP_STATUS_USER = 1
+
+# Tamanho de frame informado ao kernel (no V3 os frames são variáveis,
+# mas tp_frame_nr precisa ser consistente com o tamanho dos blocos)
+FRAME_SIZE = 2048
+
+# Espera enquanto há blocos retidos pelo consumidor (ms no poll, s com o ring todo retido)
+HOLD_POLL_MS = 5
+HOLD_WAIT = 0.001
+
+# struct tpacket_req3
+_TPACKET_REQ3 = struct.Struct('IIIIIII')
+
+# struct tpacket_stats_v3 { tp_packets, tp_drops, tp_freeze_q_cnt }
+_TPACKET_STATS_V3 = struct.Struct('III')
+
+# tpacket_block_desc.hdr.bh1: block_status, num_pkts, offset_to_first_pkt
+_BLOCK_STATUS_OFFSET = 8
+_BLOCK_STATUS = struct.Struct('=I')
+_BLOCK_HEADER = struct.Struct('=III')
+
+# struct tpacket3_hdr: tp_next_offset, tp_sec, tp_nsec, tp_snaplen, tp_len,
+# tp_status, tp_mac, tp_net
+_PACKET_HEADER = struct.Struct('=IIIIIIHH')
+
+
+class TPacketV3Backend(CaptureBackend):
+    """Captura via ring TPACKET_V3 (ring_size, block_size e retire_timeout_ms em CaptureSettings)."""
+    
+    name = "tpacket_v3"
+    zero_copy = True
+    
+    def __init__(self, ports, settings: Optional[CaptureSettings] = None):
+        super().__init__(ports, settings)
+        self._sock: Optional[socket.socket] = None
+        self._ring: Optional[mmap.mmap] = None
+        self._block_count = 0
+        self._block_size = 0
+        self._stats = CaptureStats()
+    
+    @classmethod
+    def is_supported(cls) -> bool:
+        return AfPacketBackend.is_supported()
+    
+    def open(self):
+        settings = self.settings
+        
+        # Blocos precisam ser múltiplos do tamanho de página e comportar frames inteiros
+        block_size = max(settings.block_size, mmap.PAGESIZE, FRAME_SIZE)
+        block_size -= block_size % mmap.PAGESIZE
+        block_count = max(settings.ring_size // block_size, 2)
+        frames_per_block = block_size // FRAME_SIZE
+        
+        sock = open_packet_socket(self.ports, settings.interface)
+        try:
+            sock.setsockopt(SOL_PACKET, PACKET_VERSION, TPACKET_V3)
+            request = _TPACKET_REQ3.pack(
+                block_size, block_count,
+                FRAME_SIZE, frames_per_block * block_count,
+                settings.retire_timeout_ms,
+                0, 0
+            )
+            sock.setsockopt(SOL_PACKET, PACKET_RX_RING, request)
+            ring = mmap.mmap(
+                sock.fileno(), block_size * block_count,
+                mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE
+            )
+        except OSError:
+            sock.close()
+            raise
+        
+        self._sock = sock
+        self._ring = ring
+        self._block_size = block_size
+        self._block_count = block_count
+    
+    def run(self, on_payload: PayloadCallback, should_stop: Callable[[], bool]):
+        if self._ring is None:
+            self.open()
+        
+        ring = self._ring
+        block_size = self._block_size
+        block_count = self._block_count
+        
+        poller = select.poll()
+        poller.register(self._sock.fileno(), select.POLLIN | select.POLLERR)
+        poll_timeout_ms = int(POLL_TIMEOUT * 1000)
+        
+        flow_cache: Dict[bytes, FlowKey] = {}
+        block_index = 0
+        
+        # Blocos já percorridos aguardando o consumidor: (offset, payloads aceitos até o bloco)
+        progress = self._progress
+        held: Deque[Tuple[int, int]] = deque()
+        
+        with memoryview(ring) as view:
+            while not should_stop():
+                if held:
+                    self._release_finished(ring, held, progress()[1])
+                    
+                    # Ring inteiro retido: o próximo bloco ainda é usado pelo consumidor
+                    if len(held) == block_count:
+                        time.sleep(HOLD_WAIT)
+                        continue
+                
+                block_offset = block_index * block_size
+                status = _BLOCK_STATUS.unpack_from(ring, block_offset + _BLOCK_STATUS_OFFSET)[0]
+                
+                if not status & TP_STATUS_USER:
+                    poller.poll(HOLD_POLL_MS if held else poll_timeout_ms)
+                    continue
+                
+                self._walk_block(view, block_offset, on_payload, flow_cache)
+                
+                if progress is None:
+                    # Devolve o bloco ao kernel
+                    _BLOCK_STATUS.pack_into(ring, block_offset + _BLOCK_STATUS_OFFSET, TP_STATUS_KERNEL)
+                else:
+                    held.append((block_offset, progress()[0]))
+                block_index = (block_index + 1) % block_count
+                
+                # Fluxos antigos não crescem o cache indefinidamente
+                if len(flow_cache) > 4096:
+                    flow_cache.clear()
+    
+    @staticmethod
+    def _release_finished(ring: mmap.mmap, held: Deque[Tuple[int, int]], finished: int):
+        """Devolve ao kernel, em ordem, os blocos cujos payloads o consumidor já processou."""
+        while held and held[0][1] <= finished:
+            block_offset, _ = held.popleft()
+            _BLOCK_STATUS.pack_into(ring, block_offset + _BLOCK_STATUS_OFFSET, TP_STATUS_KERNEL)
+    
+    @staticmethod
+    def _walk_block(view: memoryview, block_offset: int,
+                    on_payload: PayloadCallback, flow_cache: Dict[bytes, FlowKey]):
+        """Entrega o payload UDP de cada frame do bloco."""
+        _, packet_count, first_offset = _BLOCK_HEADER.unpack_from(view, block_offset + _BLOCK_STATUS_OFFSET)
+        
+        offset = block_offset + first_offset
+        for _ in range(packet_count):
+            next_offset, _, _, snaplen, _, _, mac, net = _PACKET_HEADER.unpack_from(view, offset)
+            
+            # tp_snaplen conta a partir de tp_mac; em SOCK_DGRAM mac == net
+            length = snaplen - (net - mac)
+            start = offset + net
+            parsed = parse_ipv4_udp(view[start:start + length], length, flow_cache)
+            if parsed is not None:
+                on_payload(*parsed)
+            
+            offset += next_offset
+    
+    def stats(self) -> CaptureStats:
+        sock = self._sock
+        if sock is not None:
+            try:
+                read_packet_statistics(sock, self._stats, _TPACKET_STATS_V3)
+            except OSError:
+                pass
+        return CaptureStats(self._stats.packets, self._stats.drops, self._stats.freezes)
+    
+    def close(self):
+        if self._ring is not None:
+            try:
+                self._ring.close()
+            except BufferError:
+                # Ainda há views do ring vivas; o mmap é liberado quando forem coletadas
+                pass
+            self._ring = None
+        
+        if self._sock is not None:
+            self.stats()
+            self._sock.close()
+            self._sock = None
@@ -0,0 +1,190 @@
+"""
+Capture Process - Captura + decode em um processo separado
+O processo filho roda o AlbionSniffer com o DataHandler e publica cada
+LootEvent no LootRing (shared memory). O processo da interface só lê o
+ring, então um redraw demorado do Tk ou do dashboard não atrasa a captura.
+A lista de itens carrega em segundo plano no filho; as correções dos loots
+vistos antes disso chegam pelo mesmo ring (on_loot_update).
+"""
+
+import multiprocessing
+import threading
+import time
+from typing import Callable, Optional
+
+from .loot_ring import (
+    LootRing, LootRingReader, LOOT_RING_CAPACITY,
+    STATUS_CONNECTING, STATUS_ONLINE, STATUS_OFFLINE, STATUS_STOPPED
+)
+
+
+# Intervalo de leitura do ring pelo consumidor (segundos)
+POLL_INTERVAL = 0.05
+
+
+def _capture_main(ring_name: str, stop_event, locale: str, sniffer_options: dict):
+    """Processo de captura: sniffer + handlers publicando no ring."""
+    from .sniffer import AlbionSniffer
+    from handlers import data_handler
+    from services import events_config, items_service
+    
+    ring = LootRing.attach(ring_name)
+    sniffer = None
+    
+    try:
+        # No modo spawn o processo começa sem nada carregado
+        if not events_config.loaded and not events_config.load():
+            return
+        
+        # Captura começa já; itens vistos antes da lista carregar são corrigidos depois
+        items_service.locale = locale
+        if not items_service.loaded:
+            items_service.load_async()
+        
+        sniffer = AlbionSniffer(**sniffer_options)
+        
+        data_handler.on_loot(ring.publish)
+        data_handler.on_loot_update(ring.publish_update)
+        sniffer.on_loot(ring.publish)
+        sniffer.on_loot_update(ring.publish_update)
+        sniffer.on_event(data_handler.handle_event)
+        sniffer.on_request(data_handler.handle_request)
+        sniffer.on_response(data_handler.handle_response)
+        sniffer.set_event_projections(data_handler.event_projections())
+        sniffer.on_online(lambda: ring.set_status(STATUS_ONLINE))
+        sniffer.on_offline(lambda: ring.set_status(STATUS_OFFLINE))
+        
+        sniffer.start()
+        stop_event.wait()
+        
+    except KeyboardInterrupt:
+        pass
+        
+    finally:
+        if sniffer:
+            sniffer.stop()
+        ring.set_status(STATUS_STOPPED)
+        ring.close()
+
+
+class CaptureProcess:
+    """
+    Mesma interface de controle do AlbionSniffer (start/stop, on_online,
+    on_offline), com os LootEvents entregues por on_loot (e as correções por
+    on_loot_update) a partir do ring.
+    """
+    
+    def __init__(self, locale: str = "PT-BR", capacity: int = LOOT_RING_CAPACITY, **sniffer_options):
+        self.locale = locale
+        self.capacity = capacity
+        self.sniffer_options = sniffer_options
+        
+        self.ring: Optional[LootRing] = None
+        self.reader: Optional[LootRingReader] = None
+        self.running = False
+        
+        self._process: Optional[multiprocessing.Process] = None
+        self._stop_event = None
+        self._consumer_thread: Optional[threading.Thread] = None
+        
+        # Callbacks
+        self._on_loot: Optional[Callable] = None
+        self._on_loot_update: Optional[Callable] = None
+        self._on_online: Optional[Callable[[], None]] = None
+        self._on_offline: Optional[Callable[[], None]] = None
+    
+    def on_loot(self, callback: Callable):
+        """Registra callback para LootEvents lidos do ring."""
+        self._on_loot = callback
+    
+    def on_loot_update(self, callback: Callable):
+        """Registra callback (evento antigo, evento corrigido) para loots com item pendente."""
+        self._on_loot_update = callback
+    
+    def on_online(self, callback: Callable[[], None]):
+        """Registra callback para quando Albion é detectado."""
+        self._on_online = callback
+    
+    def on_offline(self, callback: Callable[[], None]):
+        """Registra callback para quando Albion não é mais detectado."""
+        self._on_offline = callback
+    
+    @property
+    def lost(self) -> int:
+        """Eventos sobrescritos no ring antes de serem lidos."""
+        return self.reader.lost if self.reader else 0
+    
+    def start(self):
+        """Cria o ring e sobe o processo de captura."""
+        if self.running:
+            return
+        
+        context = multiprocessing.get_context()
+        self.ring = LootRing.create(self.capacity)
+        self.reader = LootRingReader(self.ring)
+        self._stop_event = context.Event()
+        
+        self._process = context.Process(
+            target=_capture_main,
+            args=(self.ring.name, self._stop_event, self.locale, self.sniffer_options),
+            name="capture",
+            daemon=True
+        )
+        self._process.start()
+        
+        self.running = True
+        self._consumer_thread = threading.Thread(target=self._consumer_loop, daemon=True)
+        self._consumer_thread.start()
+    
+    def stop(self):
+        """Para o processo de captura e libera o ring."""
+        if not self.running:
+            return
+        
+        self._stop_event.set()
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+        
+        self.running = False
+        self._consumer_thread.join(timeout=2)
+        
+        # Entrega o que o processo publicou antes de sair
+        self._dispatch(self.reader.read())
+        
+        self.ring.close()
+        self.ring = None
+    
+    def _consumer_loop(self):
+        status = STATUS_CONNECTING
+        
+        while self.running:
+            new_status, records = self.reader.poll()
+            self._dispatch(records)
+            
+            if new_status != status:
+                status = new_status
+                if status == STATUS_ONLINE and self._on_online:
+                    self._on_online()
+                elif status == STATUS_OFFLINE and self._on_offline:
+                    self._on_offline()
+            
+            if not self._process.is_alive():
+                if status != STATUS_STOPPED:
+                    print(f"[ERRO] Processo de captura terminou (código {self._process.exitcode})")
+                break
+            
+            time.sleep(POLL_INTERVAL)
+    
+    def _dispatch(self, records):
+        for event, old_event in records:
+            callback = self._on_loot if old_event is None else self._on_loot_update
+            if not callback:
+                continue
+            try:
+                if old_event is None:
+                    callback(event)
+                else:
+                    callback(old_event, event)
+            except Exception as e:
+                print(f"[ERRO] Callback de loot falhou: {e}")
@@ -0,0 +1,248 @@
+"""
+Decode Pool - Decodificação em vários processos, particionada por fluxo
+Cada worker tem seu próprio FlowTable/PhotonDecoder e estado de handlers
+(DataHandler + storage). Os datagramas são distribuídos pelo hash da
+conexão, então a ordem dentro de um fluxo é mantida; os LootEvent gerados
+(e as correções de itens pendentes) voltam ao processo principal por uma
+multiprocessing.Queue.
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from .photon_decoder import PhotonDecoder, DecoderStats
+from .flow_table import FlowTable, FlowKey, connection_key, with_connection
+
+
+# Lotes aguardando cada worker (backpressure para a fila do sniffer)
+WORKER_INBOX_SIZE = 64
+
+# Intervalo entre envios de contadores pelos workers (segundos)
+WORKER_STATS_INTERVAL = 1.0
+
+# (payload, fluxo, timestamp de captura)
+QueuedPacket = Tuple[bytes, FlowKey, float]
+
+# Mensagens worker -> processo principal
+_RESULT_LOOT = 0
+_RESULT_STATS = 1
+_RESULT_LOOT_UPDATE = 2
+
+# Mensagens processo principal -> worker (fora os lotes)
+_INBOX_ITEMS = 0
+
+
+@dataclass
+class WorkerConfig:
+    """Estado necessário para um worker decodificar sem acesso à rede."""
+    event_codes: Any
+    items: Any              # ItemCatalog: mapeado do cache, vai para o worker só como caminho
+    locale: str
+    projections: Optional[Dict[int, FrozenSet[int]]]
+    
+    @classmethod
+    def from_services(cls, projections: Optional[Dict[int, FrozenSet[int]]]) -> 'WorkerConfig':
+        """Captura a configuração já carregada no processo principal."""
+        from services import events_config, items_service
+        return cls(events_config.events, items_service.items, items_service.locale, projections)
+
+
+def _worker_main(index: int, inbox, results, config: WorkerConfig):
+    """Loop de um processo worker."""
+    # Importados aqui: no modo spawn o processo começa do zero
+    from handlers import data_handler
+    from handlers.pending_items import pending_items
+    from services import events_config, items_service
+    
+    events_config.events = config.event_codes
+    items_service.locale = config.locale
+    
+    data_handler.clear_callbacks()
+    data_handler.on_loot(lambda event: results.put((_RESULT_LOOT, event)))
+    data_handler.on_loot_update(lambda old, new: results.put((_RESULT_LOOT_UPDATE, old, new)))
+    
+    # Catálogo ainda carregando no processo principal: chega depois por set_items
+    if config.items is not None and len(config.items):
+        items_service.set_catalog(config.items)
+        pending_items.poll()
+    
+    def create_decoder(flow_key: FlowKey) -> PhotonDecoder:
+        decoder = PhotonDecoder()
+        decoder.on_event(with_connection(data_handler.handle_event, flow_key))
+        decoder.on_request(with_connection(data_handler.handle_request, flow_key))
+        decoder.on_response(with_connection(data_handler.handle_response, flow_key))
+        decoder.set_event_projections(config.projections)
+        return decoder
+    
+    flows = FlowTable(create_decoder)
+    packet_errors = 0
+    last_report = time.time()
+    
+    while True:
+        try:
+            batch = inbox.get(timeout=WORKER_STATS_INTERVAL)
+        except queue.Empty:
+            batch = []
+        
+        if batch is None:
+            break
+        
+        if isinstance(batch, tuple):
+            # (_INBOX_ITEMS, catálogo ou None se o carregamento falhou)
+            if batch[1] is not None:
+                items_service.set_catalog(batch[1])
+            else:
+                items_service.set_load_failed()
+            pending_items.poll()
+            batch = []
+        
+        for payload, flow_key, captured_at in batch:
+            try:
+                flows.get(flow_key, captured_at).handle_packet(payload)
+            except Exception:
+                packet_errors += 1
+        
+        now = time.time()
+        if now - last_report >= WORKER_STATS_INTERVAL:
+            flows.evict_idle(now)
+            results.put((_RESULT_STATS, index, flows.stats(), packet_errors))
+            last_report = now
+    
+    results.put((_RESULT_STATS, index, flows.stats(), packet_errors))
+
+
+class DecodePool:
+    """Pool de processos de decode com particionamento por conexão."""
+    
+    def __init__(self, workers: int, on_loot: Callable[[Any], None], config: WorkerConfig,
+                 on_loot_update: Optional[Callable[[Any, Any], None]] = None):
+        self.workers = max(1, workers)
+        self._on_loot = on_loot
+        self._on_loot_update = on_loot_update
+        self._config = config
+        
+        self._context = multiprocessing.get_context()
+        self._inboxes: List[Any] = []
+        self._processes: List[multiprocessing.Process] = []
+        self._results = None
+        self._result_thread: Optional[threading.Thread] = None
+        
+        # Cache fluxo -> índice do worker
+        self._shards: Dict[FlowKey, int] = {}
+        
+        # Últimos contadores recebidos de cada worker
+        self._worker_stats: List[DecoderStats] = []
+        self._worker_errors: List[int] = []
+        self._lock = threading.Lock()
+    
+    def start(self):
+        """Sobe os processos e a thread que recebe os resultados."""
+        context = self._context
+        self._results = context.Queue()
+        self._inboxes = [context.Queue(maxsize=WORKER_INBOX_SIZE) for _ in range(self.workers)]
+        self._worker_stats = [DecoderStats() for _ in range(self.workers)]
+        self._worker_errors = [0] * self.workers
+        self._shards.clear()
+        
+        self._processes = []
+        for index, inbox in enumerate(self._inboxes):
+            process = context.Process(
+                target=_worker_main,
+                args=(index, inbox, self._results, self._config),
+                name=f"decode-worker-{index}",
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+        
+        self._result_thread = threading.Thread(target=self._result_loop, daemon=True)
+        self._result_thread.start()
+    
+    def submit(self, batch: List[QueuedPacket]):
+        """Distribui um lote entre os workers (um put por worker)."""
+        shards = self._shards
+        workers = self.workers
+        parts: List[List[QueuedPacket]] = [[] for _ in range(workers)]
+        
+        for item in batch:
+            payload, flow_key, captured_at = item
+            if isinstance(payload, memoryview):
+                # Views do ring não atravessam o pickle (nem sobrevivem ao bloco)
+                item = (payload.tobytes(), flow_key, captured_at)
+            shard = shards.get(flow_key)
+            if shard is None:
+                shard = hash(connection_key(flow_key)) % workers
+                if len(shards) > 4096:
+                    shards.clear()
+                shards[flow_key] = shard
+            parts[shard].append(item)
+        
+        for inbox, part in zip(self._inboxes, parts):
+            if part:
+                inbox.put(part)
+    
+    def set_items(self, catalog: Optional[Any]):
+        """Repassa aos workers o catálogo carregado depois do start (None = falhou)."""
+        for inbox in self._inboxes:
+            inbox.put((_INBOX_ITEMS, catalog))
+    
+    def stop(self, timeout: float = 5.0):
+        """Pede para os workers terminarem o que têm na fila e encerra o pool."""
+        for inbox in self._inboxes:
+            inbox.put(None)
+        
+        for process in self._processes:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+        
+        if self._results is not None:
+            self._results.put(None)
+        if self._result_thread:
+            self._result_thread.join(timeout=timeout)
+        
+        self._processes = []
+        self._inboxes = []
+    
+    def stats(self) -> DecoderStats:
+        """Soma dos últimos contadores reportados pelos workers."""
+        with self._lock:
+            total = DecoderStats()
+            for stats in self._worker_stats:
+                total.add(stats)
+            return total
+    
+    @property
+    def packet_errors(self) -> int:
+        with self._lock:
+            return sum(self._worker_errors)
+    
+    def _result_loop(self):
+        results = self._results
+        while True:
+            message = results.get()
+            if message is None:
+                break
+            
+            if message[0] == _RESULT_LOOT:
+                try:
+                    self._on_loot(message[1])
+                except Exception as e:
+                    print(f"[ERRO] Callback de loot falhou: {e}")
+                
+            elif message[0] == _RESULT_LOOT_UPDATE:
+                if self._on_loot_update:
+                    try:
+                        self._on_loot_update(message[1], message[2])
+                    except Exception as e:
+                        print(f"[ERRO] Callback de loot corrigido falhou: {e}")
+                
+            else:
+                _, index, stats, errors = message
+                with self._lock:
+                    self._worker_stats[index] = stats
+                    self._worker_errors[index] = errors
@@ -0,0 +1,136 @@
+"""
+Flow Table - Estado do decoder Photon por fluxo UDP
+Cada (src ip, src port, dst ip, dst port) tem seu próprio PhotonDecoder,
+então conexões simultâneas (servidor de jogo, chat, troca de zona,
+multibox) não compartilham remontagem de fragmentos.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+from .photon_decoder import PhotonDecoder, DecoderStats
+from .capture.base import FlowKey
+
+# Tempo sem pacotes para descartar um fluxo (segundos)
+FLOW_IDLE_TIMEOUT = 60
+
+# Máximo de fluxos simultâneos (o menos recente é descartado)
+MAX_FLOWS = 64
+
+# ((ip, porta), (ip, porta)) em ordem fixa, igual para os dois sentidos
+ConnectionKey = Tuple[Tuple[str, int], Tuple[str, int]]
+
+
+def connection_key(flow_key: FlowKey) -> ConnectionKey:
+    """
+    Chave da conexão independente de direção.
+    
+    Requests (cliente -> servidor) e eventos (servidor -> cliente) mexem no
+    mesmo estado, então os dois sentidos de um fluxo têm a mesma chave.
+    """
+    src = (flow_key[0], flow_key[1])
+    dst = (flow_key[2], flow_key[3])
+    return (src, dst) if src <= dst else (dst, src)
+
+
+def with_connection(callback: Callable[[dict], None], flow_key: FlowKey) -> Callable[[dict], None]:
+    """Callback que marca cada mensagem do fluxo com a conexão (message['connection'])."""
+    connection = connection_key(flow_key)
+    
+    def dispatch(message: dict):
+        message['connection'] = connection
+        callback(message)
+    
+    return dispatch
+
+
+class FlowState:
+    """Decoder e último pacote visto de um fluxo."""
+    
+    def __init__(self, decoder: PhotonDecoder, now: float):
+        self.decoder = decoder
+        self.last_seen = now
+
+
+class FlowTable:
+    """Tabela de fluxos UDP -> PhotonDecoder, com expiração por inatividade."""
+    
+    def __init__(self, decoder_factory: Callable[[FlowKey], PhotonDecoder],
+                 idle_timeout: float = FLOW_IDLE_TIMEOUT, max_flows: int = MAX_FLOWS):
+        self._decoder_factory = decoder_factory
+        self.idle_timeout = idle_timeout
+        self.max_flows = max_flows
+        
+        self._flows: 'OrderedDict[FlowKey, FlowState]' = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # Contadores de fluxos já descartados
+        self._retired_stats = DecoderStats()
+        self.flows_evicted = 0
+    
+    def __len__(self) -> int:
+        return len(self._flows)
+    
+    def get(self, key: FlowKey, now: Optional[float] = None) -> PhotonDecoder:
+        """Retorna o decoder do fluxo, criando se necessário."""
+        if now is None:
+            now = time.time()
+        
+        with self._lock:
+            state = self._flows.get(key)
+            if state is None:
+                state = FlowState(self._decoder_factory(key), now)
+                self._flows[key] = state
+                if len(self._flows) > self.max_flows:
+                    _, oldest = self._flows.popitem(last=False)
+                    self._retire(oldest)
+            else:
+                state.last_seen = now
+                self._flows.move_to_end(key)
+            
+            return state.decoder
+    
+    def decoders(self) -> List[PhotonDecoder]:
+        """Retorna os decoders ativos."""
+        with self._lock:
+            return [state.decoder for state in self._flows.values()]
+    
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Remove fluxos sem pacotes há mais de idle_timeout. Retorna quantos saíram."""
+        if now is None:
+            now = time.time()
+        
+        evicted = 0
+        with self._lock:
+            # Ordem do OrderedDict = ordem de último uso
+            while self._flows:
+                key, state = next(iter(self._flows.items()))
+                if now - state.last_seen <= self.idle_timeout:
+                    break
+                del self._flows[key]
+                self._retire(state)
+                evicted += 1
+        
+        return evicted
+    
+    def stats(self) -> DecoderStats:
+        """Soma os contadores de todos os fluxos (ativos e descartados)."""
+        with self._lock:
+            total = DecoderStats()
+            total.add(self._retired_stats)
+            for state in self._flows.values():
+                total.add(state.decoder.stats)
+            return total
+    
+    def clear(self):
+        """Descarta todos os fluxos."""
+        with self._lock:
+            for state in self._flows.values():
+                self._retire(state)
+            self._flows.clear()
+    
+    def _retire(self, state: FlowState):
+        self._retired_stats.add(state.decoder.stats)
+        self.flows_evicted += 1
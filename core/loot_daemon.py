@@ -0,0 +1,672 @@
+"""
+Loot Daemon - Um sniffer compartilhado por vários frontends via IPC local
+O daemon roda a captura + decode sem interface e publica o stream de
+LootEvents e um snapshot do estado em um Unix domain socket. GUI, dashboard
+e logger de terminal se conectam como clientes finos (LootDaemonClient),
+então um único decode alimenta quantos frontends estiverem abertos.
+
+Framing (little-endian): [tamanho u32][tipo u8][payload]
+    STATUS       status u8 (mesmos valores do LootRing)
+    LOOT         seq u64, timestamp f64 (UTC), quantidade u32, flags u8 e
+                 8 textos UTF-8 prefixados por tamanho u16
+    SNAPSHOT     status, início, total de loots, pacotes/descartes da captura,
+                 descartes da fila e os últimos loots (histórico)
+    LOOT_UPDATE  mesmo payload do LOOT: o evento corrigido de um loot pendente,
+                 com o seq do LOOT original
+O cliente só envia SNAPSHOT (payload vazio) para pedir um snapshot novo.
+"""
+
+import calendar
+import os
+import queue
+import select
+import socket
+import struct
+import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from models import LootEvent
+from storage import Player
+from utils import intern_str
+
+from .loot_ring import STATUS_CONNECTING, STATUS_ONLINE, STATUS_OFFLINE, STATUS_STOPPED
+
+
+# Tipos de mensagem
+MSG_STATUS = 1
+MSG_LOOT = 2
+MSG_SNAPSHOT = 3
+MSG_LOOT_UPDATE = 4
+
+# Flags do LOOT
+_FLAG_PENDING = 1   # item provisório: um LOOT_UPDATE com o mesmo seq ainda vai chegar
+
+# Loots mantidos no daemon para o snapshot de quem conecta depois
+DAEMON_HISTORY_SIZE = 1000
+
+# Frames aguardando envio por cliente; cliente que não acompanha é desconectado
+CLIENT_QUEUE_SIZE = 4096
+
+# Maior frame aceito (o snapshot com o histórico inteiro cabe com folga)
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+# Intervalo entre tentativas de conexão do cliente (segundos)
+RECONNECT_INTERVAL = 1.0
+
+_FRAME = struct.Struct('<IB')
+_STATUS = struct.Struct('<B')
+_LOOT = struct.Struct('<QdIB')
+_TEXT = struct.Struct('<H')
+# status, início, total de loots, pacotes, descartes do kernel, descartes da fila, loots no histórico
+_SNAPSHOT = struct.Struct('<BdQQQQI')
+
+
+def default_socket_path() -> str:
+    """Caminho padrão do socket (XDG_RUNTIME_DIR quando existir)."""
+    directory = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(directory, "ao-loot-logger.sock")
+
+
+# ============================================
+# CODEC
+# ============================================
+
+def encode_frame(message_type: int, payload: bytes = b'') -> bytes:
+    return _FRAME.pack(len(payload), message_type) + payload
+
+
+def _pack_text(parts: List[bytes], text: Optional[str]):
+    raw = (text or "").encode('utf-8')[:0xFFFF]
+    parts.append(_TEXT.pack(len(raw)))
+    parts.append(raw)
+
+
+def _unpack_text(data: bytes, offset: int) -> Tuple[str, int]:
+    length, = _TEXT.unpack_from(data, offset)
+    offset += _TEXT.size
+    return intern_str(data[offset:offset + length].decode('utf-8', 'ignore')), offset + length
+
+
+def encode_loot(seq: int, event: LootEvent) -> bytes:
+    """Payload de um LOOT."""
+    timestamp = event.timestamp
+    parts = [_LOOT.pack(
+        seq,
+        calendar.timegm(timestamp.utctimetuple()) + timestamp.microsecond / 1e6,
+        event.quantity,
+        _FLAG_PENDING if event.pending else 0
+    )]
+    for text in (event.item_id, event.item_name,
+                 event.looted_by.name, event.looted_by.guild, event.looted_by.alliance,
+                 event.looted_from.name, event.looted_from.guild, event.looted_from.alliance):
+        _pack_text(parts, text)
+    return b''.join(parts)
+
+
+def decode_loot(data: bytes, offset: int = 0) -> Tuple[int, LootEvent, int]:
+    """(seq, evento, offset após o registro)."""
+    seq, timestamp, quantity, flags = _LOOT.unpack_from(data, offset)
+    offset += _LOOT.size
+    
+    texts = []
+    for _ in range(8):
+        text, offset = _unpack_text(data, offset)
+        texts.append(text)
+    
+    # LootEvent usa datetime sem tzinfo em UTC (como os handlers)
+    event = LootEvent(
+        timestamp=datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None),
+        item_id=texts[0],
+        item_name=texts[1],
+        quantity=quantity,
+        looted_by=Player(texts[2], texts[3], texts[4]),
+        looted_from=Player(texts[5], texts[6], texts[7]),
+        pending=bool(flags & _FLAG_PENDING)
+    )
+    return seq, event, offset
+
+
+@dataclass
+class DaemonSnapshot:
+    """Estado do daemon no momento do snapshot."""
+    status: int = STATUS_CONNECTING
+    started_at: float = 0.0
+    loot_total: int = 0
+    packets: int = 0
+    drops: int = 0
+    queue_dropped: int = 0
+    history: List[Tuple[int, LootEvent]] = field(default_factory=list)
+
+
+def encode_snapshot(snapshot: DaemonSnapshot) -> bytes:
+    """Payload de um SNAPSHOT."""
+    parts = [_SNAPSHOT.pack(
+        snapshot.status, snapshot.started_at, snapshot.loot_total,
+        snapshot.packets, snapshot.drops, snapshot.queue_dropped, len(snapshot.history)
+    )]
+    for seq, event in snapshot.history:
+        parts.append(encode_loot(seq, event))
+    return b''.join(parts)
+
+
+def decode_snapshot(data: bytes) -> DaemonSnapshot:
+    status, started_at, loot_total, packets, drops, queue_dropped, count = _SNAPSHOT.unpack_from(data, 0)
+    offset = _SNAPSHOT.size
+    
+    history = []
+    for _ in range(count):
+        seq, event, offset = decode_loot(data, offset)
+        history.append((seq, event))
+    
+    return DaemonSnapshot(status, started_at, loot_total, packets, drops, queue_dropped, history)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    """Lê exatamente size bytes; None se a conexão fechou."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if not count:
+            return None
+        received += count
+    return bytes(buffer)
+
+
+def read_frame(sock: socket.socket) -> Optional[Tuple[int, bytes]]:
+    """(tipo, payload) do próximo frame; None se a conexão fechou."""
+    header = _recv_exact(sock, _FRAME.size)
+    if header is None:
+        return None
+    
+    length, message_type = _FRAME.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame de {length} bytes excede o limite")
+    
+    payload = _recv_exact(sock, length) if length else b''
+    if payload is None:
+        return None
+    return message_type, payload
+
+
+def _require_unix_sockets():
+    if not hasattr(socket, 'AF_UNIX'):
+        raise RuntimeError("Unix domain sockets não são suportados nesta plataforma")
+
+
+# ============================================
+# DAEMON
+# ============================================
+
+class _Subscriber:
+    """Conexão de um frontend no daemon."""
+    
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.frames: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self.thread: Optional[threading.Thread] = None
+    
+    def send(self, frame: bytes) -> bool:
+        """Enfileira um frame; False se o cliente ficou para trás."""
+        try:
+            self.frames.put_nowait(frame)
+            return True
+        except queue.Full:
+            return False
+    
+    def close(self, flush: bool = False):
+        """Encerra a conexão; com flush, envia o que já está na fila antes."""
+        try:
+            self.frames.put_nowait(None)
+        except queue.Full:
+            flush = False
+        
+        if flush and self.thread:
+            self.thread.join(timeout=2)
+        
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class LootDaemon:
+    """Captura sem interface publicando loots para os clientes conectados."""
+    
+    def __init__(self, socket_path: Optional[str] = None, history_size: int = DAEMON_HISTORY_SIZE,
+                 socket_mode: int = 0o600, **sniffer_options):
+        self.socket_path = socket_path or default_socket_path()
+        self.socket_mode = socket_mode
+        self.sniffer_options = sniffer_options
+        
+        self.sniffer = None
+        self.running = False
+        self.status = STATUS_CONNECTING
+        self.started_at = 0.0
+        self.loot_total = 0
+        
+        self._history: Deque[Tuple[int, LootEvent]] = deque(maxlen=history_size)
+        
+        # Loots pendentes já publicados -> seq (a correção sai com o mesmo seq)
+        self._pending_seqs: Dict[LootEvent, int] = {}
+        self._server: Optional[socket.socket] = None
+        self._accept_thread: Optional[threading.Thread] = None
+        self._subscribers: List[_Subscriber] = []
+        self._lock = threading.Lock()
+    
+    @property
+    def clients(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+    
+    def start(self):
+        """Abre o socket e inicia a captura."""
+        if self.running:
+            return
+        
+        _require_unix_sockets()
+        from .sniffer import AlbionSniffer
+        from handlers import data_handler
+        
+        self._server = self._bind()
+        self.running = True
+        self.started_at = time.time()
+        
+        self._accept_thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._accept_thread.start()
+        
+        try:
+            self.sniffer = AlbionSniffer(**self.sniffer_options)
+            data_handler.on_loot(self.publish)
+            data_handler.on_loot_update(self.publish_update)
+            self.sniffer.on_loot(self.publish)
+            self.sniffer.on_loot_update(self.publish_update)
+            self.sniffer.on_event(data_handler.handle_event)
+            self.sniffer.on_request(data_handler.handle_request)
+            self.sniffer.on_response(data_handler.handle_response)
+            self.sniffer.set_event_projections(data_handler.event_projections())
+            self.sniffer.on_online(lambda: self.set_status(STATUS_ONLINE))
+            self.sniffer.on_offline(lambda: self.set_status(STATUS_OFFLINE))
+            self.sniffer.start()
+        except Exception:
+            self.stop()
+            raise
+        
+        print(f"[INFO] Daemon escutando em {self.socket_path}")
+    
+    def stop(self):
+        """Para a captura, avisa os clientes e remove o socket."""
+        if not self.running:
+            return
+        
+        if self.sniffer:
+            self.sniffer.stop()
+        self.set_status(STATUS_STOPPED)
+        self.running = False
+        
+        try:
+            self._server.close()
+        except OSError:
+            pass
+        
+        # Clientes recebem o STATUS_STOPPED antes da conexão fechar
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.close(flush=True)
+        
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+    
+    def _bind(self) -> socket.socket:
+        path = self.socket_path
+        
+        if os.path.exists(path):
+            # Socket de uma execução anterior: só remove se ninguém responde nele
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(path)
+                probe.close()
+                raise RuntimeError(f"Já existe um daemon rodando em {path}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                probe.close()
+                os.unlink(path)
+        
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        os.chmod(path, self.socket_mode)
+        server.listen(8)
+        server.settimeout(0.5)
+        return server
+    
+    def set_status(self, status: int):
+        """Atualiza o status da captura e repassa aos clientes."""
+        self.status = status
+        self._broadcast(encode_frame(MSG_STATUS, _STATUS.pack(status)))
+    
+    def publish(self, event: LootEvent):
+        """Registra um loot no histórico e envia aos clientes."""
+        with self._lock:
+            self.loot_total += 1
+            seq = self.loot_total
+            self._history.append((seq, event))
+            if event.pending:
+                self._pending_seqs[event] = seq
+        self._broadcast(encode_frame(MSG_LOOT, encode_loot(seq, event)))
+    
+    def publish_update(self, old_event: LootEvent, new_event: LootEvent):
+        """Troca um loot pendente pelo corrigido no histórico e envia a correção aos clientes."""
+        with self._lock:
+            seq = self._pending_seqs.pop(old_event, None)
+            if seq is None:
+                return
+            for index, (history_seq, _) in enumerate(self._history):
+                if history_seq == seq:
+                    self._history[index] = (seq, new_event)
+                    break
+        self._broadcast(encode_frame(MSG_LOOT_UPDATE, encode_loot(seq, new_event)))
+    
+    def snapshot(self) -> DaemonSnapshot:
+        """Estado atual (status, contadores e histórico)."""
+        with self._lock:
+            return self._snapshot_locked()
+    
+    def _snapshot_locked(self) -> DaemonSnapshot:
+        packets = drops = queue_dropped = 0
+        if self.sniffer:
+            capture_stats = self.sniffer.capture_stats
+            packets, drops = capture_stats.packets, capture_stats.drops
+            queue_dropped = self.sniffer.queue_stats.dropped
+        
+        return DaemonSnapshot(
+            self.status, self.started_at, self.loot_total,
+            packets, drops, queue_dropped, list(self._history)
+        )
+    
+    def _broadcast(self, frame: bytes):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        
+        for subscriber in subscribers:
+            if not subscriber.send(frame):
+                print("[AVISO] Cliente do daemon não acompanhou o stream, desconectando")
+                self._remove(subscriber)
+                subscriber.close()
+    
+    def _remove(self, subscriber: _Subscriber):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+    
+    def _accept_loop(self):
+        while self.running:
+            try:
+                sock, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            
+            sock.settimeout(None)
+            subscriber = _Subscriber(sock)
+            
+            # Snapshot e registro juntos: todo loot fica no histórico ou no stream
+            with self._lock:
+                snapshot = self._snapshot_locked()
+                self._subscribers.append(subscriber)
+                subscriber.send(encode_frame(MSG_SNAPSHOT, encode_snapshot(snapshot)))
+            
+            subscriber.thread = threading.Thread(target=self._client_loop, args=(subscriber,), daemon=True)
+            subscriber.thread.start()
+    
+    def _client_loop(self, subscriber: _Subscriber):
+        sock = subscriber.sock
+        
+        try:
+            while True:
+                try:
+                    frame = subscriber.frames.get(timeout=0.1)
+                except queue.Empty:
+                    frame = b''
+                
+                if frame is None:
+                    break
+                if frame:
+                    sock.sendall(frame)
+                
+                # Pedido de snapshot do cliente
+                readable, _, _ = select.select([sock], [], [], 0)
+                if readable:
+                    message = read_frame(sock)
+                    if message is None:
+                        break
+                    if message[0] == MSG_SNAPSHOT:
+                        subscriber.send(encode_frame(MSG_SNAPSHOT, encode_snapshot(self.snapshot())))
+            
+        except (OSError, ValueError):
+            pass
+            
+        finally:
+            self._remove(subscriber)
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+
+# ============================================
+# CLIENTE
+# ============================================
+
+class LootDaemonClient:
+    """
+    Frontend fino do LootDaemon, com a mesma interface de controle do
+    AlbionSniffer/CaptureProcess (start/stop, on_loot, on_loot_update,
+    on_online, on_offline). Reconecta sozinho se o daemon reiniciar, sem
+    repetir loots já entregues.
+    """
+    
+    def __init__(self, socket_path: Optional[str] = None, replay_history: bool = True):
+        self.socket_path = socket_path or default_socket_path()
+        self.replay_history = replay_history
+        
+        self.running = False
+        self.connected = False
+        self.snapshot: Optional[DaemonSnapshot] = None
+        
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._status = STATUS_CONNECTING
+        self._started_at = 0.0
+        self._last_seq = 0
+        self._snapshot_event = threading.Event()
+        
+        # Loots entregues com pending, por seq, aguardando o LOOT_UPDATE
+        self._pending: Dict[int, LootEvent] = {}
+        
+        # Callbacks
+        self._on_loot: Optional[Callable] = None
+        self._on_loot_update: Optional[Callable] = None
+        self._on_online: Optional[Callable[[], None]] = None
+        self._on_offline: Optional[Callable[[], None]] = None
+    
+    def on_loot(self, callback: Callable):
+        """Registra callback para LootEvents recebidos do daemon."""
+        self._on_loot = callback
+    
+    def on_loot_update(self, callback: Callable):
+        """Registra callback (evento antigo, evento corrigido) para loots com item pendente."""
+        self._on_loot_update = callback
+    
+    def on_online(self, callback: Callable[[], None]):
+        """Registra callback para quando Albion é detectado."""
+        self._on_online = callback
+    
+    def on_offline(self, callback: Callable[[], None]):
+        """Registra callback para quando Albion não é mais detectado (ou o daemon caiu)."""
+        self._on_offline = callback
+    
+    def start(self):
+        """Conecta ao daemon (em background, tentando até ele subir)."""
+        if self.running:
+            return
+        
+        _require_unix_sockets()
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Desconecta do daemon (a captura continua para os outros clientes)."""
+        if not self.running:
+            return
+        
+        self.running = False
+        sock = self._sock
+        if sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=2)
+    
+    def request_snapshot(self, timeout: float = 2.0) -> Optional[DaemonSnapshot]:
+        """Pede um snapshot novo ao daemon e espera a resposta."""
+        sock = self._sock
+        if not self.connected or sock is None:
+            return None
+        
+        self._snapshot_event.clear()
+        try:
+            sock.sendall(encode_frame(MSG_SNAPSHOT))
+        except OSError:
+            return None
+        
+        if not self._snapshot_event.wait(timeout):
+            return None
+        return self.snapshot
+    
+    def _run(self):
+        warned = False
+        
+        while self.running:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                if not warned:
+                    print(f"[AVISO] Daemon não encontrado em {self.socket_path}, aguardando...")
+                    warned = True
+                time.sleep(RECONNECT_INTERVAL)
+                continue
+            
+            print(f"[INFO] Conectado ao daemon em {self.socket_path}")
+            warned = False
+            self._sock = sock
+            self.connected = True
+            
+            try:
+                self._receive_loop(sock)
+            except (OSError, ValueError) as e:
+                if self.running:
+                    print(f"[AVISO] Conexão com o daemon perdida: {e}")
+            
+            self.connected = False
+            self._sock = None
+            sock.close()
+            
+            if self.running:
+                self._set_status(STATUS_OFFLINE)
+                time.sleep(RECONNECT_INTERVAL)
+    
+    def _receive_loop(self, sock: socket.socket):
+        while self.running:
+            message = read_frame(sock)
+            if message is None:
+                return
+            
+            message_type, payload = message
+            
+            if message_type == MSG_LOOT:
+                seq, event, _ = decode_loot(payload)
+                self._dispatch(seq, event)
+                
+            elif message_type == MSG_LOOT_UPDATE:
+                seq, event, _ = decode_loot(payload)
+                self._dispatch_update(seq, event)
+                
+            elif message_type == MSG_STATUS:
+                self._set_status(_STATUS.unpack(payload)[0])
+                
+            elif message_type == MSG_SNAPSHOT:
+                self._apply_snapshot(decode_snapshot(payload))
+    
+    def _apply_snapshot(self, snapshot: DaemonSnapshot):
+        # Outra execução do daemon: a sequência recomeça do zero
+        if snapshot.started_at != self._started_at:
+            first_connection = not self._started_at
+            self._started_at = snapshot.started_at
+            self._last_seq = 0
+            if first_connection and not self.replay_history and snapshot.history:
+                self._last_seq = snapshot.history[-1][0]
+            
+            # O daemon anterior não vai mais corrigir esses: saem como estão
+            for seq, event in list(self._pending.items()):
+                self._dispatch_update(seq, replace(event, pending=False))
+        
+        for seq, event in snapshot.history:
+            # Corrigido enquanto o cliente estava desconectado
+            if seq in self._pending and not event.pending:
+                self._dispatch_update(seq, event)
+            self._dispatch(seq, event)
+        
+        self.snapshot = snapshot
+        self._snapshot_event.set()
+        self._set_status(snapshot.status)
+    
+    def _dispatch(self, seq: int, event: LootEvent):
+        if seq <= self._last_seq:
+            return
+        self._last_seq = seq
+        
+        if event.pending:
+            self._pending[seq] = event
+        
+        if self._on_loot:
+            try:
+                self._on_loot(event)
+            except Exception as e:
+                print(f"[ERRO] Callback de loot falhou: {e}")
+    
+    def _dispatch_update(self, seq: int, event: LootEvent):
+        old_event = self._pending.pop(seq, None)
+        if old_event is None or not self._on_loot_update:
+            return
+        
+        try:
+            self._on_loot_update(old_event, event)
+        except Exception as e:
+            print(f"[ERRO] Callback de loot corrigido falhou: {e}")
+    
+    def _set_status(self, status: int):
+        # Daemon parado conta como offline para a interface
+        if status == STATUS_STOPPED:
+            status = STATUS_OFFLINE
+        if status == self._status:
+            return
+        self._status = status
+        
+        if status == STATUS_ONLINE and self._on_online:
+            self._on_online()
+        elif status == STATUS_OFFLINE and self._on_offline:
+            self._on_offline()
@@ -0,0 +1,233 @@
+"""
+Loot Ring - Ring buffer de LootEvents em memória compartilhada
+Um produtor (o processo de captura) escreve registros de tamanho fixo em
+multiprocessing.shared_memory; qualquer número de consumidores (GUI,
+dashboard) lê com seu próprio cursor. Consumidor lento perde os registros
+mais antigos, mas nunca segura o produtor.
+
+Layout (little-endian):
+    header (64 bytes): magic, versão, tamanho do registro, capacidade,
+                       status da captura, sequência de escrita
+    registros:         commit (seq + 1), timestamp, quantidade, flags e
+                       campos de texto UTF-8 com tamanho fixo
+
+Um registro de correção (publish_update) traz o evento corrigido e o item
+antigo; o consumidor reconstrói o evento antigo para achar o que já exibiu.
+"""
+
+import calendar
+import struct
+from dataclasses import replace
+from datetime import datetime, timezone
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+from models import LootEvent
+from storage import Player
+from utils import intern_str
+
+
+LOOT_RING_MAGIC = 0x4C4F4F54  # "LOOT"
+LOOT_RING_VERSION = 2
+
+# Registros no ring (um fight grande gera algumas centenas por minuto)
+LOOT_RING_CAPACITY = 4096
+
+# Status da captura publicado no header
+STATUS_CONNECTING = 0
+STATUS_ONLINE = 1
+STATUS_OFFLINE = 2
+STATUS_STOPPED = 3
+
+HEADER_SIZE = 64
+
+# magic, versão, tamanho do registro, capacidade, status, sequência de escrita
+_HEADER = struct.Struct('<IHHIIQ')
+_STATUS_OFFSET = 12
+_WRITE_SEQ_OFFSET = 16
+_STATUS = struct.Struct('<I')
+_SEQ = struct.Struct('<Q')
+
+# commit, timestamp (UTC), quantidade, flags, item_id, item_name,
+# looted_by (nome, guild, alliance), looted_from (nome, guild, alliance),
+# item_id e item_name antigos (só em correções)
+_RECORD = struct.Struct('<QdIB64s128s32s32s16s32s32s16s64s128s')
+
+# Flags do registro
+_FLAG_PENDING = 1   # evento com item provisório (LootEvent.pending)
+_FLAG_UPDATE = 2    # correção de um evento pendente já publicado
+
+# (evento, evento que ele substitui ou None para um loot novo)
+LootRecord = Tuple[LootEvent, Optional[LootEvent]]
+
+
+def _encode(text: Optional[str]) -> bytes:
+    return (text or "").encode('utf-8')
+
+
+def _decode(raw: bytes) -> str:
+    # Truncamento no meio de um caractere multibyte é descartado
+    return intern_str(raw.rstrip(b'\0').decode('utf-8', 'ignore'))
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        # Python 3.13+: consumidores não registram o segmento no resource_tracker
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class LootRing:
+    """Ring de LootEvents em shared memory (um produtor, vários consumidores)."""
+    
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool):
+        self._memory = memory
+        self._owner = owner
+        self.buffer = memory.buf
+        
+        magic, version, record_size, capacity, _, _ = _HEADER.unpack_from(self.buffer, 0)
+        if magic != LOOT_RING_MAGIC or version != LOOT_RING_VERSION or record_size != _RECORD.size:
+            raise ValueError(f"Segmento {memory.name} não é um LootRing compatível")
+        
+        self.capacity = capacity
+    
+    @classmethod
+    def create(cls, capacity: int = LOOT_RING_CAPACITY, name: Optional[str] = None) -> 'LootRing':
+        """Cria o segmento (lado do produtor)."""
+        memory = shared_memory.SharedMemory(name=name, create=True, size=HEADER_SIZE + capacity * _RECORD.size)
+        _HEADER.pack_into(memory.buf, 0, LOOT_RING_MAGIC, LOOT_RING_VERSION, _RECORD.size, capacity, STATUS_CONNECTING, 0)
+        return cls(memory, owner=True)
+    
+    @classmethod
+    def attach(cls, name: str) -> 'LootRing':
+        """Abre um segmento existente (produtor em outro processo ou consumidor)."""
+        return cls(_attach(name), owner=False)
+    
+    @property
+    def name(self) -> str:
+        return self._memory.name
+    
+    @property
+    def write_seq(self) -> int:
+        return _SEQ.unpack_from(self.buffer, _WRITE_SEQ_OFFSET)[0]
+    
+    @property
+    def status(self) -> int:
+        return _STATUS.unpack_from(self.buffer, _STATUS_OFFSET)[0]
+    
+    def set_status(self, status: int):
+        _STATUS.pack_into(self.buffer, _STATUS_OFFSET, status)
+    
+    def publish(self, event: LootEvent):
+        """Escreve um evento (só o produtor chama)."""
+        self._write(event, _FLAG_PENDING if event.pending else 0)
+    
+    def publish_update(self, old_event: LootEvent, new_event: LootEvent):
+        """Escreve a correção de um evento pendente (só o item muda, ver pending_items)."""
+        self._write(new_event, _FLAG_UPDATE, old_event)
+    
+    def _write(self, event: LootEvent, flags: int, old_event: Optional[LootEvent] = None):
+        buffer = self.buffer
+        seq = self.write_seq
+        offset = HEADER_SIZE + (seq % self.capacity) * _RECORD.size
+        
+        # commit = 0 invalida o slot enquanto o corpo é reescrito
+        _SEQ.pack_into(buffer, offset, 0)
+        
+        timestamp = event.timestamp
+        _RECORD.pack_into(
+            buffer, offset,
+            0,
+            calendar.timegm(timestamp.utctimetuple()) + timestamp.microsecond / 1e6,
+            event.quantity,
+            flags,
+            _encode(event.item_id), _encode(event.item_name),
+            _encode(event.looted_by.name), _encode(event.looted_by.guild), _encode(event.looted_by.alliance),
+            _encode(event.looted_from.name), _encode(event.looted_from.guild), _encode(event.looted_from.alliance),
+            _encode(old_event.item_id if old_event else None), _encode(old_event.item_name if old_event else None)
+        )
+        
+        _SEQ.pack_into(buffer, offset, seq + 1)
+        _SEQ.pack_into(buffer, _WRITE_SEQ_OFFSET, seq + 1)
+    
+    def read_record(self, seq: int) -> Optional[LootRecord]:
+        """Lê o registro seq; None se foi sobrescrito durante a leitura."""
+        buffer = self.buffer
+        offset = HEADER_SIZE + (seq % self.capacity) * _RECORD.size
+        
+        # Cópia + conferência do commit antes e depois (seqlock)
+        record = bytes(buffer[offset:offset + _RECORD.size])
+        if _SEQ.unpack_from(buffer, offset)[0] != seq + 1:
+            return None
+        
+        (commit, timestamp, quantity, flags, item_id, item_name,
+         by_name, by_guild, by_alliance,
+         from_name, from_guild, from_alliance,
+         old_item_id, old_item_name) = _RECORD.unpack(record)
+        
+        if commit != seq + 1:
+            return None
+        
+        # LootEvent usa datetime sem tzinfo em UTC (como os handlers)
+        event = LootEvent(
+            timestamp=datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None),
+            item_id=_decode(item_id),
+            item_name=_decode(item_name),
+            quantity=quantity,
+            looted_by=Player(_decode(by_name), _decode(by_guild), _decode(by_alliance)),
+            looted_from=Player(_decode(from_name), _decode(from_guild), _decode(from_alliance)),
+            pending=bool(flags & _FLAG_PENDING)
+        )
+        
+        if not flags & _FLAG_UPDATE:
+            return event, None
+        return event, replace(event, item_id=_decode(old_item_id), item_name=_decode(old_item_name), pending=True)
+    
+    def close(self):
+        """Fecha o mapeamento (e remove o segmento, se este lado o criou)."""
+        self.buffer = None
+        self._memory.close()
+        if self._owner:
+            try:
+                self._memory.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class LootRingReader:
+    """Cursor de um consumidor do LootRing."""
+    
+    def __init__(self, ring: LootRing, from_start: bool = True):
+        self.ring = ring
+        self.cursor = 0 if from_start else ring.write_seq
+        
+        # Registros sobrescritos antes de serem lidos
+        self.lost = 0
+    
+    def read(self, max_events: int = 1024) -> List[LootRecord]:
+        """Retorna os registros novos (evento, evento substituído) desde a última leitura."""
+        ring = self.ring
+        write_seq = ring.write_seq
+        
+        # Ficou mais de uma volta para trás: pula para o registro mais antigo ainda no ring
+        oldest = write_seq - ring.capacity
+        if self.cursor < oldest:
+            self.lost += oldest - self.cursor
+            self.cursor = oldest
+        
+        records: List[LootRecord] = []
+        end = min(write_seq, self.cursor + max_events)
+        while self.cursor < end:
+            record = ring.read_record(self.cursor)
+            if record is None:
+                self.lost += 1
+            else:
+                records.append(record)
+            self.cursor += 1
+        
+        return records
+    
+    def poll(self) -> Tuple[int, List[LootRecord]]:
+        """(status da captura, registros novos)."""
+        return self.ring.status, self.read()
@@ -0,0 +1,136 @@
+"""
+Packet Queue - Fila limitada entre a captura e o decode
+A thread de captura só enfileira; o worker de decode retira em lotes.
+Quando a fila enche, a política de backpressure decide entre descartar o
+mais antigo (a captura nunca espera) ou bloquear a captura até haver espaço.
+
+enqueued/finished permitem que a captura entregue views do próprio buffer:
+um payload aceito na posição N da fila pode ser reaproveitado quando
+finished >= N (o consumidor chamou task_done ou o item foi descartado).
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, List, Optional, Tuple
+
+
+# Políticas de backpressure
+BACKPRESSURE_DROP_OLDEST = "drop_oldest"
+BACKPRESSURE_BLOCK = "block"
+
+# Capacidade padrão (datagramas)
+PACKET_QUEUE_SIZE = 8192
+
+
+@dataclass
+class QueueStats:
+    """Contadores da fila."""
+    depth: int = 0
+    high_water: int = 0
+    enqueued: int = 0
+    dropped: int = 0
+
+
+class PacketQueue:
+    """Fila FIFO limitada com retirada em lote."""
+    
+    def __init__(self, max_size: int = PACKET_QUEUE_SIZE, policy: str = BACKPRESSURE_DROP_OLDEST):
+        if policy not in (BACKPRESSURE_DROP_OLDEST, BACKPRESSURE_BLOCK):
+            raise ValueError(f"Política de backpressure desconhecida: {policy}")
+        
+        self.max_size = max_size
+        self.policy = policy
+        
+        self._items: Deque[Any] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+        
+        self.high_water = 0
+        self.enqueued = 0
+        self.dropped = 0
+        
+        # Itens que o consumidor terminou de usar (task_done) ou que saíram sem uso
+        self.finished = 0
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def put(self, item: Any) -> bool:
+        """Enfileira um item. Retorna False se a fila foi fechada."""
+        with self._lock:
+            if self._closed:
+                return False
+            
+            if len(self._items) >= self.max_size:
+                if self.policy == BACKPRESSURE_BLOCK:
+                    while len(self._items) >= self.max_size and not self._closed:
+                        self._not_full.wait()
+                    if self._closed:
+                        return False
+                else:
+                    self._items.popleft()
+                    self.dropped += 1
+                    self.finished += 1
+            
+            self._items.append(item)
+            self.enqueued += 1
+            
+            depth = len(self._items)
+            if depth > self.high_water:
+                self.high_water = depth
+            
+            self._not_empty.notify()
+            return True
+    
+    def get_batch(self, max_items: int, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Retira até max_items itens. Espera até timeout se a fila estiver
+        vazia; retorna lista vazia no timeout ou se a fila foi fechada.
+        """
+        with self._lock:
+            if not self._items and not self._closed:
+                self._not_empty.wait(timeout)
+            
+            items = self._items
+            count = min(len(items), max_items)
+            batch = [items.popleft() for _ in range(count)]
+            
+            if count:
+                self._not_full.notify_all()
+            
+            return batch
+    
+    def task_done(self, count: int = 1):
+        """Marca count itens retirados (na ordem da fila) como processados."""
+        with self._lock:
+            self.finished += count
+    
+    def progress(self) -> Tuple[int, int]:
+        """(itens aceitos, itens processados ou descartados) desde a criação."""
+        with self._lock:
+            return self.enqueued, self.finished
+    
+    def close(self):
+        """Fecha a fila e acorda quem estiver esperando (itens restantes ainda podem ser retirados)."""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+    
+    def reopen(self):
+        """Reabre a fila descartando o que sobrou."""
+        with self._lock:
+            self.finished += len(self._items)
+            self._items.clear()
+            self._closed = False
+    
+    @property
+    def closed(self) -> bool:
+        return self._closed
+    
+    def stats(self) -> QueueStats:
+        with self._lock:
+            return QueueStats(len(self._items), self.high_water, self.enqueued, self.dropped)
@@ -3,10 +3,11 @@ Photon Decoder - Parser do protocolo de rede Photon
 Baseado no photon-parser.js do projeto original
 """
 
+import time
 from enum import IntEnum
-from typing import Dict, Any, Optional, Callable, List
-from dataclasses import dataclass, field
-from .buffer_reader import BufferReader
+from typing import Dict, Any, Optional, Callable, FrozenSet, List
+from dataclasses import dataclass, field, fields
+from .buffer_reader import BufferReader, BufferLike
 from .protocol16 import Protocol16
 
 
@@ -36,20 +37,237 @@ PHOTON_HEADER_LENGTH = 12
 PHOTON_COMMAND_HEADER_LENGTH = 12
 PHOTON_FRAGMENT_HEADER_LENGTH = 20
 
+# Limites da remontagem de fragmentos
+MAX_FRAGMENTED_PACKET_SIZE = 1024 * 1024      # Tamanho máximo de um pacote remontado
+MAX_PENDING_FRAGMENT_BYTES = 4 * 1024 * 1024  # Total de bytes em remontagem
+MAX_PENDING_FRAGMENTED_PACKETS = 64           # Pacotes em remontagem simultânea
+MAX_FRAGMENT_COUNT = 4096                     # Fragmentos por pacote (limita o bitmap)
+FRAGMENT_TTL = 10                             # Segundos até descartar um pacote incompleto
+
+# Janela de deduplicação de comandos reliable (números de sequência por canal)
+RELIABLE_WINDOW_SIZE = 1024
+
+# No Albion, eventos relevantes têm eventCode = 1 e o ID real fica no parâmetro 252
+ALBION_EVENT_CODE = 1
+EVENT_ID_PARAM = 252
+
+
+@dataclass
+class DecoderStats:
+    """Contadores do decoder."""
+    messages_decoded: int = 0
+    messages_prefiltered: int = 0
+    
+    # Remontagem de fragmentos (completed/expired/evicted contam pacotes)
+    fragments_completed: int = 0
+    fragments_expired: int = 0
+    fragments_evicted: int = 0
+    fragments_duplicate: int = 0
+    fragments_oversized: int = 0
+    fragments_invalid: int = 0
+    
+    # Comandos reliable retransmitidos descartados
+    reliable_duplicates: int = 0
+    
+    # Mensagens que falharam ao decodificar (ou ao processar no callback)
+    decode_errors: int = 0
+    
+    def add(self, other: 'DecoderStats'):
+        """Soma os contadores de outro decoder (agregação por fluxo)."""
+        for item in fields(self):
+            setattr(self, item.name, getattr(self, item.name) + getattr(other, item.name))
+
 
 @dataclass
 class FragmentedPacket:
     """Representa um pacote fragmentado sendo reassemblado."""
-    bytes_written: int = 0
     total_length: int = 0
+    fragment_count: int = 0
+    received: int = 0           # Bitmap dos fragment_number já recebidos
+    received_count: int = 0
+    created_at: float = 0.0
     payload: bytearray = field(default_factory=bytearray)
 
 
+class FragmentReassembler:
+    """
+    Remonta SEND_RELIABLE_FRAGMENT com memória limitada.
+    
+    Fragmentos recebidos são marcados em um bitmap (retransmissões não contam
+    duas vezes, e o número de fragmentos é limitado para o bitmap também ser),
+    o total em remontagem é limitado em bytes e em pacotes, e pacotes
+    incompletos expiram após FRAGMENT_TTL.
+    """
+    
+    def __init__(self, stats: DecoderStats,
+                 max_packet_size: int = MAX_FRAGMENTED_PACKET_SIZE,
+                 max_pending_bytes: int = MAX_PENDING_FRAGMENT_BYTES,
+                 max_pending_packets: int = MAX_PENDING_FRAGMENTED_PACKETS,
+                 max_fragment_count: int = MAX_FRAGMENT_COUNT,
+                 ttl: float = FRAGMENT_TTL):
+        self.stats = stats
+        self.max_packet_size = max_packet_size
+        self.max_pending_bytes = max_pending_bytes
+        self.max_pending_packets = max_pending_packets
+        self.max_fragment_count = max_fragment_count
+        self.ttl = ttl
+        
+        # Ordem de inserção = ordem de criação (mais antigo primeiro)
+        self.pending: Dict[int, FragmentedPacket] = {}
+        self.pending_bytes = 0
+    
+    def add(self, sequence_number: int, fragment_count: int, fragment_number: int,
+            total_length: int, fragment_offset: int, data: memoryview,
+            now: Optional[float] = None) -> Optional[bytearray]:
+        """Adiciona um fragmento. Retorna o payload quando o pacote fica completo."""
+        if now is None:
+            now = time.monotonic()
+        
+        if total_length <= 0 or total_length > self.max_packet_size or total_length > self.max_pending_bytes:
+            self.stats.fragments_oversized += 1
+            return None
+        
+        # fragment_count vem do pacote: sem limite, 1 << fragment_number vira um int enorme
+        data_length = len(data)
+        if (fragment_count <= 0 or fragment_count > self.max_fragment_count or fragment_count > total_length
+                or not 0 <= fragment_number < fragment_count
+                or fragment_offset < 0 or fragment_offset + data_length > total_length):
+            self.stats.fragments_invalid += 1
+            return None
+        
+        packet = self.pending.get(sequence_number)
+        
+        if packet is not None and now - packet.created_at > self.ttl:
+            self._drop(sequence_number)
+            self.stats.fragments_expired += 1
+            packet = None
+        
+        if packet is None:
+            self.expire(now)
+            self._make_room(total_length)
+            packet = FragmentedPacket(
+                total_length=total_length,
+                fragment_count=fragment_count,
+                created_at=now,
+                payload=bytearray(total_length)
+            )
+            self.pending[sequence_number] = packet
+            self.pending_bytes += total_length
+        
+        elif packet.total_length != total_length or packet.fragment_count != fragment_count:
+            self.stats.fragments_invalid += 1
+            return None
+        
+        bit = 1 << fragment_number
+        if packet.received & bit:
+            self.stats.fragments_duplicate += 1
+            return None
+        
+        # Copia fragmento para a posição correta
+        packet.payload[fragment_offset:fragment_offset + data_length] = data
+        packet.received |= bit
+        packet.received_count += 1
+        
+        # Completo só quando todos os fragmentos distintos chegaram
+        if packet.received_count < packet.fragment_count:
+            return None
+        
+        self._drop(sequence_number)
+        self.stats.fragments_completed += 1
+        return packet.payload
+    
+    def expire(self, now: Optional[float] = None) -> int:
+        """Descarta pacotes incompletos mais velhos que o TTL. Retorna quantos saíram."""
+        if now is None:
+            now = time.monotonic()
+        
+        expired = 0
+        while self.pending:
+            sequence_number, packet = next(iter(self.pending.items()))
+            if now - packet.created_at <= self.ttl:
+                break
+            self._drop(sequence_number)
+            expired += 1
+        
+        self.stats.fragments_expired += expired
+        return expired
+    
+    def clear(self):
+        """Descarta todos os pacotes em remontagem."""
+        self.pending.clear()
+        self.pending_bytes = 0
+    
+    def _make_room(self, total_length: int):
+        """Descarta os pacotes mais antigos até caber um novo."""
+        while self.pending and (
+            len(self.pending) >= self.max_pending_packets
+            or self.pending_bytes + total_length > self.max_pending_bytes
+        ):
+            self._drop(next(iter(self.pending)))
+            self.stats.fragments_evicted += 1
+    
+    def _drop(self, sequence_number: int):
+        packet = self.pending.pop(sequence_number)
+        self.pending_bytes -= packet.total_length
+
+
+class ReliableWindow:
+    """
+    Janela deslizante de números de sequência reliable, por canal.
+    
+    Guarda o maior número visto e um bitmap dos últimos `size` anteriores;
+    um número já marcado é uma retransmissão. Números muito mais antigos que
+    a janela indicam que a sequência recomeçou (nova conexão) e reiniciam o canal.
+    """
+    
+    def __init__(self, size: int = RELIABLE_WINDOW_SIZE):
+        self.size = size
+        self._mask = (1 << size) - 1
+        self._highest: Dict[int, int] = {}
+        self._bitmap: Dict[int, int] = {}
+    
+    def accept(self, channel_id: int, sequence_number: int) -> bool:
+        """Registra o número de sequência. Retorna False se for duplicado."""
+        highest = self._highest.get(channel_id)
+        
+        if highest is None or highest - sequence_number >= self.size:
+            self._highest[channel_id] = sequence_number
+            self._bitmap[channel_id] = 1
+            return True
+        
+        if sequence_number > highest:
+            shift = sequence_number - highest
+            bitmap = (self._bitmap[channel_id] << shift) & self._mask if shift < self.size else 0
+            self._highest[channel_id] = sequence_number
+            self._bitmap[channel_id] = bitmap | 1
+            return True
+        
+        bit = 1 << (highest - sequence_number)
+        bitmap = self._bitmap[channel_id]
+        if bitmap & bit:
+            return False
+        
+        self._bitmap[channel_id] = bitmap | bit
+        return True
+    
+    def reset(self):
+        """Esquece todos os canais (nova conexão)."""
+        self._highest.clear()
+        self._bitmap.clear()
+
+
 class PhotonDecoder:
     """Decodificador de pacotes Photon."""
     
     def __init__(self):
-        self.pending_fragments: Dict[int, FragmentedPacket] = {}
+        self.stats = DecoderStats()
+        self.fragments = FragmentReassembler(self.stats)
+        self.reliable_window = ReliableWindow()
+        
+        # Projeção: event ID -> ids de parâmetros a decodificar (None = tudo).
+        # Quando definida, também ativa o pré-filtro: eventos cujo ID não
+        # está nas projeções são descartados antes de qualquer decodificação.
+        self.event_projections: Optional[Dict[int, FrozenSet[int]]] = None
         
         # Callbacks para eventos
         self._on_event: Optional[Callable[[Dict], None]] = None
@@ -68,8 +286,17 @@ class PhotonDecoder:
         """Registra callback para responses."""
         self._on_response = callback
     
-    def handle_packet(self, data: bytes) -> None:
-        """Processa um pacote Photon completo."""
+    def set_event_projections(self, projections: Optional[Dict[int, FrozenSet[int]]]):
+        """Define os parâmetros decodificados por event ID (None desativa projeção e pré-filtro)."""
+        self.event_projections = projections
+    
+    def handle_packet(self, data: BufferLike) -> None:
+        """
+        Processa um pacote Photon completo.
+        
+        O datagrama é envolvido em um único memoryview; payloads de comandos
+        são views do mesmo buffer, sem cópias até o Protocol16.
+        """
         if len(data) < PHOTON_HEADER_LENGTH:
             return
         
@@ -114,24 +341,37 @@ class PhotonDecoder:
             if payload_length < 0:
                 continue
             
+            # Retransmissões de comandos reliable são descartadas antes de decodificar
+            if (command_type == CommandType.SEND_RELIABLE or command_type == CommandType.SEND_RELIABLE_FRAGMENT) \
+                    and not self.reliable_window.accept(channel_id, sequence_number):
+                self.stats.reliable_duplicates += 1
+                reader.skip(payload_length)
+                continue
+            
             # Processa baseado no tipo de comando
             if command_type == CommandType.DISCONNECT:
+                self.reliable_window.reset()
                 return
             
+            elif command_type == CommandType.CONNECT or command_type == CommandType.VERIFY_CONNECT:
+                # Nova conexão: a sequência reliable recomeça
+                self.reliable_window.reset()
+                reader.skip(payload_length)
+            
             elif command_type == CommandType.SEND_UNRELIABLE:
                 # SEND_UNRELIABLE tem 4 bytes extras no header
                 reader.skip(4)
                 payload_length -= 4
                 if payload_length > 0:
-                    payload = reader.read_bytes(payload_length)
+                    payload = reader.read_view(payload_length)
                     self._handle_reliable(payload)
             
             elif command_type == CommandType.SEND_RELIABLE:
-                payload = reader.read_bytes(payload_length)
+                payload = reader.read_view(payload_length)
                 self._handle_reliable(payload)
             
             elif command_type == CommandType.SEND_RELIABLE_FRAGMENT:
-                payload = reader.read_bytes(payload_length)
+                payload = reader.read_view(payload_length)
                 self._handle_fragment(payload, payload_length, sequence_number)
             
             else:
@@ -139,7 +379,7 @@ class PhotonDecoder:
                 if payload_length > 0:
                     reader.skip(payload_length)
     
-    def _handle_fragment(self, data: bytes, fragment_length: int, seq_number: int) -> None:
+    def _handle_fragment(self, data: memoryview, fragment_length: int, seq_number: int) -> None:
         """Processa um fragmento de pacote."""
         reader = BufferReader(data)
         
@@ -151,28 +391,18 @@ class PhotonDecoder:
         
         # Ajusta tamanho do fragmento
         fragment_data_length = fragment_length - PHOTON_FRAGMENT_HEADER_LENGTH
+        fragment_data = reader.read_view(fragment_data_length)
         
-        # Cria entrada se não existe
-        if sequence_number not in self.pending_fragments:
-            self.pending_fragments[sequence_number] = FragmentedPacket(
-                bytes_written=0,
-                total_length=total_length,
-                payload=bytearray(total_length)
-            )
-        
-        fragment_packet = self.pending_fragments[sequence_number]
-        
-        # Copia fragmento para a posição correta
-        fragment_data = reader.read_bytes(fragment_data_length)
-        fragment_packet.payload[fragment_offset:fragment_offset + fragment_data_length] = fragment_data
-        fragment_packet.bytes_written += fragment_data_length
+        payload = self.fragments.add(
+            sequence_number, fragment_count, fragment_number,
+            total_length, fragment_offset, fragment_data
+        )
         
-        # Verifica se pacote está completo
-        if fragment_packet.bytes_written >= fragment_packet.total_length:
-            del self.pending_fragments[sequence_number]
-            self._handle_reliable(bytes(fragment_packet.payload))
+        # Pacote completo
+        if payload is not None:
+            self._handle_reliable(memoryview(payload))
     
-    def _handle_reliable(self, data: bytes) -> None:
+    def _handle_reliable(self, data: BufferLike) -> None:
         """Processa dados confiáveis (reliable)."""
         if len(data) < 2:
             return
@@ -195,29 +425,55 @@ class PhotonDecoder:
         try:
             if message_type == MessageType.OPERATION_REQUEST:
                 request_data = Protocol16.decode_operation_request(reader)
+                self.stats.messages_decoded += 1
                 if self._on_request:
                     self._on_request(request_data)
             
             elif message_type == MessageType.OPERATION_RESPONSE:
                 response_data = Protocol16.decode_operation_response(reader)
+                self.stats.messages_decoded += 1
                 if self._on_response:
                     self._on_response(response_data)
             
             elif message_type == MessageType.EVENT_DATA:
-                event_data = Protocol16.decode_event_data(reader)
+                if self.event_projections is not None and not self._accept_event(reader):
+                    self.stats.messages_prefiltered += 1
+                    return
+                
+                event_data = Protocol16.decode_event_data(reader, EVENT_ID_PARAM, self.event_projections)
+                self.stats.messages_decoded += 1
                 if self._on_event:
                     self._on_event(event_data)
             
             elif message_type == MessageType.INTERNAL_OPERATION_REQUEST:
                 request_data = Protocol16.decode_operation_request(reader)
+                self.stats.messages_decoded += 1
                 if self._on_request:
                     self._on_request(request_data)
             
             elif message_type == MessageType.INTERNAL_OPERATION_RESPONSE:
                 response_data = Protocol16.decode_operation_response(reader)
+                self.stats.messages_decoded += 1
                 if self._on_response:
                     self._on_response(response_data)
         
         except Exception as e:
-            # Silenciosamente ignora erros de parsing (como o original)
-            pass
+            # Ignora erros de parsing (como o original), mas conta
+            self.stats.decode_errors += 1
+    
+    def _accept_event(self, reader: BufferReader) -> bool:
+        """
+        Pré-filtro em nível de bytes para Event Data.
+        
+        Olha o event code e localiza o parâmetro 252 pulando a tabela, sem
+        alocar dicts/listas. Não altera a posição do reader.
+        """
+        start = reader.position
+        
+        if reader.read_uint8() != ALBION_EVENT_CODE:
+            return False
+        
+        event_id = Protocol16.peek_parameter(reader, EVENT_ID_PARAM)
+        reader.position = start
+        
+        return isinstance(event_id, int) and event_id in self.event_projections
@@ -3,8 +3,12 @@ Protocol16 - Deserializador do protocolo de serialização Photon
 Baseado no protocol16.js do projeto original
 """
 
+import struct
+import sys
+from array import array
 from enum import IntEnum
-from typing import Any, Dict, Optional, List, Union
+from functools import partial
+from typing import Any, Callable, Dict, FrozenSet, Optional, List, Tuple, Union
 from .buffer_reader import BufferReader
 
 
@@ -65,10 +69,20 @@ class Protocol16:
         }
     
     @staticmethod
-    def decode_event_data(reader: BufferReader) -> Dict[str, Any]:
-        """Decodifica um Event Data."""
+    def decode_event_data(reader: BufferReader, key_param: Optional[int] = None,
+                          projections: Optional[Dict[int, FrozenSet[int]]] = None) -> Dict[str, Any]:
+        """
+        Decodifica um Event Data.
+        
+        Se `projections` for informado, decodifica apenas os parâmetros
+        declarados para o valor de `key_param` (ver decode_parameter_table_projected).
+        """
         event_code = reader.read_uint8()
-        parameters = Protocol16.decode_parameter_table(reader)
+        
+        if projections is None or key_param is None:
+            parameters = Protocol16.decode_parameter_table(reader)
+        else:
+            parameters = Protocol16.decode_parameter_table_projected(reader, key_param, projections)
         
         return {
             'event_code': event_code,
@@ -79,120 +93,429 @@ class Protocol16:
     def decode_parameter_table(reader: BufferReader) -> Dict[int, Any]:
         """Decodifica uma tabela de parâmetros."""
         parameters = {}
+        decoders = _DECODERS
         
         parameters_count = reader.read_int16_be()
         
         for _ in range(parameters_count):
             param_id = reader.read_uint8()
             param_type = reader.read_uint8()
-            parameters[param_id] = Protocol16.read_param(param_type, reader)
+            parameters[param_id] = decoders[param_type](reader)
         
         return parameters
     
     @staticmethod
-    def read_param(param_type: int, reader: BufferReader) -> Any:
-        """Lê um parâmetro baseado no seu tipo."""
-        
-        # Nil / Unknown
-        if param_type == 0 or param_type == DataType.NIL:
-            return None
-        
-        # Int8
-        if param_type == DataType.INT8:
-            return reader.read_uint8()
-        
-        # Float32
-        if param_type == DataType.FLOAT32:
-            return reader.read_float_be()
-        
-        # Double
-        if param_type == DataType.DOUBLE:
-            return reader.read_double_be()
-        
-        # Int32
-        if param_type == DataType.INT32:
-            return reader.read_int32_be()
-        
-        # Int16 (também aceita type 7 por compatibilidade)
-        if param_type == 7 or param_type == DataType.INT16:
-            return reader.read_uint16_be()
-        
-        # Int64
-        if param_type == DataType.INT64:
-            return reader.read_int64_be()
-        
-        # String
-        if param_type == DataType.STRING:
-            length = reader.read_uint16_be()
-            return reader.read_string(length)
-        
-        # Boolean
-        if param_type == DataType.BOOLEAN:
-            value = reader.read_uint8()
-            if value == 0:
-                return False
-            elif value == 1:
-                return True
-            else:
-                raise ValueError(f"Invalid boolean value: {value}")
-        
-        # Int8 Slice (byte array)
-        if param_type == DataType.INT8_SLICE:
-            size = reader.read_uint32_be()
-            return list(reader.read_bytes(size))
-        
-        # Slice (array tipado)
-        if param_type == DataType.SLICE:
-            length = reader.read_uint16_be()
-            slice_type = reader.read_uint8()
-            return [Protocol16.read_param(slice_type, reader) for _ in range(length)]
-        
-        # Object Slice (array de objetos mistos)
-        if param_type == DataType.OBJECT_SLICE:
-            length = reader.read_uint16_be()
-            result = []
-            for _ in range(length):
-                item_type = reader.read_uint8()
-                result.append(Protocol16.read_param(item_type, reader))
-            return result
-        
-        # Dictionary
-        if param_type == DataType.DICTIONARY:
-            key_type = reader.read_uint8()
-            value_type = reader.read_uint8()
-            length = reader.read_uint16_be()
-            
-            result = {}
-            for _ in range(length):
-                key = Protocol16.read_param(key_type, reader)
-                value = Protocol16.read_param(value_type, reader)
-                result[key] = value
-            
-            return result
+    def scan_parameter_table(reader: BufferReader) -> List[Tuple[int, int, int]]:
+        """
+        Percorre uma tabela de parâmetros sem materializar valores.
+        
+        Retorna (param_id, param_type, posição do valor) para cada parâmetro
+        e deixa o reader posicionado no fim da tabela.
+        """
+        parameters_count = reader.read_int16_be()
+        
+        buffer = reader.buffer
+        position = reader.position
+        sizes = _FIXED_SIZE_TABLE
+        skippers = _SKIPPERS
+        
+        entries = []
+        for _ in range(parameters_count):
+            param_id = buffer[position]
+            param_type = buffer[position + 1]
+            position += 2
+            entries.append((param_id, param_type, position))
+            size = sizes[param_type]
+            position = position + size if size >= 0 else skippers[param_type](buffer, position)
+        
+        if position > reader.length:
+            raise BufferError(f"Out of bounds skip: position={position}, length={reader.length}")
+        
+        reader.position = position
+        return entries
+    
+    @staticmethod
+    def peek_parameter(reader: BufferReader, param_id: int) -> Any:
+        """
+        Busca o valor de um parâmetro pulando os demais da tabela.
         
-        # Hashtable (similar ao dictionary mas com tipos por item)
-        if param_type == DataType.HASHTABLE:
-            length = reader.read_uint16_be()
+        Não altera a posição do reader. Retorna None se o parâmetro não existir.
+        """
+        buffer = reader.buffer
+        position = reader.position
+        sizes = _FIXED_SIZE_TABLE
+        skippers = _SKIPPERS
+        
+        parameters_count = _INT16.unpack_from(buffer, position)[0]
+        position += 2
+        
+        for _ in range(parameters_count):
+            current_id = buffer[position]
+            param_type = buffer[position + 1]
+            position += 2
             
-            result = {}
-            for _ in range(length):
-                key_type = reader.read_uint8()
-                key = Protocol16.read_param(key_type, reader)
-                value_type = reader.read_uint8()
-                value = Protocol16.read_param(value_type, reader)
-                result[key] = value
+            if current_id == param_id:
+                start = reader.position
+                reader.position = position
+                try:
+                    return _DECODERS[param_type](reader)
+                finally:
+                    reader.position = start
             
-            return result
+            size = sizes[param_type]
+            position = position + size if size >= 0 else skippers[param_type](buffer, position)
+        
+        return None
+    
+    @staticmethod
+    def decode_parameter_table_projected(reader: BufferReader, key_param: int,
+                                         projections: Dict[int, FrozenSet[int]]) -> Dict[int, Any]:
+        """
+        Decodifica só os parâmetros necessários de uma tabela.
+        
+        A tabela é varrida pelos skippers; o valor de `key_param` escolhe o
+        conjunto de ids em `projections` e só esses são decodificados. Sem
+        `key_param` na tabela, tudo é decodificado; com uma chave sem
+        projeção, apenas a própria chave.
+        """
+        entries = Protocol16.scan_parameter_table(reader)
+        end = reader.position
+        decoders = _DECODERS
         
-        # Int32 Slice
-        if param_type == DataType.INT32_SLICE:
-            size = reader.read_uint32_be()
-            return [reader.read_int32_be() for _ in range(size)]
+        wanted: Optional[FrozenSet[int]] = None
+        parameters = {}
+        for param_id, param_type, position in entries:
+            if param_id == key_param:
+                reader.position = position
+                key = decoders[param_type](reader)
+                parameters[param_id] = key
+                if isinstance(key, int):
+                    wanted = projections.get(key, _EMPTY_PROJECTION)
         
-        # String Slice
-        if param_type == DataType.STRING_SLICE:
-            length = reader.read_uint16_be()
-            return [Protocol16.read_param(DataType.STRING, reader) for _ in range(length)]
+        for param_id, param_type, position in entries:
+            if param_id == key_param:
+                continue
+            if wanted is None or param_id in wanted:
+                reader.position = position
+                parameters[param_id] = decoders[param_type](reader)
         
-        # Tipo desconhecido
-        raise ValueError(f"Unknown param type: 0x{param_type:02X} at position {reader.position - 1}")
+        reader.position = end
+        return parameters
+    
+    @staticmethod
+    def read_param(param_type: int, reader: BufferReader) -> Any:
+        """Lê um parâmetro baseado no seu tipo (via tabela de despacho)."""
+        return _DECODERS[param_type](reader)
+    
+    @staticmethod
+    def skip_param(param_type: int, reader: BufferReader) -> None:
+        """Pula um parâmetro baseado no seu tipo, sem criar objetos."""
+        position = _skip_value(param_type, reader.buffer, reader.position)
+        if position > reader.length:
+            raise BufferError(f"Out of bounds skip: position={position}, length={reader.length}")
+        reader.position = position
+
+
+# ============================================
+# DECODIFICADORES POR TIPO
+# ============================================
+# Cada DataType tem um leitor especializado. A tabela _DECODERS (256 entradas,
+# indexada pelo byte de tipo) é montada uma única vez no import, então o custo
+# por valor é um índice + uma chamada, em vez da cadeia de comparações IntEnum.
+
+def _read_nil(reader: BufferReader) -> None:
+    return None
+
+
+def _read_int8(reader: BufferReader) -> int:
+    return reader.read_uint8()
+
+
+def _read_float32(reader: BufferReader) -> float:
+    return reader.read_float_be()
+
+
+def _read_double(reader: BufferReader) -> float:
+    return reader.read_double_be()
+
+
+def _read_int32(reader: BufferReader) -> int:
+    return reader.read_int32_be()
+
+
+def _read_int16(reader: BufferReader) -> int:
+    return reader.read_uint16_be()
+
+
+def _read_int64(reader: BufferReader) -> int:
+    return reader.read_int64_be()
+
+
+def _read_string(reader: BufferReader) -> str:
+    length = reader.read_uint16_be()
+    return reader.read_string(length)
+
+
+def _read_boolean(reader: BufferReader) -> bool:
+    value = reader.read_uint8()
+    if value == 0:
+        return False
+    if value == 1:
+        return True
+    raise ValueError(f"Invalid boolean value: {value}")
+
+
+def _read_int8_slice(reader: BufferReader) -> bytes:
+    # bytes (e não lista de ints): UUIDs de container são usados direto como chave
+    size = reader.read_uint32_be()
+    return reader.read_bytes(size)
+
+
+def _read_numeric_array(reader: BufferReader, typecode: str, count: int) -> array:
+    """Lê `count` números Big Endian de uma vez em um array.array compacto."""
+    values = array(typecode)
+    values.frombytes(reader.read_view(count * values.itemsize))
+    if _NEEDS_BYTESWAP:
+        values.byteswap()
+    return values
+
+
+def _read_slice(reader: BufferReader) -> Union[List[Any], array]:
+    length = reader.read_uint16_be()
+    slice_type = reader.read_uint8()
+    
+    # Slices numéricos: um único frombytes em vez de uma chamada por elemento
+    typecode = _ARRAY_TYPECODES.get(slice_type)
+    if typecode is not None:
+        return _read_numeric_array(reader, typecode, length)
+    
+    decode = _DECODERS[slice_type]
+    return [decode(reader) for _ in range(length)]
+
+
+def _read_object_slice(reader: BufferReader) -> List[Any]:
+    length = reader.read_uint16_be()
+    decoders = _DECODERS
+    result = []
+    for _ in range(length):
+        item_type = reader.read_uint8()
+        result.append(decoders[item_type](reader))
+    return result
+
+
+def _read_dictionary(reader: BufferReader) -> Dict[Any, Any]:
+    key_type = reader.read_uint8()
+    value_type = reader.read_uint8()
+    length = reader.read_uint16_be()
+    
+    decode_key = _DECODERS[key_type]
+    decode_value = _DECODERS[value_type]
+    
+    result = {}
+    for _ in range(length):
+        key = decode_key(reader)
+        result[key] = decode_value(reader)
+    return result
+
+
+def _read_hashtable(reader: BufferReader) -> Dict[Any, Any]:
+    length = reader.read_uint16_be()
+    decoders = _DECODERS
+    
+    result = {}
+    for _ in range(length):
+        key = decoders[reader.read_uint8()](reader)
+        result[key] = decoders[reader.read_uint8()](reader)
+    return result
+
+
+def _read_int32_slice(reader: BufferReader) -> array:
+    size = reader.read_uint32_be()
+    return _read_numeric_array(reader, 'i', size)
+
+
+def _read_string_slice(reader: BufferReader) -> List[str]:
+    length = reader.read_uint16_be()
+    return [_read_string(reader) for _ in range(length)]
+
+
+def _read_unknown(param_type: int, reader: BufferReader) -> Any:
+    raise ValueError(f"Unknown param type: 0x{param_type:02X} at position {reader.position - 1}")
+
+
+# Protocol16 é Big Endian; array.array usa a ordem nativa
+_NEEDS_BYTESWAP = sys.byteorder == 'little'
+
+# Tipos de elemento de SLICE decodificados em bloco (byte de tipo -> typecode).
+# Int8/Int16 são lidos como unsigned, igual aos leitores escalares.
+_ARRAY_TYPECODES: Dict[int, str] = {
+    DataType.INT8: 'B',
+    7: 'H',
+    DataType.INT16: 'H',
+    DataType.INT32: 'i',
+    DataType.INT64: 'q',
+    DataType.FLOAT32: 'f',
+    DataType.DOUBLE: 'd',
+}
+
+
+def _build_decoders() -> List[Callable[[BufferReader], Any]]:
+    """Monta a tabela de despacho byte de tipo -> leitor."""
+    table: List[Callable[[BufferReader], Any]] = [
+        partial(_read_unknown, param_type) for param_type in range(256)
+    ]
+    
+    table[0] = _read_nil
+    table[DataType.NIL] = _read_nil
+    table[DataType.INT8] = _read_int8
+    table[DataType.FLOAT32] = _read_float32
+    table[DataType.DOUBLE] = _read_double
+    table[DataType.INT32] = _read_int32
+    table[7] = _read_int16  # Int16 também aceita type 7 por compatibilidade
+    table[DataType.INT16] = _read_int16
+    table[DataType.INT64] = _read_int64
+    table[DataType.STRING] = _read_string
+    table[DataType.BOOLEAN] = _read_boolean
+    table[DataType.INT8_SLICE] = _read_int8_slice
+    table[DataType.SLICE] = _read_slice
+    table[DataType.OBJECT_SLICE] = _read_object_slice
+    table[DataType.DICTIONARY] = _read_dictionary
+    table[DataType.HASHTABLE] = _read_hashtable
+    table[DataType.INT32_SLICE] = _read_int32_slice
+    table[DataType.STRING_SLICE] = _read_string_slice
+    
+    return table
+
+
+_DECODERS = _build_decoders()
+
+
+# ============================================
+# SKIPPERS POR TIPO
+# ============================================
+# Versões "só comprimento" dos leitores: recebem (buffer, posição) e
+# retornam a posição após o valor, sem construir objetos Python nem passar
+# pelos métodos do BufferReader. Usados na decodificação por projeção.
+
+_EMPTY_PROJECTION: FrozenSet[int] = frozenset()
+
+_INT16 = struct.Struct('>h')
+_UINT16 = struct.Struct('>H')
+_UINT32 = struct.Struct('>I')
+_SLICE_HEADER = struct.Struct('>HB')
+_DICTIONARY_HEADER = struct.Struct('>BBH')
+
+# Tamanho em bytes dos tipos de largura fixa
+_FIXED_SIZES: Dict[int, int] = {
+    0: 0,
+    DataType.NIL: 0,
+    DataType.INT8: 1,
+    DataType.BOOLEAN: 1,
+    7: 2,
+    DataType.INT16: 2,
+    DataType.INT32: 4,
+    DataType.FLOAT32: 4,
+    DataType.INT64: 8,
+    DataType.DOUBLE: 8,
+}
+
+# Mesma informação indexada por byte de tipo (-1 = tamanho variável)
+_FIXED_SIZE_TABLE: List[int] = [_FIXED_SIZES.get(param_type, -1) for param_type in range(256)]
+
+
+def _skip_value(param_type: int, buffer: memoryview, position: int) -> int:
+    size = _FIXED_SIZE_TABLE[param_type]
+    if size >= 0:
+        return position + size
+    return _SKIPPERS[param_type](buffer, position)
+
+
+def _skip_string(buffer: memoryview, position: int) -> int:
+    return position + 2 + _UINT16.unpack_from(buffer, position)[0]
+
+
+def _skip_int8_slice(buffer: memoryview, position: int) -> int:
+    return position + 4 + _UINT32.unpack_from(buffer, position)[0]
+
+
+def _skip_int32_slice(buffer: memoryview, position: int) -> int:
+    return position + 4 + _UINT32.unpack_from(buffer, position)[0] * 4
+
+
+def _skip_string_slice(buffer: memoryview, position: int) -> int:
+    length = _UINT16.unpack_from(buffer, position)[0]
+    position += 2
+    for _ in range(length):
+        position += 2 + _UINT16.unpack_from(buffer, position)[0]
+    return position
+
+
+def _skip_slice(buffer: memoryview, position: int) -> int:
+    length, slice_type = _SLICE_HEADER.unpack_from(buffer, position)
+    position += 3
+    
+    size = _FIXED_SIZE_TABLE[slice_type]
+    if size >= 0:
+        return position + length * size
+    
+    skip = _SKIPPERS[slice_type]
+    for _ in range(length):
+        position = skip(buffer, position)
+    return position
+
+
+def _skip_object_slice(buffer: memoryview, position: int) -> int:
+    length = _UINT16.unpack_from(buffer, position)[0]
+    position += 2
+    for _ in range(length):
+        position = _skip_value(buffer[position], buffer, position + 1)
+    return position
+
+
+def _skip_dictionary(buffer: memoryview, position: int) -> int:
+    key_type, value_type, length = _DICTIONARY_HEADER.unpack_from(buffer, position)
+    position += 4
+    
+    key_size = _FIXED_SIZE_TABLE[key_type]
+    value_size = _FIXED_SIZE_TABLE[value_type]
+    if key_size >= 0 and value_size >= 0:
+        return position + length * (key_size + value_size)
+    
+    for _ in range(length):
+        position = _skip_value(key_type, buffer, position)
+        position = _skip_value(value_type, buffer, position)
+    return position
+
+
+def _skip_hashtable(buffer: memoryview, position: int) -> int:
+    length = _UINT16.unpack_from(buffer, position)[0]
+    position += 2
+    for _ in range(length):
+        position = _skip_value(buffer[position], buffer, position + 1)
+        position = _skip_value(buffer[position], buffer, position + 1)
+    return position
+
+
+def _skip_unknown(param_type: int, buffer: memoryview, position: int) -> int:
+    raise ValueError(f"Unknown param type: 0x{param_type:02X} at position {position - 1}")
+
+
+def _build_skippers() -> List[Callable[[memoryview, int], int]]:
+    """Monta a tabela de despacho byte de tipo -> skipper (tipos de tamanho variável)."""
+    table: List[Callable[[memoryview, int], int]] = [
+        partial(_skip_unknown, param_type) for param_type in range(256)
+    ]
+    
+    table[DataType.STRING] = _skip_string
+    table[DataType.INT8_SLICE] = _skip_int8_slice
+    table[DataType.SLICE] = _skip_slice
+    table[DataType.OBJECT_SLICE] = _skip_object_slice
+    table[DataType.DICTIONARY] = _skip_dictionary
+    table[DataType.HASHTABLE] = _skip_hashtable
+    table[DataType.INT32_SLICE] = _skip_int32_slice
+    table[DataType.STRING_SLICE] = _skip_string_slice
+    
+    return table
+
+
+_SKIPPERS = _build_skippers()
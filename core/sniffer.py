@@ -5,10 +5,15 @@ Baseado no albion-network.js do projeto original
 
 import threading
 import time
-from typing import Callable, Optional
-from scapy.all import sniff, UDP, IP, conf
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, FrozenSet, Optional, Union
 
-from .photon_decoder import PhotonDecoder
+from .photon_decoder import PhotonDecoder, DecoderStats
+from .flow_table import FlowTable, FlowKey, with_connection
+from .capture import CaptureBackend, CaptureSettings, CaptureStats, PcapReplayBackend, open_backend
+from .capture.recorder import PacketRecorder
+from .packet_queue import PacketQueue, QueueStats, PACKET_QUEUE_SIZE, BACKPRESSURE_DROP_OLDEST
+from .decode_pool import DecodePool, WorkerConfig
 
 
 # Portas do Albion Online
@@ -17,34 +22,177 @@ ALBION_PORTS = [5056, 5055, 4535]
 # Tempo máximo sem pacotes para considerar offline (segundos)
 MAX_SECONDS_BETWEEN_PACKETS = 5
 
+# Datagramas retirados da fila por vez pelo worker de decode
+DECODE_BATCH_SIZE = 256
+
+
+@dataclass
+class ReplayStats:
+    """Resultado de um replay offline (ver AlbionSniffer.replay)."""
+    frames: int = 0
+    packets: int = 0
+    duration: float = 0.0
+    packet_errors: int = 0
+    decode_errors: int = 0
+    
+    @property
+    def packets_per_second(self) -> float:
+        return self.packets / self.duration if self.duration > 0 else 0.0
+
 
 class AlbionSniffer:
     """Sniffer de pacotes UDP do Albion Online."""
     
-    def __init__(self):
-        self.decoder = PhotonDecoder()
+    def __init__(self, backend: str = "auto", capture_settings: Optional[CaptureSettings] = None,
+                 recorder: Optional[PacketRecorder] = None,
+                 queue_size: int = PACKET_QUEUE_SIZE, backpressure: str = BACKPRESSURE_DROP_OLDEST,
+                 decode_workers: int = 0):
+        # Backend de captura: "auto", "tpacket_v3", "af_packet" ou "scapy" (ver core.capture)
+        self.backend_name = backend
+        self.capture_settings = capture_settings
+        self.backend: Optional[CaptureBackend] = None
+        
+        # Gravação opcional dos payloads capturados em pcaps rotativos
+        self.recorder = recorder
+        
+        # Fila entre a thread de captura e o worker de decode
+        self.queue = PacketQueue(queue_size, backpressure)
+        
+        # Decode em processos separados (0 = no worker de decode deste processo)
+        self.decode_workers = decode_workers
+        self.pool: Optional[DecodePool] = None
+        
+        # Datagramas cujo processamento lançou exceção (header Photon inválido etc.)
+        self._packet_errors = 0
+        
+        # Contadores de pools já encerrados (workers de capturas anteriores)
+        self._pool_stats = DecoderStats()
+        self._pool_packet_errors = 0
+        
+        # Um PhotonDecoder por fluxo UDP (ver FlowTable)
+        self.flows = FlowTable(self._create_decoder)
         self.running = False
         self.is_online = False
         self.last_packet_time: Optional[float] = None
         
         self._sniff_thread: Optional[threading.Thread] = None
+        self._decode_thread: Optional[threading.Thread] = None
         self._monitor_thread: Optional[threading.Thread] = None
         
         # Callbacks
+        self._on_event: Optional[Callable[[dict], None]] = None
+        self._on_request: Optional[Callable[[dict], None]] = None
+        self._on_response: Optional[Callable[[dict], None]] = None
         self._on_online: Optional[Callable[[], None]] = None
         self._on_offline: Optional[Callable[[], None]] = None
+        self._on_loot: Optional[Callable[[object], None]] = None
+        self._on_loot_update: Optional[Callable[[object, object], None]] = None
+        self._forwarding_items = False
+        
+        self._event_projections: Optional[Dict[int, FrozenSet[int]]] = None
+        
+        # Copiar cada payload antes de enfileirar (backend sem zero_copy)
+        self._copy_payloads = True
+    
+    def _create_decoder(self, flow_key: FlowKey) -> PhotonDecoder:
+        """
+        Cria o decoder de um novo fluxo com os callbacks/projeções atuais.
+        
+        Cada mensagem leva a conexão do fluxo em message['connection'].
+        """
+        decoder = PhotonDecoder()
+        decoder.on_event(with_connection(self._dispatch_event, flow_key))
+        decoder.on_request(with_connection(self._dispatch_request, flow_key))
+        decoder.on_response(with_connection(self._dispatch_response, flow_key))
+        decoder.set_event_projections(self._event_projections)
+        return decoder
+    
+    def _dispatch_event(self, event: dict):
+        if self._on_event:
+            self._on_event(event)
+    
+    def _dispatch_request(self, request: dict):
+        if self._on_request:
+            self._on_request(request)
+    
+    def _dispatch_response(self, response: dict):
+        if self._on_response:
+            self._on_response(response)
     
     def on_event(self, callback: Callable[[dict], None]):
         """Registra callback para eventos Photon."""
-        self.decoder.on_event(callback)
+        self._on_event = callback
     
     def on_request(self, callback: Callable[[dict], None]):
         """Registra callback para requests Photon."""
-        self.decoder.on_request(callback)
+        self._on_request = callback
     
     def on_response(self, callback: Callable[[dict], None]):
         """Registra callback para responses Photon."""
-        self.decoder.on_response(callback)
+        self._on_response = callback
+    
+    def on_loot(self, callback: Callable[[object], None]):
+        """
+        Registra callback para LootEvents vindos dos workers (decode_workers > 0).
+        
+        No modo multiprocesso os handlers rodam nos workers, então o
+        data_handler deste processo não emite loot.
+        """
+        self._on_loot = callback
+    
+    def on_loot_update(self, callback: Callable[[object, object], None]):
+        """Registra callback (evento antigo, evento corrigido) vindo dos workers (ver pending_items)."""
+        self._on_loot_update = callback
+    
+    def _dispatch_loot(self, event):
+        if self._on_loot:
+            self._on_loot(event)
+    
+    def _dispatch_loot_update(self, old_event, new_event):
+        if self._on_loot_update:
+            self._on_loot_update(old_event, new_event)
+    
+    def _forward_items(self):
+        """Catálogo pronto (ou falho) depois do start: os workers também precisam dele."""
+        from services import items_service
+        pool = self.pool
+        if pool is not None:
+            pool.set_items(items_service.items if items_service.loaded else None)
+    
+    def set_event_projections(self, projections: Optional[Dict[int, FrozenSet[int]]]):
+        """Define os parâmetros decodificados por event ID (ver DataHandler.event_projections)."""
+        self._event_projections = projections
+        for decoder in self.flows.decoders():
+            decoder.set_event_projections(projections)
+    
+    @property
+    def stats(self) -> DecoderStats:
+        """Contadores somados de todos os fluxos (mensagens decodificadas / pré-filtradas)."""
+        total = self.flows.stats()
+        total.add(self._pool_stats)
+        if self.pool is not None:
+            total.add(self.pool.stats())
+        return total
+    
+    @property
+    def packet_errors(self) -> int:
+        """Datagramas descartados por exceção no decode (incluindo os dos workers)."""
+        total = self._packet_errors + self._pool_packet_errors
+        if self.pool is not None:
+            total += self.pool.packet_errors
+        return total
+    
+    @property
+    def capture_stats(self) -> CaptureStats:
+        """Pacotes vistos e descartados pelo kernel (PACKET_STATISTICS)."""
+        if self.backend is None:
+            return CaptureStats()
+        return self.backend.stats()
+    
+    @property
+    def queue_stats(self) -> QueueStats:
+        """Profundidade, high-water mark e descartes da fila captura -> decode."""
+        return self.queue.stats()
     
     def on_online(self, callback: Callable[[], None]):
         """Registra callback para quando Albion é detectado."""
@@ -63,6 +211,33 @@ class AlbionSniffer:
         self.is_online = False
         self.last_packet_time = None
         
+        if self.recorder:
+            self.recorder.start()
+        
+        self.queue.reopen()
+        
+        if self.decode_workers > 0:
+            from services import items_service
+            
+            # Registrado antes de capturar a configuração: nenhum carregamento fica sem repasse
+            if not self._forwarding_items:
+                items_service.on_loaded(self._forward_items)
+                items_service.on_load_failed(self._forward_items)
+                self._forwarding_items = True
+            
+            config = WorkerConfig.from_services(self._event_projections)
+            pool = DecodePool(self.decode_workers, self._dispatch_loot, config, self._dispatch_loot_update)
+            pool.start()
+            self.pool = pool
+            
+            # Catálogo pronto (ou falho) entre a configuração e o pool existir
+            if (items_service.loaded and not len(config.items)) or items_service.load_failed:
+                self._forward_items()
+        
+        # Worker de decode
+        self._decode_thread = threading.Thread(target=self._decode_loop, daemon=True)
+        self._decode_thread.start()
+        
         # Thread de captura
         self._sniff_thread = threading.Thread(target=self._sniff_loop, daemon=True)
         self._sniff_thread.start()
@@ -78,57 +253,161 @@ class AlbionSniffer:
         if self._sniff_thread:
             self._sniff_thread.join(timeout=2)
         
+        # O worker termina de decodificar o que já estava na fila
+        self.queue.close()
+        if self._decode_thread:
+            self._decode_thread.join(timeout=2)
+        
+        if self.pool is not None:
+            self.pool.stop()
+            
+            # Guarda os contadores finais dos workers antes de descartar o pool
+            self._pool_stats.add(self.pool.stats())
+            self._pool_packet_errors += self.pool.packet_errors
+            self.pool = None
+        
         if self._monitor_thread:
             self._monitor_thread.join(timeout=2)
+        
+        if self.recorder:
+            self.recorder.stop()
     
     def _sniff_loop(self):
         """Loop de captura de pacotes."""
-        # Filtro BPF para UDP nas portas do Albion
-        port_filter = " or ".join([f"port {p}" for p in ALBION_PORTS])
-        bpf_filter = f"udp and ({port_filter})"
+        try:
+            backend = open_backend(self.backend_name, ALBION_PORTS, self.capture_settings)
+        except Exception as e:
+            print(f"[ERRO] Falha na captura: {e}")
+            print("[DICA] Execute como administrador/root")
+            return
+        
+        print(f"[INFO] Captura via {backend.name}")
+        self.backend = backend
+        
+        # Backend que segura o buffer até o decode terminar: a fila recebe as views
+        self._copy_payloads = not backend.zero_copy
+        if backend.zero_copy:
+            backend.hold_payloads(self.queue.progress)
         
         try:
-            # Desabilita verbose do scapy
-            conf.verb = 0
-            
-            sniff(
-                filter=bpf_filter,
-                prn=self._handle_packet,
-                store=False,
-                stop_filter=lambda x: not self.running
-            )
+            backend.run(self._enqueue_payload, lambda: not self.running)
         except Exception as e:
             print(f"[ERRO] Falha na captura: {e}")
             print("[DICA] Execute como administrador/root")
+        finally:
+            backend.close()
+    
+    def _enqueue_payload(self, payload: Union[bytes, memoryview], flow_key: FlowKey):
+        """
+        Callback do backend (thread de captura): só grava e enfileira.
+        
+        O payload pode ser uma view do buffer do backend. Se o backend não
+        segura o buffer até o decode (hold_payloads), é copiado antes de
+        entrar na fila.
+        """
+        now = time.time()
+        self.last_packet_time = now
+        
+        if self.recorder:
+            self.recorder.record(now, flow_key, payload)
+        
+        if self._copy_payloads:
+            payload = bytes(payload)
+        self.queue.put((payload, flow_key, now))
+    
+    def _decode_loop(self):
+        """Worker de decode: drena a fila em lotes (e repassa ao pool, se houver)."""
+        from handlers.pending_items import pending_items
+        
+        queue = self.queue
+        handle_payload = self._handle_payload
+        pool = self.pool
+        
+        while True:
+            # Itens pendentes resolvidos aqui, não na thread que carregou o catálogo
+            # (com pool, cada worker resolve os seus)
+            if pool is None:
+                pending_items.poll()
+            
+            batch = queue.get_batch(DECODE_BATCH_SIZE, timeout=0.5)
+            if not batch:
+                if queue.closed:
+                    break
+                continue
+            
+            if pool is not None:
+                self._mark_online()
+                pool.submit(batch)
+            else:
+                for payload, flow_key, captured_at in batch:
+                    handle_payload(payload, flow_key, captured_at)
+            
+            # Libera o buffer do backend (views do lote não são mais usadas)
+            queue.task_done(len(batch))
+    
+    def _mark_online(self):
+        """Dispara on_online no primeiro pacote."""
+        if not self.is_online:
+            self.is_online = True
+            if self._on_online:
+                self._on_online()
     
-    def _handle_packet(self, packet):
-        """Processa um pacote capturado."""
+    def _handle_payload(self, payload: Union[bytes, memoryview], flow_key: FlowKey,
+                        now: Optional[float] = None):
+        """Decodifica o payload UDP de um fluxo (worker de decode ou replay)."""
+        if now is None:
+            now = time.time()
+            self.last_packet_time = now
+        
+        # Verifica se ficou online
+        self._mark_online()
+        
+        # Processa pacote Photon no decoder do fluxo
         try:
-            if UDP in packet and packet[UDP].payload:
-                # Extrai payload UDP
-                payload = bytes(packet[UDP].payload)
-                
-                # Atualiza tempo do último pacote
-                self.last_packet_time = time.time()
-                
-                # Verifica se ficou online
-                if not self.is_online:
-                    self.is_online = True
-                    if self._on_online:
-                        self._on_online()
-                
-                # Processa pacote Photon
-                self.decoder.handle_packet(payload)
+            self.flows.get(flow_key, now).handle_packet(payload)
+        except Exception:
+            # Ignora pacotes malformados, mas conta
+            self._packet_errors += 1
+    
+    def replay(self, path: str, speed: float = 0.0) -> ReplayStats:
+        """
+        Processa um arquivo pcap/pcapng pelo mesmo pipeline da captura ao vivo.
         
-        except Exception as e:
-            # Ignora erros de pacotes malformados
-            pass
+        Roda na thread chamadora. speed = 0 processa o mais rápido possível;
+        speed > 0 respeita os intervalos originais divididos por speed.
+        """
+        from handlers.pending_items import pending_items
+        
+        settings = replace(self.capture_settings or CaptureSettings(), pcap_path=path, replay_speed=speed)
+        backend = PcapReplayBackend(ALBION_PORTS, settings)
+        backend.open()
+        
+        packet_errors = self.packet_errors
+        decode_errors = self.stats.decode_errors
+        started_at = time.perf_counter()
+        
+        try:
+            # Entre pacotes: itens pendentes resolvidos na própria thread do replay
+            backend.run(self._handle_payload, lambda: pending_items.poll() and False)
+        finally:
+            backend.close()
+        
+        return ReplayStats(
+            frames=backend.frames_read,
+            packets=backend.payloads_delivered,
+            duration=time.perf_counter() - started_at,
+            packet_errors=self.packet_errors - packet_errors,
+            decode_errors=self.stats.decode_errors - decode_errors
+        )
     
     def _monitor_loop(self):
         """Loop de monitoramento de status online/offline."""
         while self.running:
             time.sleep(1)
             
+            # Descarta fluxos inativos (e seus fragmentos pendentes)
+            self.flows.evict_idle()
+            
             if self.last_packet_time is None:
                 continue
             
@@ -174,6 +174,26 @@ class DashboardServer:
         except Exception as e:
             print(f"[DASHBOARD] Erro ao processar loot: {e}")
     
+    def on_loot_update(self, old_event, new_event):
+        """
+        Callback para loots com item pendente corrigidos depois.
+        Troca o loot já emitido pelo corrigido (stats não mudam).
+        """
+        try:
+            old_id = self._serialize_loot_event(old_event)['id']
+            loot_data = self._serialize_loot_event(new_event)
+            
+            for index in range(len(self.loot_events) - 1, -1, -1):
+                if self.loot_events[index]['id'] == old_id:
+                    self.loot_events[index] = loot_data
+                    break
+            
+            if self.is_running:
+                socketio.emit('loot_update', {'old_id': old_id, 'loot': loot_data})
+        
+        except Exception as e:
+            print(f"[DASHBOARD] Erro ao corrigir loot: {e}")
+    
     def _serialize_loot_event(self, event) -> Dict:
         """Serializa um LootEvent para JSON."""
         # Parse tier info
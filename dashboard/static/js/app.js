@@ -387,6 +387,29 @@ function dashboard() {
                 }
             });
             
+            this.socket.on('loot_update', async (data) => {
+                // Item resolved after the list finished loading
+                const loot = { ...data.loot, estimatedPrice: null };
+                let index = this.loots.findIndex(l => l.id === data.old_id);
+                if (index === -1) return;
+                this.loots = [
+                    ...this.loots.slice(0, index),
+                    loot,
+                    ...this.loots.slice(index + 1)
+                ];
+                
+                const price = await this.getItemPrice(loot.item_id);
+                index = this.loots.findIndex(l => l.id === loot.id);
+                if (index !== -1) {
+                    const updatedLoot = { ...this.loots[index], estimatedPrice: price };
+                    this.loots = [
+                        ...this.loots.slice(0, index),
+                        updatedLoot,
+                        ...this.loots.slice(index + 1)
+                    ];
+                }
+            });
+            
             this.socket.on('stats', (stats) => {
                 this.stats = { ...this.stats, ...stats };
             });
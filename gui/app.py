@@ -5,7 +5,6 @@ Feito por Kazz
 """
 
 import customtkinter as ctk
-import threading
 import json
 import sys
 import os
@@ -149,21 +148,13 @@ class LootLoggerApp(ctk.CTk):
             if config_service.discord_enabled and config_service.is_webhook_valid():
                 discord_service.set_webhook(config_service.discord_webhook)
             
-            # Carrega itens em background
-            threading.Thread(target=self._load_items_async, daemon=True).start()
+            # Carrega itens em background (loots anteriores ficam pendentes)
+            items_service.load_async()
             self.tier_service = tier_service
             
         except Exception as e:
             print(f"[ERRO] Falha ao carregar servicos: {e}")
     
-    def _load_items_async(self):
-        """Carrega itens em background."""
-        try:
-            from services import items_service
-            items_service.load()
-        except Exception as e:
-            print(f"[ERRO] Falha ao carregar itens: {e}")
-    
     def _create_widgets(self):
         """Cria todos os widgets da interface."""
         
@@ -281,26 +272,39 @@ class LootLoggerApp(ctk.CTk):
             return
         
         try:
-            from core import Sniffer
+            from core import Sniffer, CaptureProcess, LootDaemonClient
             from handlers import data_handler
             from services import discord_service, config_service
             
-            self.sniffer = Sniffer()
-            self.data_handler = data_handler
-            
-            # Configura callback
-            if not self._callback_registered:
-                self.data_handler.on_loot(self._on_loot_event)
-                self._callback_registered = True
-            
             # Configura Discord
             if config_service.discord_enabled and config_service.is_webhook_valid():
                 discord_service.set_webhook(config_service.discord_webhook)
             
-            # Conecta eventos
-            self.sniffer.on_event(self.data_handler.handle_event)
-            self.sniffer.on_request(self.data_handler.handle_request)
-            self.sniffer.on_response(self.data_handler.handle_response)
+            if config_service.daemon_socket:
+                # Daemon já captura: a interface só recebe os loots
+                self.sniffer = LootDaemonClient(config_service.daemon_socket)
+                self.sniffer.on_loot(self._on_loot_event)
+                self.sniffer.on_loot_update(self._on_loot_update)
+            elif config_service.capture_process:
+                # Captura em outro processo: redraws do Tk não atrasam a captura
+                self.sniffer = CaptureProcess(locale=config_service.language)
+                self.sniffer.on_loot(self._on_loot_event)
+                self.sniffer.on_loot_update(self._on_loot_update)
+            else:
+                self.sniffer = Sniffer()
+                self.data_handler = data_handler
+                
+                # Configura callback
+                if not self._callback_registered:
+                    self.data_handler.on_loot(self._on_loot_event)
+                    self.data_handler.on_loot_update(self._on_loot_update)
+                    self._callback_registered = True
+                
+                # Conecta eventos
+                self.sniffer.on_event(self.data_handler.handle_event)
+                self.sniffer.on_request(self.data_handler.handle_request)
+                self.sniffer.on_response(self.data_handler.handle_response)
+                self.sniffer.set_event_projections(self.data_handler.event_projections())
             
             # Callbacks de status
             def on_albion_online():
@@ -373,29 +377,12 @@ class LootLoggerApp(ctk.CTk):
             self.loot_events.append(event)
             
             # Info de tier
-            tier_display = ""
-            tier_color = ""
-            is_rare = False
-            tier = 0
-            enchant = 0
-            
-            if self.tier_service:
-                tier_info = self.tier_service.parse_tier(event.item_id)
-                if tier_info:
-                    tier_display = tier_info.display_name
-                    tier_color = self.tier_service.get_tier_color(event.item_id)
-                    is_rare = tier_info.is_rare
-                    tier = tier_info.tier
-                    enchant = tier_info.enchant
-            
-            # Salva dados extras
-            self.loot_extra_data[event_key] = {
-                "is_rare": is_rare,
-                "tier_display": tier_display,
-                "tier_color": tier_color,
-                "tier": tier,
-                "enchant": enchant
-            }
+            extra = self.loot_extra_data[event_key] = self._tier_extra(event)
+            tier_display = extra["tier_display"]
+            tier_color = extra["tier_color"]
+            is_rare = extra["is_rare"]
+            tier = extra["tier"]
+            enchant = extra["enchant"]
             
             # Aplica filtros
             if self._should_show_event(event, tier_display):
@@ -415,12 +402,57 @@ class LootLoggerApp(ctk.CTk):
             
             self.status_bar.set_count(len(self.loot_events))
             
-            # Envia para Discord
-            self._send_to_discord(event, tier_display, is_rare)
+            # Envia para Discord (item pendente vai quando for corrigido)
+            if not event.pending:
+                self._send_to_discord(event, tier_display, is_rare)
             
         except Exception as e:
             print(f"[ERRO] _process_loot_event: {e}")
     
+    def _tier_extra(self, event) -> dict:
+        """Dados de tier exibidos na tabela."""
+        extra = {"is_rare": False, "tier_display": "", "tier_color": "", "tier": 0, "enchant": 0}
+        
+        if self.tier_service:
+            tier_info = self.tier_service.parse_tier(event.item_id)
+            if tier_info:
+                extra["tier_display"] = tier_info.display_name
+                extra["tier_color"] = self.tier_service.get_tier_color(event.item_id)
+                extra["is_rare"] = tier_info.is_rare
+                extra["tier"] = tier_info.tier
+                extra["enchant"] = tier_info.enchant
+        
+        return extra
+    
+    def _on_loot_update(self, old_event, new_event):
+        """Callback quando um loot emitido antes da lista de itens carregar e corrigido."""
+        try:
+            self.after(0, lambda: self._process_loot_update(old_event, new_event))
+        except Exception as e:
+            print(f"[ERRO] _on_loot_update: {e}")
+    
+    def _process_loot_update(self, old_event, new_event):
+        """Troca o evento provisorio pelo corrigido na thread principal."""
+        try:
+            # Compara por valor: vindo do ring ou do daemon o evento e uma copia
+            index = next((i for i, event in enumerate(self.loot_events) if event == old_event), None)
+            if index is None:
+                return
+            self.loot_events[index] = new_event
+            
+            old_key = self._generate_event_key(old_event)
+            new_key = self._generate_event_key(new_event)
+            self.loot_extra_data.pop(old_key, None)
+            self.loot_extra_data[new_key] = extra = self._tier_extra(new_event)
+            self._processed_events.discard(old_key)
+            self._processed_events.add(new_key)
+            
+            self._rebuild_loot_table()
+            self._send_to_discord(new_event, extra["tier_display"], extra["is_rare"])
+            
+        except Exception as e:
+            print(f"[ERRO] _process_loot_update: {e}")
+    
     def _should_show_event(self, event, tier_display: str) -> bool:
         """Verifica se evento deve ser exibido."""
         # Filtro de tier
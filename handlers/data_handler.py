@@ -3,9 +3,11 @@ Data Handler - Dispatcher principal de eventos Photon
 Baseado em data-handler.js
 """
 
-from typing import Optional, Callable, List
+from dataclasses import replace
+from typing import Optional, Callable, Dict, FrozenSet, List
 
 from services import events_config
+from storage import storage
 
 from .events import (
     ev_new_loot,
@@ -19,6 +21,7 @@ from .events import (
 )
 from .responses import op_join
 from .requests import op_inventory_move_item
+from .pending_items import pending_items
 
 
 class DataHandler:
@@ -26,23 +29,82 @@ class DataHandler:
     
     def __init__(self):
         self._on_loot_callbacks: List[Callable] = []
+        self._on_loot_update_callbacks: List[Callable] = []
+        
+        pending_items.on_update(self._emit_loot_update)
     
     def on_loot(self, callback: Callable):
         """Registra callback para eventos de loot."""
         if callback not in self._on_loot_callbacks:
             self._on_loot_callbacks.append(callback)
     
+    def on_loot_update(self, callback: Callable):
+        """
+        Registra callback (evento antigo, evento corrigido) para loots emitidos
+        antes da lista de itens carregar, chamado quando o item é resolvido.
+        """
+        if callback not in self._on_loot_update_callbacks:
+            self._on_loot_update_callbacks.append(callback)
+    
     def clear_callbacks(self):
         """Limpa todos os callbacks."""
         self._on_loot_callbacks.clear()
+        self._on_loot_update_callbacks.clear()
     
     def _emit_loot(self, event):
-        """Emite evento de loot para todos os callbacks."""
+        """
+        Emite evento de loot para todos os callbacks.
+        
+        Item provisório com a lista de itens carregando sai com pending=True;
+        a correção (ou o mesmo evento sem pending) chega em on_loot_update.
+        """
+        if pending_items.accepts(event):
+            event = replace(event, pending=True)
+        
         for callback in self._on_loot_callbacks:
             try:
                 callback(event)
             except Exception as e:
                 print(f"[ERRO] Callback de loot falhou: {e}")
+        
+        # Enfileira só depois dos callbacks: a correção nunca chega antes do evento
+        if event.pending:
+            pending_items.defer_event(event)
+    
+    def _emit_loot_update(self, old_event, new_event):
+        """Emite a correção de um loot para todos os callbacks."""
+        for callback in self._on_loot_update_callbacks:
+            try:
+                callback(old_event, new_event)
+            except Exception as e:
+                print(f"[ERRO] Callback de loot corrigido falhou: {e}")
+    
+    def event_projections(self) -> Dict[int, FrozenSet[int]]:
+        """
+        Retorna {event ID: parâmetros lidos pelo handler}.
+        
+        Usado pelo PhotonDecoder para decodificar apenas os parâmetros
+        necessários. Deve ser chamado após events_config.load().
+        """
+        codes = events_config.events
+        
+        handlers = [
+            (codes.EvNewCharacter, ev_new_character),
+            (codes.EvNewEquipmentItem, ev_new_equipment_item),
+            (codes.EvNewSiegeBannerItem, ev_new_equipment_item),
+            (codes.EvNewSimpleItem, ev_new_simple_item),
+            (codes.EvNewLoot, ev_new_loot),
+            (codes.EvAttachItemContainer, ev_attach_item_container),
+            (codes.EvDetachItemContainer, ev_detach_item_container),
+            (codes.EvCharacterStats, ev_character_stats),
+            (codes.EvOtherGrabbedLoot, ev_other_grabbed_loot),
+        ]
+        
+        projections: Dict[int, FrozenSet[int]] = {}
+        for event_id, module in handlers:
+            if event_id:
+                projections[event_id] = projections.get(event_id, frozenset()) | module.PARAMS
+        return projections
     
     def handle_event(self, event: dict):
         """
@@ -61,6 +123,12 @@ class DataHandler:
             if event_id is None:
                 return
             
+            # Loots/containers da conexão que enviou a mensagem (multibox)
+            storage.select_zone(event.get('connection'))
+            
+            # TTL/limites dos storages (a passada roda no máximo uma vez por segundo)
+            storage.maintain()
+            
             codes = events_config.events
             
             # Dispatch baseado no event ID
@@ -103,6 +171,8 @@ class DataHandler:
             if event_id is None:
                 return
             
+            storage.select_zone(event.get('connection'))
+            
             codes = events_config.events
             
             if event_id == codes.OpInventoryMoveItem:
@@ -120,6 +190,8 @@ class DataHandler:
             if event_id is None:
                 return
             
+            storage.select_zone(event.get('connection'))
+            
             codes = events_config.events
             
             if event_id == codes.OpJoin:
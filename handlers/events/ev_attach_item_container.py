@@ -3,8 +3,13 @@ EvAttachItemContainer - Evento quando um container é anexado (abre)
 Baseado em ev-attach-item-container.js
 """
 
+from array import array
+
 from storage import storage
-from utils import uuid_stringify
+
+
+# Parâmetros lidos por este handler (decodificação por projeção)
+PARAMS = frozenset({0, 1, 3, 4})
 
 
 def handle(event: dict):
@@ -13,7 +18,7 @@ def handle(event: dict):
     
     Parâmetros:
     - [0] = id (int)
-    - [1] = encodedUuid (array de 16 bytes)
+    - [1] = encodedUuid (16 bytes)
     - [3] = inventory (array de objectIds)
     - [4] = slots (int)
     """
@@ -23,20 +28,18 @@ def handle(event: dict):
     if not isinstance(container_id, int):
         return
     
-    encoded_uuid = params.get(1)
-    if not isinstance(encoded_uuid, list) or len(encoded_uuid) != 16:
+    uuid = params.get(1)
+    if not isinstance(uuid, bytes) or len(uuid) != 16:
         return
     
     inventory = params.get(3)
-    if not isinstance(inventory, list):
+    if not isinstance(inventory, (list, array)):
         return
     
     slots = params.get(4)
     if not isinstance(slots, int):
         return
     
-    uuid = uuid_stringify(encoded_uuid)
-    
     # Busca container por UUID ou ID
     container = storage.containers.get_by_uuid(uuid)
     if container is None:
@@ -45,10 +48,9 @@ def handle(event: dict):
     if container is None:
         container = storage.containers.add(id=container_id, uuid=uuid)
     else:
-        if container.uuid != uuid:
-            container.uuid = uuid
-        if container.id != container_id:
-            container.id = container_id
+        # Pelo storage para os índices por id/uuid acompanharem a troca
+        storage.containers.set_uuid(container, uuid)
+        storage.containers.set_id(container, container_id)
     
     # Associa items ao container
     for position, object_id in enumerate(inventory):
@@ -6,6 +6,10 @@ Baseado em ev-characters-stats.js
 from storage import storage
 
 
+# Parâmetros lidos por este handler (decodificação por projeção)
+PARAMS = frozenset({0, 2, 4, 5})
+
+
 def handle(event: dict):
     """
     Processa evento EvCharacterStats.
@@ -34,13 +38,5 @@ def handle(event: dict):
     if not isinstance(alliance_name, str):
         alliance_name = ""
     
-    # Busca ou cria jogador
-    player = storage.players.get_by_name(player_name)
-    
-    if player is None:
-        player = storage.players.add(player_name, guild_name, alliance_name)
-    else:
-        if guild_name:
-            player.guild = guild_name
-        if alliance_name:
-            player.alliance = alliance_name
+    # Busca ou cria jogador (guild/alliance novas substituem o registro)
+    player = storage.players.update(player_name, guild_name, alliance_name, object_id=player_id)
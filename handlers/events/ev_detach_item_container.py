@@ -4,7 +4,10 @@ Baseado em ev-detach-item-container.js
 """
 
 from storage import storage
-from utils import uuid_stringify
+
+
+# Parâmetros lidos por este handler (decodificação por projeção)
+PARAMS = frozenset({0})
 
 
 def handle(event: dict):
@@ -12,13 +15,12 @@ def handle(event: dict):
     Processa evento EvDetachItemContainer.
     
     Parâmetros:
-    - [0] = encodedUuid (array de 16 bytes)
+    - [0] = encodedUuid (16 bytes)
     """
     params = event.get('parameters', {})
     
-    encoded_uuid = params.get(0)
-    if not isinstance(encoded_uuid, list) or len(encoded_uuid) != 16:
+    uuid = params.get(0)
+    if not isinstance(uuid, bytes) or len(uuid) != 16:
         return
     
-    uuid = uuid_stringify(encoded_uuid)
     storage.containers.delete_by_uuid(uuid)
@@ -6,6 +6,10 @@ Baseado em ev-new-character.js
 from storage import storage
 
 
+# Parâmetros lidos por este handler (decodificação por projeção)
+PARAMS = frozenset({0, 1, 8, 43})
+
+
 def handle(event: dict):
     """
     Processa evento EvNewCharacter.
@@ -34,16 +38,8 @@ def handle(event: dict):
     if not isinstance(alliance_name, str):
         alliance_name = ""
     
-    # Busca ou cria jogador
-    player = storage.players.get_by_name(player_name)
-    
-    if player is None:
-        player = storage.players.add(player_name, guild_name, alliance_name)
-    else:
-        if guild_name:
-            player.guild = guild_name
-        if alliance_name:
-            player.alliance = alliance_name
+    # Busca ou cria jogador (guild/alliance novas substituem o registro)
+    player = storage.players.update(player_name, guild_name, alliance_name, object_id=player_id)
     
     # Debug (comentado para não poluir)
     # print(f"[DEBUG] EvNewCharacter: {player.format_name()}")
@@ -3,7 +3,14 @@ EvNewLoot - Evento quando um loot bag aparece no chão
 Baseado em ev-new-loot.js
 """
 
+from array import array
+
 from storage import storage
+from utils import intern_str
+
+
+# Parâmetros lidos por este handler (decodificação por projeção)
+PARAMS = frozenset({0, 3, 4})
 
 
 def handle(event: dict):
@@ -27,7 +34,7 @@ def handle(event: dict):
     
     # Verifica position (opcional mas ajuda debug)
     position = params.get(4)
-    if not isinstance(position, list) or len(position) != 2:
+    if not isinstance(position, (list, array)) or len(position) != 2:
         pass  # Não é crítico
     
     # Tipo baseado no owner
@@ -44,6 +51,6 @@ def handle(event: dict):
         )
     else:
         if container.owner != owner:
-            container.owner = owner
+            container.owner = intern_str(owner)
         if container.type != container_type:
             container.type = container_type
@@ -4,7 +4,12 @@ Baseado em ev-new-simple-item.js
 """
 
 from storage import storage
-from services import items_service
+
+from ..pending_items import lookup_item, pending_items, placeholder_num_id
+
+
+# Parâmetros lidos por este handler (decodificação por projeção)
+PARAMS = frozenset({0, 1, 2, 5})
 
 
 def handle(event: dict):
@@ -36,19 +41,18 @@ def handle(event: dict):
     if isinstance(crafted_by, str):
         return
     
-    # Busca info do item
-    item = items_service.get(item_num_id)
-    if item is None:
+    # Busca info do item (nome provisório se a lista de itens ainda está carregando)
+    found = lookup_item(item_num_id)
+    if found is None:
         return
     
-    item_id = item.item_id
-    item_name = item.get_name(items_service.locale)
+    item_id, item_name = found
     
     # Busca ou cria loot
     loot = storage.loots.get_by_id(object_id)
     
     if loot is None:
-        storage.loots.add(
+        loot = storage.loots.add(
             object_id=object_id,
             item_id=item_id,
             item_name=item_name,
@@ -58,3 +62,6 @@ def handle(event: dict):
         loot.item_id = item_id
         loot.item_name = item_name
         loot.quantity = quantity
+    
+    if placeholder_num_id(item_id) is not None:
+        pending_items.defer_loot(loot)
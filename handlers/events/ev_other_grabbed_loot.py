@@ -8,7 +8,12 @@ from datetime import datetime
 from typing import Optional, Callable
 
 from storage import storage
-from services import items_service
+
+from ..pending_items import lookup_item, placeholder_id, placeholder_name
+
+
+# Parâmetros lidos por este handler (decodificação por projeção)
+PARAMS = frozenset({1, 2, 3, 4, 5})
 
 
 def handle(event: dict, on_loot: Optional[Callable] = None):
@@ -44,15 +49,14 @@ def handle(event: dict, on_loot: Optional[Callable] = None):
     if not isinstance(quantity, int):
         return
     
-    # Busca info do item
-    item = items_service.get(item_num_id)
+    # Busca info do item (provisório até a lista de itens carregar; o evento é corrigido depois)
+    found = lookup_item(item_num_id)
     
-    if item is None:
-        item_id = f"UNKNOWN_{item_num_id}"
-        item_name = f"Item Desconhecido ({item_num_id})"
+    if found is None:
+        item_id = placeholder_id(item_num_id)
+        item_name = placeholder_name(item_num_id)
     else:
-        item_id = item.item_id
-        item_name = item.get_name(items_service.locale)
+        item_id, item_name = found
     
     # Busca ou cria jogadores
     looted_by = storage.players.get_by_name(looted_by_name)
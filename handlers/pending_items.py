@@ -0,0 +1,216 @@
+"""
+Pending Items - Itens vistos antes da lista de itens carregar
+Enquanto o catálogo carrega (todas as entradas carregam em segundo plano),
+loots e eventos recebem um item_id provisório UNKNOWN_<id>. Quando o catálogo
+fica pronto, tudo é resolvido de uma vez: os loots do storage são corrigidos
+no lugar e cada evento já emitido gera uma notificação (evento antigo,
+evento corrigido).
+
+Todo evento emitido com pending=True recebe exatamente uma notificação: se o
+item não existir no catálogo (ou o catálogo não carregar), o evento corrigido
+é o mesmo, só sem pending.
+
+O catálogo carrega em outra thread, mas a resolução roda na thread de decode
+(poll): os loots do storage e os produtores de um só escritor (LootRing) só
+são tocados por ela.
+"""
+
+import threading
+from array import array
+from dataclasses import replace
+from typing import Callable, List, Optional, Tuple
+
+from models import LootEvent
+from services import items_service
+from storage.loots_storage import Loot
+from utils import intern_str
+
+
+PLACEHOLDER_PREFIX = "UNKNOWN_"
+
+# Limite de pendências (se o catálogo nunca carregar, não cresce sem fim)
+MAX_PENDING = 20000
+
+
+def placeholder_id(item_num_id: int) -> str:
+    return intern_str(f"{PLACEHOLDER_PREFIX}{item_num_id}")
+
+
+def placeholder_name(item_num_id: int) -> str:
+    return f"Item Desconhecido ({item_num_id})"
+
+
+def placeholder_num_id(item_id: str) -> Optional[int]:
+    """item_num_id de um item_id provisório (None se for um item_id real)."""
+    if not item_id.startswith(PLACEHOLDER_PREFIX):
+        return None
+    try:
+        return int(item_id[len(PLACEHOLDER_PREFIX):])
+    except ValueError:
+        return None
+
+
+def lookup_item(item_num_id: int) -> Optional[Tuple[str, str]]:
+    """
+    (item_id, nome) do item no idioma atual.
+    
+    Com o catálogo ainda carregando devolve o nome provisório; com o catálogo
+    pronto, None para ids que não existem nele.
+    """
+    item = items_service.get(item_num_id)
+    if item is not None:
+        return item.item_id, item.get_name(items_service.locale)
+    if not items_service.loaded:
+        return placeholder_id(item_num_id), placeholder_name(item_num_id)
+    return None
+
+
+class PendingItems:
+    """Loots e eventos com item provisório, aguardando o catálogo."""
+    
+    def __init__(self, max_pending: int = MAX_PENDING):
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        
+        # Listas paralelas: objeto a corrigir + item_num_id
+        self._loots: List[Loot] = []
+        self._loot_item_ids = array('i')
+        self._events: List[LootEvent] = []
+        self._event_item_ids = array('i')
+        
+        self._on_update_callbacks: List[Callable[[LootEvent, LootEvent], None]] = []
+        
+        # Catálogo pronto (ou falho) na thread de carregamento; poll executa o resolve
+        self._resolve_requested = False
+        
+        # Contadores
+        self.resolved = 0
+        self.unresolved = 0
+        self.dropped = 0
+    
+    def __len__(self) -> int:
+        return len(self._loots) + len(self._events)
+    
+    def on_update(self, callback: Callable[[LootEvent, LootEvent], None]):
+        """Registra callback (evento antigo, evento corrigido) para eventos resolvidos."""
+        if callback not in self._on_update_callbacks:
+            self._on_update_callbacks.append(callback)
+    
+    def defer_loot(self, loot: Loot):
+        """Loot criado com item provisório; corrigido no lugar quando o catálogo chegar."""
+        item_num_id = placeholder_num_id(loot.item_id)
+        if item_num_id is None:
+            return
+        
+        with self._lock:
+            if len(self._loots) >= self.max_pending:
+                self.dropped += 1
+                return
+            self._loots.append(loot)
+            self._loot_item_ids.append(item_num_id)
+        
+        # O catálogo pode ter ficado pronto (ou falhado) entre o lookup e o append
+        if items_service.loaded or items_service.load_failed:
+            self.resolve()
+    
+    def accepts(self, event: LootEvent) -> bool:
+        """Evento com item provisório e catálogo ainda a caminho (vale marcar pending)."""
+        return (placeholder_num_id(event.item_id) is not None
+                and not items_service.loaded and not items_service.load_failed)
+    
+    def defer_event(self, event: LootEvent) -> bool:
+        """
+        Evento já emitido com pending=True; a correção sai em on_update.
+        
+        Retorna True se ficou na fila. Sem espaço, a notificação sai na hora
+        com o evento inalterado (quem esperava a correção não fica preso).
+        """
+        item_num_id = placeholder_num_id(event.item_id)
+        if item_num_id is None:
+            self._notify([(event, replace(event, pending=False))])
+            return False
+        
+        with self._lock:
+            queued = len(self._events) < self.max_pending
+            if queued:
+                self._events.append(event)
+                self._event_item_ids.append(item_num_id)
+            else:
+                self.dropped += 1
+        
+        if not queued:
+            self._notify([(event, replace(event, pending=False))])
+            return False
+        
+        # O catálogo pode ter ficado pronto (ou falhado) entre accepts e o append
+        if items_service.loaded or items_service.load_failed:
+            self.resolve()
+        return True
+    
+    def request_resolve(self):
+        """Pede o resolve (callback do items_service, roda na thread de carregamento)."""
+        self._resolve_requested = True
+    
+    def poll(self) -> bool:
+        """Executa o resolve pedido, se houver (chamado pela thread de decode)."""
+        if not self._resolve_requested:
+            return False
+        self._resolve_requested = False
+        self.resolve()
+        return True
+    
+    def resolve(self):
+        """Resolve todas as pendências com o catálogo atual (na thread de decode)."""
+        with self._lock:
+            loots, loot_item_ids = self._loots, self._loot_item_ids
+            events, event_item_ids = self._events, self._event_item_ids
+            self._loots, self._loot_item_ids = [], array('i')
+            self._events, self._event_item_ids = [], array('i')
+        
+        if not loots and not events:
+            return
+        
+        catalog = items_service.items
+        locale = items_service.locale
+        
+        resolved = 0
+        for loot, item_num_id in zip(loots, loot_item_ids):
+            item = catalog.get(item_num_id)
+            # Só troca se ninguém atualizou o loot nesse meio tempo
+            if item is not None and loot.item_id == placeholder_id(item_num_id):
+                loot.item_id = item.item_id
+                loot.item_name = item.get_name(locale)
+                resolved += 1
+        
+        # Não resolvidos também notificam (inalterados): pending acaba aqui
+        updates: List[Tuple[LootEvent, LootEvent]] = []
+        corrected = 0
+        for event, item_num_id in zip(events, event_item_ids):
+            item = catalog.get(item_num_id)
+            if item is None:
+                updates.append((event, replace(event, pending=False)))
+                continue
+            updates.append((event, replace(event, item_id=item.item_id, item_name=item.get_name(locale), pending=False)))
+            corrected += 1
+        
+        resolved += corrected
+        self.resolved += resolved
+        self.unresolved += len(loots) + len(events) - resolved
+        
+        print(f"[INFO] {resolved} itens pendentes resolvidos ({corrected} eventos corrigidos)")
+        
+        self._notify(updates)
+    
+    def _notify(self, updates: List[Tuple[LootEvent, LootEvent]]):
+        for old_event, new_event in updates:
+            for callback in self._on_update_callbacks:
+                try:
+                    callback(old_event, new_event)
+                except Exception as e:
+                    print(f"[ERRO] Callback de loot corrigido falhou: {e}")
+
+
+# Instância global
+pending_items = PendingItems()
+items_service.on_loaded(pending_items.request_resolve)
+items_service.on_load_failed(pending_items.request_resolve)
@@ -8,7 +8,6 @@ from datetime import datetime
 from typing import Optional, Callable
 
 from storage import storage
-from utils import uuid_stringify
 
 
 def handle(event: dict, on_loot: Optional[Callable] = None):
@@ -17,9 +16,9 @@ def handle(event: dict, on_loot: Optional[Callable] = None):
     
     Parâmetros:
     - [0] = fromSlot (int)
-    - [1] = fromEncodedUuid (array de 16 bytes)
+    - [1] = fromEncodedUuid (16 bytes)
     - [3] = toSlot (int)
-    - [4] = toEncodedUuid (array de 16 bytes)
+    - [4] = toEncodedUuid (16 bytes)
     """
     params = event.get('parameters', {})
     
@@ -27,21 +26,18 @@ def handle(event: dict, on_loot: Optional[Callable] = None):
     if not isinstance(from_slot, int):
         from_slot = 0
     
-    from_encoded_uuid = params.get(1)
-    if not isinstance(from_encoded_uuid, list) or len(from_encoded_uuid) != 16:
+    from_uuid = params.get(1)
+    if not isinstance(from_uuid, bytes) or len(from_uuid) != 16:
         return
     
     to_slot = params.get(3, 0)
     if not isinstance(to_slot, int):
         to_slot = 0
     
-    to_encoded_uuid = params.get(4)
-    if not isinstance(to_encoded_uuid, list) or len(to_encoded_uuid) != 16:
+    to_uuid = params.get(4)
+    if not isinstance(to_uuid, bytes) or len(to_uuid) != 16:
         return
     
-    from_uuid = uuid_stringify(from_encoded_uuid)
-    to_uuid = uuid_stringify(to_encoded_uuid)
-    
     # Se movendo dentro do mesmo container, ignora
     if from_uuid == to_uuid:
         return
@@ -12,6 +12,7 @@ def handle(event: dict):
     Processa response OpJoin.
     
     Parâmetros:
+    - [0] = id (int) - objectId do próprio personagem
     - [2] = playerName (string)
     - [57] = guildName (string, opcional)
     - [77] = allianceName (string, opcional)
@@ -30,16 +31,15 @@ def handle(event: dict):
     if not isinstance(alliance_name, str):
         alliance_name = ""
     
-    # Busca ou cria jogador
-    player = storage.players.get_by_name(player_name)
+    object_id = params.get(0)
+    if not isinstance(object_id, int):
+        object_id = None
     
-    if player is None:
-        player = storage.players.add(player_name, guild_name, alliance_name)
-    else:
-        if guild_name:
-            player.guild = guild_name
-        if alliance_name:
-            player.alliance = alliance_name
+    # Entrou em outra zona: itens e containers da zona anterior não voltam mais
+    storage.change_zone()
+    
+    # Busca ou cria jogador (guild/alliance novas substituem o registro)
+    player = storage.players.update(player_name, guild_name, alliance_name, object_id=object_id)
     
     # Define como o próprio jogador (SELF)
     storage.players.set_self(player)
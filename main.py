@@ -20,8 +20,10 @@ from typing import List
 # Adiciona o diretório ao path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from core import AlbionSniffer
+from core import AlbionSniffer, LootDaemonClient
+from core.capture import CaptureSettings, PacketRecorder
 from handlers import data_handler
+from storage import storage
 from services import items_service, events_config, discord_service
 from models import LootEvent
 
@@ -35,6 +37,34 @@ TITLE = f"AO Loot Logger Python - v{VERSION}"
 # Webhook do Discord
 DISCORD_WEBHOOK_URL = "https://discordapp.com/api/webhooks/1450577850628309224/xqwPgGtm5KlmMxE2Net7clKYts6XMcF9Ahv5FWxEpq6JN0N3Je9TYWXrG30v3jhZ9KKj"
 
+# Backend de captura: "auto" (ring TPACKET_V3 / AF_PACKET no Linux, senão scapy),
+# "tpacket_v3", "af_packet" ou "scapy"
+CAPTURE_BACKEND = "auto"
+
+# Ring TPACKET_V3: tamanho total, tamanho do bloco e timeout de entrega do bloco (ms)
+CAPTURE_RING_SIZE = 32 * 1024 * 1024
+CAPTURE_BLOCK_SIZE = 1024 * 1024
+CAPTURE_RETIRE_TIMEOUT_MS = 50
+
+# Fila entre captura e decode: capacidade (datagramas) e política quando cheia
+# ("drop_oldest" descarta o mais antigo, "block" segura a captura)
+PACKET_QUEUE_SIZE = 8192
+PACKET_QUEUE_BACKPRESSURE = "drop_oldest"
+
+# Processos de decode (0 = decodifica no próprio processo). Com N > 0 os
+# fluxos são distribuídos entre N processos, útil com vários personagens
+DECODE_WORKERS = 0
+
+# Socket de um main_daemon.py já rodando (None = captura aqui mesmo). Com o
+# daemon, este terminal só recebe os loots e a captura é compartilhada
+DAEMON_SOCKET = None
+
+# Gravação dos pacotes capturados em pcaps rotativos (None = desativada)
+RECORD_DIRECTORY = None
+RECORD_MAX_BYTES = 100 * 1024 * 1024
+RECORD_MAX_SECONDS = 10 * 60
+RECORD_COMPRESS = True
+
 # ============================================
 # CORES PARA TERMINAL
 # ============================================
@@ -164,11 +194,25 @@ def on_loot(event: LootEvent):
     # Imprime
     print(f"{time_str} UTC: {looted_by_str} looted {bold(str(event.quantity))}x {cyan(event.item_name)} from {looted_from_str}")
     
-    # Envia para Discord
-    if discord_service.enabled:
+    # Envia para Discord (item pendente sai em on_loot_update, já corrigido)
+    if discord_service.enabled and not event.pending:
         discord_service.send_loot_event(event)
 
 
+def on_loot_update(old_event: LootEvent, new_event: LootEvent):
+    """Callback quando o item de um loot pendente é resolvido (lista de itens carregou)."""
+    for index in range(len(loot_events) - 1, -1, -1):
+        if loot_events[index] == old_event:
+            loot_events[index] = new_event
+            break
+    
+    if new_event.item_id != old_event.item_id:
+        print(gray(f"[INFO] Item corrigido: {old_event.item_name} -> ") + cyan(new_event.item_name))
+    
+    if discord_service.enabled:
+        discord_service.send_loot_event(new_event)
+
+
 def on_online():
     """Callback quando Albion é detectado."""
     print(f"\n\t{green('ALBION DETECTADO')}. Eventos de loot serão registrados.\n")
@@ -207,6 +251,51 @@ def signal_handler(sig, frame):
     sys.exit(0)
 
 
+def create_sniffer() -> AlbionSniffer:
+    """Cria o sniffer local com os callbacks do terminal."""
+    print(f"\n[INFO] Iniciando captura de pacotes...")
+    print(gray("[INFO] Filtro: UDP portas 5056, 5055, 4535"))
+    
+    capture_settings = CaptureSettings(
+        ring_size=CAPTURE_RING_SIZE,
+        block_size=CAPTURE_BLOCK_SIZE,
+        retire_timeout_ms=CAPTURE_RETIRE_TIMEOUT_MS
+    )
+    recorder = None
+    if RECORD_DIRECTORY:
+        recorder = PacketRecorder(
+            RECORD_DIRECTORY,
+            max_bytes=RECORD_MAX_BYTES,
+            max_seconds=RECORD_MAX_SECONDS,
+            compress=RECORD_COMPRESS
+        )
+        print(gray(f"[INFO] Gravando pacotes em: {RECORD_DIRECTORY}"))
+    
+    sniffer = AlbionSniffer(
+        backend=CAPTURE_BACKEND,
+        capture_settings=capture_settings,
+        recorder=recorder,
+        queue_size=PACKET_QUEUE_SIZE,
+        backpressure=PACKET_QUEUE_BACKPRESSURE,
+        decode_workers=DECODE_WORKERS
+    )
+    
+    # Registra callbacks
+    data_handler.on_loot(on_loot)
+    data_handler.on_loot_update(on_loot_update)
+    sniffer.on_loot(on_loot)  # Loot decodificado nos processos worker (DECODE_WORKERS > 0)
+    sniffer.on_loot_update(on_loot_update)
+    
+    sniffer.on_event(data_handler.handle_event)
+    sniffer.on_request(data_handler.handle_request)
+    sniffer.on_response(data_handler.handle_response)
+    sniffer.set_event_projections(data_handler.event_projections())
+    sniffer.on_online(on_online)
+    sniffer.on_offline(on_offline)
+    
+    return sniffer
+
+
 def main():
     """Função principal."""
     global log_filename
@@ -240,27 +329,29 @@ def main():
         print(red("[ERRO] Falha ao carregar configuração de eventos."))
         sys.exit(1)
     
-    if not items_service.load():
-        print(yellow("[AVISO] Lista de itens não carregada. Alguns itens podem aparecer como 'Unknown'."))
+    # Em segundo plano: loots que chegarem antes saem com item pendente e são corrigidos depois
+    items_service.on_load_failed(
+        lambda: print(yellow("[AVISO] Lista de itens não carregada. Alguns itens podem aparecer como 'Unknown'."))
+    )
+    items_service.load_async()
     
     # Cria arquivo de log
     log_filename = create_log_file()
     print(f"\n[INFO] Logs serão salvos em: {cyan(log_filename)}")
     
-    # Cria sniffer
-    print(f"\n[INFO] Iniciando captura de pacotes...")
-    print(gray("[INFO] Filtro: UDP portas 5056, 5055, 4535"))
+    recorder = None
     
-    sniffer = AlbionSniffer()
-    
-    # Registra callbacks
-    data_handler.on_loot(on_loot)
-    
-    sniffer.on_event(data_handler.handle_event)
-    sniffer.on_request(data_handler.handle_request)
-    sniffer.on_response(data_handler.handle_response)
-    sniffer.on_online(on_online)
-    sniffer.on_offline(on_offline)
+    if DAEMON_SOCKET:
+        # Cliente do daemon: loots já decodificados chegam pelo socket
+        print(f"\n[INFO] Conectando ao daemon em {DAEMON_SOCKET}...")
+        sniffer = LootDaemonClient(DAEMON_SOCKET)
+        sniffer.on_loot(on_loot)
+        sniffer.on_loot_update(on_loot_update)
+        sniffer.on_online(on_online)
+        sniffer.on_offline(on_offline)
+    else:
+        sniffer = create_sniffer()
+        recorder = sniffer.recorder
     
     # Inicia captura
     sniffer.start()
@@ -290,6 +381,24 @@ def main():
                 elif cmd == 'status':
                     print(f"\n[STATUS] Eventos capturados: {len(loot_events)}")
                     print(f"[STATUS] Arquivo: {log_filename}")
+                    if DAEMON_SOCKET:
+                        snapshot = sniffer.request_snapshot()
+                        if snapshot is None:
+                            print(yellow("[STATUS] Daemon não conectado"))
+                        else:
+                            print(f"[STATUS] Daemon: {snapshot.loot_total} loots | Pacotes (kernel): {snapshot.packets} | Descartados: {snapshot.drops} | Descartados na fila: {snapshot.queue_dropped}")
+                        print()
+                        continue
+                    capture_stats = sniffer.capture_stats
+                    print(f"[STATUS] Pacotes (kernel): {capture_stats.packets} | Descartados: {capture_stats.drops}")
+                    queue_stats = sniffer.queue_stats
+                    print(f"[STATUS] Fila: {queue_stats.depth} (máx. {queue_stats.high_water}) | Descartados na fila: {queue_stats.dropped}")
+                    print(f"[STATUS] Erros de decodificação: {sniffer.stats.decode_errors} mensagens, {sniffer.packet_errors} pacotes")
+                    if recorder:
+                        print(f"[STATUS] Gravados: {recorder.recorded} | Descartados na gravação: {recorder.dropped}")
+                    storage_stats = storage.stats()
+                    for label, store in (("Itens", storage_stats.loots), ("Containers", storage_stats.containers), ("Jogadores", storage_stats.players)):
+                        print(f"[STATUS] {label}: {store.size} | Removidos: {store.evicted_ttl} TTL, {store.evicted_lru} LRU, {store.evicted_zone} zona")
                     print()
             except EOFError:
                 break
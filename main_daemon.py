@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+AO Loot Logger - Daemon de Captura
+Roda a captura + decode sem interface e publica os loots em um Unix domain
+socket. GUI, dashboard e terminal se conectam a ele (daemon_socket no
+loot_logger_config.json / DAEMON_SOCKET no main.py), então abrir vários
+frontends não duplica a captura nem o estado.
+
+Uso:
+    sudo python main_daemon.py                           # socket padrão
+    sudo python main_daemon.py --socket /run/loot.sock --socket-mode 666
+"""
+
+import sys
+import os
+import argparse
+import multiprocessing
+import signal
+import threading
+
+# Adiciona o diretório ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core import LootDaemon
+from core.loot_daemon import default_socket_path, DAEMON_HISTORY_SIZE
+from services import items_service, events_config, config_service
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Daemon de captura do AO Loot Logger")
+    parser.add_argument("--socket", default=default_socket_path(), help="Caminho do Unix domain socket")
+    parser.add_argument("--socket-mode", default="600",
+                        help="Permissão do socket em octal (666 libera frontends de outros usuários)")
+    parser.add_argument("--history", type=int, default=DAEMON_HISTORY_SIZE,
+                        help="Loots mantidos para o snapshot de quem conecta depois")
+    parser.add_argument("--backend", default="auto", help="Backend de captura (auto, tpacket_v3, af_packet, scapy)")
+    parser.add_argument("--workers", type=int, default=0, help="Processos de decode (0 = no próprio processo)")
+    args = parser.parse_args()
+    
+    config_service.load()
+    
+    if not events_config.load():
+        print("[ERRO] Falha ao carregar configuração de eventos.")
+        sys.exit(1)
+    
+    items_service.locale = config_service.language
+    # Em segundo plano: loots que chegarem antes saem com item pendente e a correção vai como LOOT_UPDATE
+    items_service.load_async()
+    
+    daemon = LootDaemon(
+        args.socket,
+        history_size=args.history,
+        socket_mode=int(args.socket_mode, 8),
+        backend=args.backend,
+        decode_workers=args.workers
+    )
+    
+    stop_requested = threading.Event()
+    
+    def request_stop(signum=None, frame=None):
+        stop_requested.set()
+    
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    
+    try:
+        daemon.start()
+    except (RuntimeError, OSError) as e:
+        print(f"[ERRO] Falha ao iniciar o daemon: {e}")
+        sys.exit(1)
+    
+    print("[OK] Daemon iniciado! Pressione Ctrl+C para encerrar.")
+    
+    while not stop_requested.wait(1):
+        pass
+    
+    print("\n[INFO] Encerrando...")
+    daemon.stop()
+    print(f"[OK] Total de loots publicados: {daemon.loot_total}")
+
+
+if __name__ == "__main__":
+    # Executável (PyInstaller) precisa disso para subir os processos de decode
+    multiprocessing.freeze_support()
+    main()
@@ -17,6 +17,7 @@ Open Source Version - https://github.com/Kazxye/ao-loot-logger
 import sys
 import os
 import ctypes
+import multiprocessing
 
 # Adiciona o diretório ao path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -105,4 +106,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Executável (PyInstaller) precisa disso para subir o processo de captura
+    multiprocessing.freeze_support()
     main()
@@ -15,6 +15,7 @@ Open Source Version - https://github.com/Kazxye/ao-loot-logger
 import sys
 import os
 import ctypes
+import multiprocessing
 import signal
 
 # Adiciona o diretório ao path
@@ -102,7 +103,8 @@ def main():
         config_service.load()
         events_config.load()
         items_service.locale = config_service.language
-        items_service.load()
+        # Em segundo plano: loots que chegarem antes saem com item pendente e são corrigidos depois
+        items_service.load_async()
         
         # Inicia Dashboard
         print("[INFO] Iniciando Dashboard Web...")
@@ -114,18 +116,32 @@ def main():
         
         # Inicia Sniffer
         print("[INFO] Iniciando captura de pacotes...")
-        from core import Sniffer
+        from core import Sniffer, CaptureProcess, LootDaemonClient
         from handlers import data_handler
         
-        sniffer = Sniffer()
-        
-        # Registra callback do dashboard
-        data_handler.on_loot(dashboard_server.on_loot_event)
-        
-        # Conecta eventos
-        sniffer.on_event(data_handler.handle_event)
-        sniffer.on_request(data_handler.handle_request)
-        sniffer.on_response(data_handler.handle_response)
+        if config_service.daemon_socket:
+            # Daemon já captura: o dashboard só recebe os loots
+            sniffer = LootDaemonClient(config_service.daemon_socket)
+            sniffer.on_loot(dashboard_server.on_loot_event)
+            sniffer.on_loot_update(dashboard_server.on_loot_update)
+        elif config_service.capture_process:
+            # Captura em outro processo: o Flask/SocketIO não disputa o GIL com a captura
+            sniffer = CaptureProcess(locale=config_service.language)
+            sniffer.on_loot(dashboard_server.on_loot_event)
+            sniffer.on_loot_update(dashboard_server.on_loot_update)
+        else:
+            sniffer = Sniffer()
+            
+            # Registra callback do dashboard
+            data_handler.on_loot(dashboard_server.on_loot_event)
+            data_handler.on_loot_update(dashboard_server.on_loot_update)
+            sniffer.on_loot_update(dashboard_server.on_loot_update)
+            
+            # Conecta eventos
+            sniffer.on_event(data_handler.handle_event)
+            sniffer.on_request(data_handler.handle_request)
+            sniffer.on_response(data_handler.handle_response)
+            sniffer.set_event_projections(data_handler.event_projections())
         
         def on_albion_online():
             print("[OK] Albion Online detectado! Monitorando...")
@@ -174,4 +190,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Executável (PyInstaller) precisa disso para subir o processo de captura
+    multiprocessing.freeze_support()
     main()
@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
 
 
-@dataclass
+@dataclass(slots=True)
 class LootItem:
     """Representa um item de loot."""
     object_id: int
@@ -14,11 +14,11 @@ class LootItem:
     owner: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Container:
     """Representa um container (loot bag, chest, etc)."""
     id: int
-    uuid: Optional[str] = None
+    uuid: Optional[bytes] = None  # 16 bytes crus
     type: str = "unknown"  # "player", "monster", "chest"
     owner: Optional[str] = None
     items: Dict[int, LootItem] = field(default_factory=dict)
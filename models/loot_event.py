@@ -8,7 +8,7 @@ if TYPE_CHECKING:
     from storage import Player
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LootEvent:
     """Representa um evento de loot."""
     timestamp: datetime
@@ -18,6 +18,9 @@ class LootEvent:
     looted_by: 'Player'
     looted_from: 'Player'
     
+    # Item provisório (lista de itens carregando): uma correção ainda vai chegar
+    pending: bool = False
+    
     def to_dict(self) -> dict:
         """Converte para dicionário (para JSON export)."""
         return {
@@ -1,10 +1,10 @@
 """Player model."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Player:
     """Representa um jogador no jogo."""
     name: str
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+AO Loot Logger - Replay Offline
+Processa uma captura pcap/pcapng pelo pipeline completo (PhotonDecoder +
+DataHandler) sem precisar do jogo aberto.
+
+Uso:
+    python replay.py captura.pcapng              # o mais rápido possível
+    python replay.py captura.pcap --speed 1      # ritmo original
+    python replay.py captura.pcap --speed 4 -v   # 4x, imprimindo os loots
+"""
+
+import sys
+import os
+import argparse
+
+# Adiciona o diretório ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core import Sniffer
+from core.capture import PcapError
+from handlers import data_handler
+from services import items_service, events_config
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Replay de captura pcap/pcapng do Albion Online")
+    parser.add_argument("path", help="Arquivo .pcap ou .pcapng (pode estar comprimido com gzip)")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="Multiplicador de velocidade (0 = o mais rápido possível, 1 = ritmo original)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Imprime cada evento de loot")
+    args = parser.parse_args()
+    
+    if not events_config.load():
+        print("[ERRO] Falha ao carregar configuração de eventos.")
+        sys.exit(1)
+    
+    if not items_service.load():
+        print("[AVISO] Lista de itens não carregada. Alguns itens podem aparecer como 'Unknown'.")
+    
+    loot_events = 0
+    
+    def on_loot(event):
+        nonlocal loot_events
+        loot_events += 1
+        if args.verbose:
+            print(f"{event.looted_by.name} looted {event.quantity}x {event.item_name} from {event.looted_from.name}")
+    
+    data_handler.on_loot(on_loot)
+    
+    sniffer = Sniffer()
+    sniffer.on_event(data_handler.handle_event)
+    sniffer.on_request(data_handler.handle_request)
+    sniffer.on_response(data_handler.handle_response)
+    sniffer.set_event_projections(data_handler.event_projections())
+    
+    print(f"[INFO] Replay de {args.path}")
+    
+    try:
+        stats = sniffer.replay(args.path, speed=args.speed)
+    except (OSError, PcapError) as e:
+        print(f"[ERRO] Falha ao ler captura: {e}")
+        sys.exit(1)
+    
+    print()
+    print(f"[OK] Frames lidos: {stats.frames}")
+    print(f"[OK] Pacotes Albion: {stats.packets} em {stats.duration:.2f}s ({stats.packets_per_second:,.0f} pacotes/s)")
+    print(f"[OK] Eventos de loot: {loot_events}")
+    print(f"[OK] Erros de decodificação: {stats.decode_errors} mensagens, {stats.packet_errors} pacotes")
+
+
+if __name__ == "__main__":
+    main()
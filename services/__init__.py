@@ -1,5 +1,7 @@
 """Services module."""
 
+from .catalog_cache import CatalogCache, cache_directory
+from .item_catalog import ItemCatalog, compile_catalog
 from .items_service import items_service, ItemsService, Item
 from .events_config import events_config, EventsConfigService
 from .tier_service import tier_service, TierService, TierInfo
@@ -8,6 +10,8 @@ from .config_service import config_service, ConfigService, UserConfig
 from .license_service import license_service, LicenseService, LicenseInfo, CURRENT_VERSION
 
 __all__ = [
+    'CatalogCache', 'cache_directory',
+    'ItemCatalog', 'compile_catalog',
     'items_service', 'ItemsService', 'Item',
     'events_config', 'EventsConfigService',
     'tier_service', 'TierService', 'TierInfo',
@@ -0,0 +1,185 @@
+"""
+Catalog Cache - Cache em disco dos catálogos baixados (itens, eventos)
+Guarda o catálogo já processado junto com ETag/Last-Modified da última
+resposta. Dentro de max_age o cache é usado sem rede; depois disso a
+revalidação é um GET condicional (If-None-Match / If-Modified-Since), que
+na maior parte das vezes volta 304 sem corpo.
+
+Cada download grava um arquivo novo (nome com timestamp) e só então troca o
+metadata: um arquivo mapeado por outro processo nunca é sobrescrito, o que
+no Windows falharia.
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+
+# Cache mais novo que isso é usado sem consultar o servidor (segundos)
+CATALOG_MAX_AGE = 6 * 60 * 60
+
+# Muda quando o formato do catálogo processado mudar (invalida caches antigos)
+CACHE_VERSION = 2
+
+
+def _encode_json(payload: Any) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _decode_json(path: str) -> Any:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def cache_directory() -> str:
+    """Diretório de cache do usuário (LOCALAPPDATA no Windows, XDG_CACHE_HOME nos outros)."""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'ao-loot-logger')
+
+
+class CatalogCache:
+    """
+    Catálogo processado em disco + validadores HTTP da URL de origem.
+    
+    encode transforma o catálogo processado nos bytes do arquivo; decode
+    abre o arquivo (por caminho, para permitir mmap). O padrão é JSON.
+    """
+    
+    def __init__(self, name: str, url: str, max_age: float = CATALOG_MAX_AGE,
+                 extension: str = "json",
+                 encode: Callable[[Any], bytes] = _encode_json,
+                 decode: Callable[[str], Any] = _decode_json):
+        self.name = name
+        self.url = url
+        self.max_age = max_age
+        self.extension = extension
+        self._encode = encode
+        self._decode = decode
+        
+        self.directory = cache_directory()
+        self.meta_path = os.path.join(self.directory, f"{name}.meta.json")
+        
+        self._meta: Dict[str, Any] = {}
+    
+    @property
+    def path(self) -> Optional[str]:
+        """Arquivo do catálogo atual (None se ainda não há cache)."""
+        data_file = self._meta.get('file')
+        return os.path.join(self.directory, data_file) if data_file else None
+    
+    @property
+    def fresh(self) -> bool:
+        """Cache carregado e validado há menos de max_age."""
+        fetched_at = self._meta.get('fetched_at')
+        return fetched_at is not None and time.time() - fetched_at < self.max_age
+    
+    def load(self) -> Optional[Any]:
+        """Catálogo do disco, ou None se não houver cache utilizável."""
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') != CACHE_VERSION or meta.get('url') != self.url or not meta.get('file'):
+                return None
+            
+            payload = self._decode(os.path.join(self.directory, meta['file']))
+            
+        except (OSError, ValueError):
+            return None
+        
+        self._meta = meta
+        return payload
+    
+    def revalidate(self, process: Callable[[requests.Response], Any], timeout: float) -> Optional[Any]:
+        """
+        GET condicional. Retorna o catálogo novo ou None se o servidor
+        respondeu 304. Erros de rede sobem para quem chamou.
+        
+        O catálogo novo é reaberto do arquivo gravado (decode), para que o
+        processo use a mesma cópia que os outros; se a gravação falhar, fica
+        o resultado de process.
+        """
+        headers = {}
+        if self._meta.get('etag'):
+            headers['If-None-Match'] = self._meta['etag']
+        if self._meta.get('last_modified'):
+            headers['If-Modified-Since'] = self._meta['last_modified']
+        
+        # stream: process pode ler o corpo em pedaços (iter_content) em vez de tudo de uma vez
+        response = requests.get(self.url, headers=headers, timeout=timeout, stream=True)
+        try:
+            if response.status_code == 304:
+                self._meta['fetched_at'] = time.time()
+                self._write_meta()
+                return None
+            
+            response.raise_for_status()
+            payload = process(response)
+        finally:
+            response.close()
+        
+        if self.save(payload, response.headers.get('ETag'), response.headers.get('Last-Modified')):
+            try:
+                return self._decode(self.path)
+            except (OSError, ValueError):
+                pass
+        return payload
+    
+    def save(self, payload: Any, etag: Optional[str] = None, last_modified: Optional[str] = None) -> bool:
+        """Grava o catálogo processado e os validadores."""
+        data_file = f"{self.name}-{time.time_ns():x}.{self.extension}"
+        meta = {
+            'version': CACHE_VERSION,
+            'url': self.url,
+            'file': data_file,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time()
+        }
+        
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._write_atomic(os.path.join(self.directory, data_file), self._encode(payload))
+        except OSError as e:
+            print(f"[AVISO] Falha ao gravar cache {self.name}: {e}")
+            return False
+        
+        self._meta = meta
+        self._write_meta()
+        self._remove_stale(data_file)
+        return True
+    
+    def _write_meta(self):
+        try:
+            self._write_atomic(self.meta_path, _encode_json(self._meta))
+        except OSError as e:
+            print(f"[AVISO] Falha ao gravar cache {self.name}: {e}")
+    
+    def _remove_stale(self, current: str):
+        """Apaga arquivos de downloads anteriores (os ainda mapeados ficam para a próxima vez)."""
+        prefix, suffix = f"{self.name}-", f".{self.extension}"
+        try:
+            entries = os.listdir(self.directory)
+        except OSError:
+            return
+        
+        for entry in entries:
+            if entry != current and entry.startswith(prefix) and entry.endswith(suffix):
+                try:
+                    os.remove(os.path.join(self.directory, entry))
+                except OSError:
+                    pass
+    
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        # Arquivo temporário + rename: um processo lendo nunca vê o arquivo pela metade
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
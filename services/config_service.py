@@ -18,6 +18,8 @@ class UserConfig:
     language: str = "PT-BR"  # PT-BR ou EN-US
     discord_webhook: str = ""
     discord_enabled: bool = False
+    capture_process: bool = True  # Captura em processo separado (ver core.CaptureProcess)
+    daemon_socket: str = ""  # Socket do main_daemon.py; se definido, a interface só se conecta a ele
 
 
 class ConfigService:
@@ -46,7 +48,9 @@ class ConfigService:
                     self._config = UserConfig(
                         language=data.get('language', 'PT-BR'),
                         discord_webhook=data.get('discord_webhook', ''),
-                        discord_enabled=data.get('discord_enabled', False)
+                        discord_enabled=data.get('discord_enabled', False),
+                        capture_process=data.get('capture_process', True),
+                        daemon_socket=data.get('daemon_socket', '')
                     )
                 print(f"[INFO] Configurações carregadas")
                 return True
@@ -89,6 +93,22 @@ class ConfigService:
     def discord_enabled(self, value: bool):
         self._config.discord_enabled = value
     
+    @property
+    def capture_process(self) -> bool:
+        return self._config.capture_process
+    
+    @capture_process.setter
+    def capture_process(self, value: bool):
+        self._config.capture_process = value
+    
+    @property
+    def daemon_socket(self) -> str:
+        return self._config.daemon_socket
+    
+    @daemon_socket.setter
+    def daemon_socket(self, value: str):
+        self._config.daemon_socket = value.strip()
+    
     def is_webhook_valid(self) -> bool:
         """Verifica se webhook é válido."""
         url = self._config.discord_webhook
@@ -4,8 +4,10 @@ Baseado em config.js
 """
 
 import requests
-from typing import Optional
-from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from dataclasses import dataclass, fields
+
+from .catalog_cache import CatalogCache
 
 
 @dataclass
@@ -31,41 +33,48 @@ class EventsConfigService:
     
     CONFIG_URL = "https://matheus.sampaio.us/ao-loot-logger-configs/events-v9.0.0.json"
     
+    # Timeout do GET condicional quando já existe cache (offline não pode travar a abertura)
+    REVALIDATE_TIMEOUT = 5
+    
     def __init__(self):
         self.events = EventCodes()
         self._loaded = False
+        self._cache = CatalogCache("events", self.CONFIG_URL)
+    
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
     
     def load(self) -> bool:
-        """Carrega configuração de eventos da URL."""
-        try:
-            print("[INFO] Carregando configuração de eventos...")
-            response = requests.get(self.CONFIG_URL, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Mapeia os códigos
-            self.events.EvNewCharacter = data.get("EvNewCharacter", 0)
-            self.events.EvNewEquipmentItem = data.get("EvNewEquipmentItem", 0)
-            self.events.EvNewSiegeBannerItem = data.get("EvNewSiegeBannerItem", 0)
-            self.events.EvNewSimpleItem = data.get("EvNewSimpleItem", 0)
-            self.events.EvNewLoot = data.get("EvNewLoot", 0)
-            self.events.EvAttachItemContainer = data.get("EvAttachItemContainer", 0)
-            self.events.EvDetachItemContainer = data.get("EvDetachItemContainer", 0)
-            self.events.EvCharacterStats = data.get("EvCharacterStats", 0)
-            self.events.EvOtherGrabbedLoot = data.get("EvOtherGrabbedLoot", 0)
-            self.events.EvNewLootChest = data.get("EvNewLootChest", 0)
-            self.events.EvInventoryPutItem = data.get("EvInventoryPutItem", 0)
-            self.events.OpJoin = data.get("OpJoin", 0)
-            self.events.OpInventoryMoveItem = data.get("OpInventoryMoveItem", 0)
-            
-            self._loaded = True
-            print("[INFO] Configuração de eventos carregada!")
-            return True
-            
-        except Exception as e:
-            print(f"[ERRO] Falha ao carregar configuração: {e}")
-            return False
+        """Carrega configuração de eventos (cache em disco, revalidado com GET condicional)."""
+        print("[INFO] Carregando configuração de eventos...")
+        codes = self._cache.load()
+        
+        # As projeções do decoder são montadas com estes códigos na abertura,
+        # então um cache vencido é revalidado aqui mesmo (arquivo pequeno, 304 quase sempre)
+        if codes is None or not self._cache.fresh:
+            try:
+                timeout = 30 if codes is None else self.REVALIDATE_TIMEOUT
+                codes = self._cache.revalidate(self._parse, timeout=timeout) or codes
+            except Exception as e:
+                if codes is None:
+                    print(f"[ERRO] Falha ao carregar configuração: {e}")
+                    return False
+                print(f"[AVISO] Falha ao revalidar configuração (usando cache): {e}")
+        
+        # Mapeia os códigos
+        for name, code in codes.items():
+            setattr(self.events, name, code)
+        
+        self._loaded = True
+        print("[INFO] Configuração de eventos carregada!")
+        return True
+    
+    @staticmethod
+    def _parse(response: requests.Response) -> Dict[str, Any]:
+        """Só os códigos conhecidos por EventCodes (é o que vai para o cache)."""
+        data = response.json()
+        return {field.name: data.get(field.name, 0) for field in fields(EventCodes)}
 
 
 # Instância global
@@ -0,0 +1,226 @@
+"""
+Item Catalog - Catálogo de itens compilado em formato binário
+O arquivo é mapeado em memória somente leitura, então vários processos
+(GUI, processo de captura, workers de decode) compartilham as mesmas páginas
+em vez de cada um montar o próprio dict de Items.
+
+Layout (little-endian):
+    cabeçalho   magic, versão, nº de idiomas, nº de slots, nº de itens, tamanho do blob
+    idiomas     nº de idiomas x 8 bytes (ASCII, completado com zeros)
+    registros   um por item_num_id (slot vazio = UniqueName de tamanho 0):
+                UniqueName, categoria e um nome por idioma como (offset, tamanho)
+                no blob, seguidos de tier e encantamento
+    blob        strings UTF-8 sem repetição
+"""
+
+import mmap
+import re
+import struct
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils import intern_str
+from .tier_service import tier_service
+
+
+MAGIC = b"AOIC"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIII")
+_LOCALE = struct.Struct("<8s")
+
+# UniqueName sem tier, nível de recurso e encantamento (T4_ORE_LEVEL1@1 -> ORE)
+CATEGORY_PATTERN = re.compile(r'^(?:T\d+_)?(.*?)(?:_LEVEL\d+)?(?:@\d+)?$')
+
+# (item_num_id, UniqueName, {idioma: nome})
+CatalogRow = Tuple[int, str, Dict[str, str]]
+
+
+@dataclass
+class Item:
+    """Representa um item do Albion."""
+    item_num_id: int        # Index numérico
+    item_id: str            # UniqueName (ex: T8_2H_BOW_AVALON@1)
+    names: Dict[str, str]   # Nomes por idioma {"PT-BR": "...", "EN-US": "..."}
+    tier: int = 0
+    enchant: int = 0
+    category: str = ""      # UniqueName sem tier/encantamento (ex: 2H_BOW_AVALON)
+    
+    def get_name(self, locale: str = "PT-BR") -> str:
+        """Retorna nome no idioma especificado."""
+        return self.names.get(locale) or self.names.get("EN-US") or self.item_id
+
+
+def _record_struct(locale_count: int) -> struct.Struct:
+    # UniqueName, categoria, nomes: (offset u32, tamanho u16); tier e encantamento: u8
+    return struct.Struct("<" + "IH" * (2 + locale_count) + "BB")
+
+
+def item_category(item_id: str) -> str:
+    """Categoria do item (UniqueName sem tier/encantamento)."""
+    match = CATEGORY_PATTERN.match(item_id)
+    return match.group(1) if match else item_id
+
+
+def compile_catalog(rows: Iterable[CatalogRow], locales: Sequence[str]) -> bytes:
+    """Compila as linhas do catálogo no formato binário."""
+    record = _record_struct(len(locales))
+    blob = bytearray()
+    offsets: Dict[str, Tuple[int, int]] = {}
+    
+    def put(text: str) -> Tuple[int, int]:
+        if not text:
+            return 0, 0
+        location = offsets.get(text)
+        if location is None:
+            data = text.encode('utf-8')
+            location = offsets[text] = (len(blob), len(data))
+            blob.extend(data)
+        return location
+    
+    entries: Dict[int, tuple] = {}
+    for item_num_id, item_id, names in rows:
+        if item_num_id < 0 or not item_id:
+            continue
+        
+        info = tier_service.parse_tier(item_id)
+        fields: List[int] = [*put(item_id), *put(item_category(item_id))]
+        for locale in locales:
+            fields.extend(put(names.get(locale, "")))
+        fields.append(info.tier if info else 0)
+        fields.append(info.enchant if info else 0)
+        entries[item_num_id] = tuple(fields)
+    
+    slot_count = max(entries) + 1 if entries else 0
+    records = bytearray(slot_count * record.size)
+    for item_num_id, fields in entries.items():
+        record.pack_into(records, item_num_id * record.size, *fields)
+    
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(locales), slot_count, len(entries), len(blob))
+    locale_table = b"".join(_LOCALE.pack(locale.encode('ascii')) for locale in locales)
+    return header + locale_table + bytes(records) + bytes(blob)
+
+
+class ItemCatalog:
+    """Catálogo compilado (bytes ou arquivo mapeado), consultado por item_num_id."""
+    
+    def __init__(self, buffer, path: Optional[str] = None):
+        self._buffer = buffer
+        self.path = path
+        
+        magic, version, locale_count, slot_count, count, blob_size = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Catálogo de itens com formato desconhecido")
+        
+        self.locales = tuple(
+            _LOCALE.unpack_from(buffer, _HEADER.size + index * _LOCALE.size)[0].rstrip(b"\0").decode('ascii')
+            for index in range(locale_count)
+        )
+        self._locale_index = {locale: index for index, locale in enumerate(self.locales)}
+        self._record = _record_struct(locale_count)
+        self._records_offset = _HEADER.size + locale_count * _LOCALE.size
+        self._blob_offset = self._records_offset + slot_count * self._record.size
+        self._slot_count = slot_count
+        self._count = count
+        
+        if self._blob_offset + blob_size > len(buffer):
+            raise ValueError("Catálogo de itens truncado")
+    
+    @classmethod
+    def open(cls, path: str) -> 'ItemCatalog':
+        """Mapeia o arquivo compilado (somente leitura)."""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped, path)
+        except (ValueError, struct.error):
+            mapped.close()
+            raise ValueError(f"Catálogo de itens inválido: {path}")
+    
+    @classmethod
+    def from_rows(cls, rows: Iterable[CatalogRow], locales: Sequence[str]) -> 'ItemCatalog':
+        """Catálogo em memória (sem arquivo)."""
+        return cls(compile_catalog(rows, locales))
+    
+    def to_bytes(self) -> bytes:
+        """Conteúdo do arquivo compilado."""
+        return bytes(self._buffer)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __contains__(self, item_num_id: int) -> bool:
+        return self._fields(item_num_id) is not None
+    
+    def __reduce__(self):
+        # Outros processos mapeiam o mesmo arquivo em vez de receber uma cópia
+        if self.path is not None:
+            return ItemCatalog.open, (self.path,)
+        return ItemCatalog, (self.to_bytes(),)
+    
+    def _fields(self, item_num_id: int) -> Optional[tuple]:
+        if not isinstance(item_num_id, int) or not 0 <= item_num_id < self._slot_count:
+            return None
+        fields = self._record.unpack_from(self._buffer, self._records_offset + item_num_id * self._record.size)
+        return fields if fields[1] else None
+    
+    def _text(self, offset: int, length: int) -> str:
+        start = self._blob_offset + offset
+        return self._buffer[start:start + length].decode('utf-8')
+    
+    def get(self, item_num_id: int) -> Optional[Item]:
+        """Item completo (todos os idiomas do catálogo)."""
+        fields = self._fields(item_num_id)
+        if fields is None:
+            return None
+        
+        names = {}
+        for index, locale in enumerate(self.locales):
+            offset, length = fields[4 + index * 2], fields[5 + index * 2]
+            if length:
+                names[locale] = self._text(offset, length)
+        
+        item_id = intern_str(self._text(fields[0], fields[1]))
+        if not names:
+            names["EN-US"] = item_id
+        
+        return Item(
+            item_num_id=item_num_id,
+            item_id=item_id,
+            names=names,
+            tier=fields[-2],
+            enchant=fields[-1],
+            category=self._text(fields[2], fields[3])
+        )
+    
+    def item_id(self, item_num_id: int) -> Optional[str]:
+        fields = self._fields(item_num_id)
+        return intern_str(self._text(fields[0], fields[1])) if fields else None
+    
+    def get_name(self, item_num_id: int, locale: str) -> Optional[str]:
+        """Nome no idioma pedido, com fallback para EN-US e depois UniqueName."""
+        fields = self._fields(item_num_id)
+        if fields is None:
+            return None
+        
+        for candidate in (locale, "EN-US"):
+            index = self._locale_index.get(candidate)
+            if index is not None and fields[5 + index * 2]:
+                return self._text(fields[4 + index * 2], fields[5 + index * 2])
+        return self._text(fields[0], fields[1])
+    
+    def tier(self, item_num_id: int) -> int:
+        fields = self._fields(item_num_id)
+        return fields[-2] if fields else 0
+    
+    def enchant(self, item_num_id: int) -> int:
+        fields = self._fields(item_num_id)
+        return fields[-1] if fields else 0
+    
+    def category(self, item_num_id: int) -> str:
+        fields = self._fields(item_num_id)
+        return self._text(fields[2], fields[3]) if fields else ""
+    
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
@@ -2,23 +2,16 @@
 Items Service - Carrega e gerencia lista de itens do Albion
 Baseado em items.js - usa items.json com fallback para items.txt
 Suporta múltiplos idiomas (PT-BR, EN-US)
+A lista fica em um catálogo compilado (item_catalog), mapeado do cache em disco.
 """
 
+import threading
 import requests
-from typing import Optional, Dict
-from dataclasses import dataclass
+from typing import Callable, Optional, Iterable, Iterator, List
 
-
-@dataclass
-class Item:
-    """Representa um item do Albion."""
-    item_num_id: int        # Index numérico
-    item_id: str            # UniqueName (ex: T8_2H_BOW_AVALON@1)
-    names: Dict[str, str]   # Nomes por idioma {"PT-BR": "...", "EN-US": "..."}
-    
-    def get_name(self, locale: str = "PT-BR") -> str:
-        """Retorna nome no idioma especificado."""
-        return self.names.get(locale) or self.names.get("EN-US") or self.item_id
+from utils import iter_json_array
+from .catalog_cache import CatalogCache
+from .item_catalog import Item, ItemCatalog, CatalogRow
 
 
 class ItemsService:
@@ -31,10 +24,27 @@ class ItemsService:
     # Idiomas suportados
     SUPPORTED_LOCALES = ["PT-BR", "EN-US"]
     
+    # Pedaços lidos do items.json (o arquivo inteiro nunca fica em memória)
+    JSON_CHUNK_SIZE = 64 * 1024
+    
     def __init__(self):
-        self.items: Dict[int, Item] = {}
+        self.items = ItemCatalog.from_rows([], self.SUPPORTED_LOCALES)
         self._loaded = False
+        self._load_failed = False
         self._current_locale = "PT-BR"
+        self._cache = CatalogCache("items", self.ITEMS_JSON_URL, extension="bin",
+                                   encode=ItemCatalog.to_bytes, decode=ItemCatalog.open)
+        self._on_loaded_callbacks: List[Callable[[], None]] = []
+        self._on_load_failed_callbacks: List[Callable[[], None]] = []
+    
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+    
+    @property
+    def load_failed(self) -> bool:
+        """Nenhuma fonte (cache, JSON, TXT) funcionou: o catálogo não vai chegar."""
+        return self._load_failed
     
     @property
     def locale(self) -> str:
@@ -45,64 +55,55 @@ class ItemsService:
         if value in self.SUPPORTED_LOCALES:
             self._current_locale = value
     
+    def on_loaded(self, callback: Callable[[], None]):
+        """Registra callback chamado sempre que um catálogo fica pronto (na thread que carregou)."""
+        if callback not in self._on_loaded_callbacks:
+            self._on_loaded_callbacks.append(callback)
+    
+    def on_load_failed(self, callback: Callable[[], None]):
+        """Registra callback chamado quando o carregamento falha de vez."""
+        if callback not in self._on_load_failed_callbacks:
+            self._on_load_failed_callbacks.append(callback)
+    
     def init(self) -> bool:
         """Inicializa carregando a lista de itens."""
         return self.load()
     
     def load(self) -> bool:
-        """Carrega a lista de itens."""
+        """Carrega a lista de itens (cache em disco primeiro, depois rede)."""
+        catalog = self._cache.load()
+        if catalog is not None:
+            self.set_catalog(catalog)
+            print(f"[INFO] {len(self.items)} itens carregados do cache!")
+            
+            # Cache antigo continua valendo; a revalidação roda em segundo plano
+            if not self._cache.fresh:
+                threading.Thread(target=self._revalidate, daemon=True).start()
+            return True
+        
         # Tenta JSON primeiro
         if self._load_json():
             return True
         
         # Fallback para TXT
         print("[INFO] Tentando fallback para items.txt...")
-        return self._load_txt()
+        if self._load_txt():
+            return True
+        
+        self.set_load_failed()
+        return False
+    
+    def load_async(self) -> threading.Thread:
+        """Carrega em segundo plano; itens vistos antes disso ficam pendentes (ver pending_items)."""
+        thread = threading.Thread(target=self.load, name="items-load", daemon=True)
+        thread.start()
+        return thread
     
     def _load_json(self) -> bool:
-        """Carrega itens do JSON."""
+        """Carrega itens do JSON (e grava o cache)."""
         try:
             print("[INFO] Carregando lista de itens...")
-            response = requests.get(self.ITEMS_JSON_URL, timeout=60)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            for item_data in data:
-                try:
-                    # Index pode ser string ou int
-                    index = item_data.get("Index")
-                    if index is None:
-                        continue
-                    item_num_id = int(index)
-                    
-                    # UniqueName
-                    item_id = item_data.get("UniqueName", "")
-                    if not item_id:
-                        continue
-                    
-                    # LocalizedNames - pega todos os idiomas
-                    localized = item_data.get("LocalizedNames") or {}
-                    names = {}
-                    
-                    for locale in self.SUPPORTED_LOCALES:
-                        name = localized.get(locale, "")
-                        if name:
-                            names[locale] = name
-                    
-                    # Se não tem nenhum nome, usa item_id
-                    if not names:
-                        names["EN-US"] = item_id
-                    
-                    self.items[item_num_id] = Item(
-                        item_num_id=item_num_id,
-                        item_id=item_id,
-                        names=names
-                    )
-                except:
-                    continue
-            
-            self._loaded = True
+            self.set_catalog(self._cache.revalidate(self._parse_json, timeout=60))
             print(f"[INFO] {len(self.items)} itens carregados!")
             return True
             
@@ -110,6 +111,82 @@ class ItemsService:
             print(f"[AVISO] Falha ao carregar JSON: {e}")
             return False
     
+    def _revalidate(self):
+        """GET condicional do items.json; troca a lista se ela mudou."""
+        try:
+            catalog = self._cache.revalidate(self._parse_json, timeout=60)
+        except Exception as e:
+            print(f"[AVISO] Falha ao revalidar lista de itens (usando cache): {e}")
+            return
+        
+        if catalog is None:
+            print("[INFO] Lista de itens em cache está atualizada")
+            return
+        
+        self.set_catalog(catalog)
+        print(f"[INFO] Lista de itens atualizada: {len(self.items)} itens")
+    
+    def _parse_json(self, response: requests.Response) -> ItemCatalog:
+        """Compila o items.json no catálogo binário, um item por vez."""
+        elements = iter_json_array(response.iter_content(chunk_size=self.JSON_CHUNK_SIZE))
+        return ItemCatalog.from_rows(self._json_rows(elements), self.SUPPORTED_LOCALES)
+    
+    def _json_rows(self, elements: Iterable[dict]) -> Iterator[CatalogRow]:
+        """Index, UniqueName e nomes nos idiomas suportados de cada item."""
+        for item_data in elements:
+            try:
+                # Index pode ser string ou int
+                index = item_data.get("Index")
+                if index is None:
+                    continue
+                item_num_id = int(index)
+                
+                # UniqueName
+                item_id = item_data.get("UniqueName", "")
+                if not item_id:
+                    continue
+                
+                # LocalizedNames - pega todos os idiomas
+                localized = item_data.get("LocalizedNames") or {}
+                names = {}
+                
+                for locale in self.SUPPORTED_LOCALES:
+                    name = localized.get(locale, "")
+                    if name:
+                        names[locale] = name
+                
+                # Se não tem nenhum nome, usa item_id
+                if not names:
+                    names["EN-US"] = item_id
+                
+                yield item_num_id, item_id, names
+            except:
+                continue
+    
+    def set_catalog(self, catalog: ItemCatalog):
+        """Troca o catálogo de uma vez (leitores nunca veem a lista pela metade)."""
+        self.items = catalog
+        self._loaded = True
+        self._load_failed = False
+        
+        for callback in self._on_loaded_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[ERRO] Callback de itens carregados falhou: {e}")
+    
+    def set_load_failed(self):
+        """Marca o carregamento como falho (sem catálogo) e avisa quem espera por ele."""
+        if self._loaded:
+            return
+        self._load_failed = True
+        
+        for callback in self._on_load_failed_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[ERRO] Callback de falha da lista de itens falhou: {e}")
+    
     def _load_txt(self) -> bool:
         """Carrega itens do TXT (formato: index:itemId:itemName)."""
         try:
@@ -118,6 +195,7 @@ class ItemsService:
             response.raise_for_status()
             
             data = response.text
+            rows = []
             
             for line in data.strip().split('\n'):
                 try:
@@ -129,15 +207,11 @@ class ItemsService:
                     item_id = parts[1].strip()
                     item_name = parts[2].strip() if len(parts) > 2 else item_id
                     
-                    self.items[item_num_id] = Item(
-                        item_num_id=item_num_id,
-                        item_id=item_id,
-                        names={"EN-US": item_name, "PT-BR": item_name}
-                    )
+                    rows.append((item_num_id, item_id, {"EN-US": item_name, "PT-BR": item_name}))
                 except:
                     continue
             
-            self._loaded = True
+            self.set_catalog(ItemCatalog.from_rows(rows, self.SUPPORTED_LOCALES))
             print(f"[INFO] {len(self.items)} itens carregados!")
             return True
             
@@ -151,9 +225,9 @@ class ItemsService:
     
     def get_name(self, item_num_id: int, locale: str = None) -> str:
         """Retorna nome do item no idioma atual."""
-        item = self.get(item_num_id)
-        if item:
-            return item.get_name(locale or self._current_locale)
+        name = self.items.get_name(item_num_id, locale or self._current_locale)
+        if name is not None:
+            return name
         return f"Unknown ({item_num_id})"
 
 
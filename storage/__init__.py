@@ -1,6 +1,6 @@
 """Storage module."""
 
-from .memory_storage import storage, MemoryStorage
+from .memory_storage import storage, MemoryStorage, EvictionPolicy, StorageStats, StoreStats
 from .players_storage import PlayersStorage, Player
 from .loots_storage import LootsStorage, Loot
 from .containers_storage import ContainersStorage, Container
@@ -8,6 +8,9 @@ from .containers_storage import ContainersStorage, Container
 __all__ = [
     'storage',
     'MemoryStorage',
+    'EvictionPolicy',
+    'StorageStats',
+    'StoreStats',
     'PlayersStorage',
     'Player',
     'LootsStorage',
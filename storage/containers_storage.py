@@ -3,61 +3,142 @@ Containers Storage - Armazena containers (loot bags, chests)
 Baseado em containers-storage.js
 """
 
-from typing import Optional, Dict, Any
+import time
+from typing import Callable, Optional, Dict, Any
 from dataclasses import dataclass, field
 
+from utils import intern_str, uuid_stringify
 
-@dataclass
+from .recency_index import RecencyIndex
+
+
+@dataclass(slots=True)
 class Container:
     """Representa um container (loot bag, chest)."""
     id: int
-    uuid: Optional[str] = None
+    uuid: Optional[bytes] = None  # 16 bytes crus, como vêm do Protocol16
     type: Optional[str] = None  # 'monster', 'player', 'chest'
     owner: Optional[str] = None
     items: Dict[int, Any] = field(default_factory=dict)  # position -> Loot
+    
+    @property
+    def uuid_str(self) -> Optional[str]:
+        """UUID formatado (só para exibição/log)."""
+        return uuid_stringify(self.uuid) if self.uuid is not None else None
 
 
 class ContainersStorage:
-    """Armazena containers detectados."""
+    """Armazena containers detectados (indexados por id e por uuid)."""
     
-    def __init__(self):
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
         self.containers: Dict[int, Container] = {}
+        self._by_uuid: Dict[bytes, Container] = {}
+        self._recency = RecencyIndex(clock)
+        
+        # Contadores de remoção (TTL, limite LRU, troca de zona)
+        self.evicted_ttl = 0
+        self.evicted_lru = 0
+        self.evicted_zone = 0
+    
+    def __len__(self) -> int:
+        return len(self.containers)
     
-    def add(self, id: int, uuid: str = None, type: str = None, owner: str = None) -> Container:
-        """Adiciona um container."""
+    def add(self, id: int, uuid: bytes = None, type: str = None, owner: str = None) -> Container:
+        """Adiciona um container (substitui o que já tinha o mesmo id ou uuid)."""
         container = Container(
             id=id,
             uuid=uuid,
             type=type,
-            owner=owner,
+            owner=intern_str(owner),
             items={}
         )
+        self.delete_by_id(id)
+        if uuid is not None:
+            self.delete_by_uuid(uuid)
+        
         self.containers[id] = container
+        if uuid is not None:
+            self._by_uuid[uuid] = container
+        self._recency.touch(id)
         return container
     
     def get_by_id(self, id: int) -> Optional[Container]:
         """Busca container pelo id."""
-        return self.containers.get(id)
+        container = self.containers.get(id)
+        if container is not None:
+            self._recency.touch(id)
+        return container
     
-    def get_by_uuid(self, uuid: str) -> Optional[Container]:
+    def get_by_uuid(self, uuid: bytes) -> Optional[Container]:
         """Busca container pelo uuid."""
-        for container in self.containers.values():
-            if container.uuid == uuid:
-                return container
-        return None
+        container = self._by_uuid.get(uuid)
+        if container is not None:
+            self._recency.touch(container.id)
+        return container
+    
+    def set_id(self, container: Container, id: int):
+        """Troca o id de um container mantendo o índice consistente."""
+        if container.id == id:
+            return
+        
+        # Outro container com o mesmo id é substituído
+        other = self.containers.get(id)
+        if other is not None and other is not container:
+            self._remove(other)
+        
+        if self.containers.get(container.id) is container:
+            del self.containers[container.id]
+        self._recency.rename(container.id, id)
+        container.id = id
+        self.containers[id] = container
+    
+    def set_uuid(self, container: Container, uuid: bytes):
+        """Troca o uuid de um container mantendo o índice consistente."""
+        if container.uuid == uuid:
+            return
+        
+        other = self._by_uuid.get(uuid)
+        if other is not None and other is not container:
+            self._remove(other)
+        
+        if container.uuid is not None and self._by_uuid.get(container.uuid) is container:
+            del self._by_uuid[container.uuid]
+        container.uuid = uuid
+        self._by_uuid[uuid] = container
     
-    def delete_by_id(self, id: int):
+    def delete_by_id(self, id: int) -> Optional[Container]:
         """Remove container pelo id."""
-        if id in self.containers:
-            del self.containers[id]
+        container = self.containers.get(id)
+        if container:
+            self._remove(container)
+        return container
     
-    def delete_by_uuid(self, uuid: str) -> Optional[Container]:
+    def delete_by_uuid(self, uuid: bytes) -> Optional[Container]:
         """Remove container pelo uuid."""
-        container = self.get_by_uuid(uuid)
+        container = self._by_uuid.get(uuid)
         if container:
-            del self.containers[container.id]
+            self._remove(container)
         return container
     
+    def _remove(self, container: Container):
+        if self.containers.get(container.id) is container:
+            del self.containers[container.id]
+            self._recency.discard(container.id)
+        if container.uuid is not None and self._by_uuid.get(container.uuid) is container:
+            del self._by_uuid[container.uuid]
+    
+    def evict(self, now: float, ttl: float, max_size: int) -> int:
+        """Remove containers expirados e os menos usados acima do limite."""
+        expired, excess = self._recency.victims(now, ttl, max_size)
+        for id in expired + excess:
+            self.delete_by_id(id)
+        
+        self.evicted_ttl += len(expired)
+        self.evicted_lru += len(excess)
+        return len(expired) + len(excess)
+    
     def clear(self):
         """Limpa todos os containers."""
         self.containers.clear()
+        self._by_uuid.clear()
+        self._recency.clear()
@@ -3,11 +3,16 @@ Loots Storage - Armazena itens de loot detectados
 Baseado em loots-storage.js
 """
 
-from typing import Optional, Dict
+import time
+from typing import Callable, Optional, Dict
 from dataclasses import dataclass
 
+from utils import intern_str
 
-@dataclass
+from .recency_index import RecencyIndex
+
+
+@dataclass(slots=True)
 class Loot:
     """Representa um item de loot."""
     object_id: int
@@ -20,30 +25,56 @@ class Loot:
 class LootsStorage:
     """Armazena loots detectados."""
     
-    def __init__(self):
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
         self.loots: Dict[int, Loot] = {}
+        self._recency = RecencyIndex(clock)
+        
+        # Contadores de remoção (TTL, limite LRU, troca de zona)
+        self.evicted_ttl = 0
+        self.evicted_lru = 0
+        self.evicted_zone = 0
+    
+    def __len__(self) -> int:
+        return len(self.loots)
     
     def add(self, object_id: int, item_id: str, item_name: str, quantity: int, owner: str = None) -> Loot:
         """Adiciona um loot."""
         loot = Loot(
             object_id=object_id,
-            item_id=item_id,
+            item_id=intern_str(item_id),
             item_name=item_name,
             quantity=quantity,
-            owner=owner
+            owner=intern_str(owner)
         )
         self.loots[object_id] = loot
+        self._recency.touch(object_id)
         return loot
     
     def get_by_id(self, object_id: int) -> Optional[Loot]:
         """Busca loot pelo objectId."""
-        return self.loots.get(object_id)
+        loot = self.loots.get(object_id)
+        if loot is not None:
+            self._recency.touch(object_id)
+        return loot
     
     def delete_by_id(self, object_id: int):
         """Remove loot pelo objectId."""
         if object_id in self.loots:
             del self.loots[object_id]
+            self._recency.discard(object_id)
+    
+    def evict(self, now: float, ttl: float, max_size: int,
+              protected: Optional[Callable[[int], bool]] = None) -> int:
+        """Remove loots expirados e os menos usados acima do limite."""
+        expired, excess = self._recency.victims(now, ttl, max_size, protected)
+        for object_id in expired + excess:
+            self.delete_by_id(object_id)
+        
+        self.evicted_ttl += len(expired)
+        self.evicted_lru += len(excess)
+        return len(expired) + len(excess)
     
     def clear(self):
         """Limpa todos os loots."""
         self.loots.clear()
+        self._recency.clear()
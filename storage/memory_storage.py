@@ -1,26 +1,201 @@
 """
 Memory Storage - Storage central em memória
 Baseado em memory-storage.js
+
+Loots e containers são guardados por conexão (ver select_zone): objectIds só
+valem na zona de cada cliente, então com multibox a troca de zona de um
+cliente não descarta o que os outros estão vendo.
 """
 
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Hashable, Optional
+
 from .players_storage import PlayersStorage
 from .loots_storage import LootsStorage
 from .containers_storage import ContainersStorage
 
 
+# Intervalo mínimo entre passadas de remoção (segundos)
+EVICTION_INTERVAL = 1.0
+
+
+@dataclass
+class EvictionPolicy:
+    """TTL (segundos desde o último acesso) e limite de entradas por storage; 0 desativa."""
+    loot_ttl: float = 30 * 60
+    loot_max: int = 20000
+    container_ttl: float = 30 * 60
+    container_max: int = 5000
+    player_ttl: float = 4 * 60 * 60
+    player_max: int = 10000
+
+
+@dataclass
+class StoreStats:
+    """Ocupação e remoções de um storage."""
+    size: int = 0
+    evicted_ttl: int = 0
+    evicted_lru: int = 0
+    evicted_zone: int = 0
+
+
+@dataclass
+class StorageStats:
+    """Contadores do MemoryStorage."""
+    loots: StoreStats
+    containers: StoreStats
+    players: StoreStats
+    zone_changes: int = 0
+
+
+class ZoneState:
+    """Loots e containers vistos por uma conexão (cliente) na zona atual dela."""
+    
+    def __init__(self, clock: Callable[[], float]):
+        self.loots = LootsStorage(clock)
+        self.containers = ContainersStorage(clock)
+    
+    def __len__(self) -> int:
+        return len(self.loots) + len(self.containers)
+
+
+def _add_store_stats(total: StoreStats, store):
+    total.size += len(store)
+    total.evicted_ttl += store.evicted_ttl
+    total.evicted_lru += store.evicted_lru
+    total.evicted_zone += store.evicted_zone
+
+
 class MemoryStorage:
-    """Storage central em memória."""
+    """
+    Storage central em memória.
+    
+    loots e containers apontam para os da conexão selecionada por
+    select_zone (o DataHandler seleciona a conexão de cada mensagem antes
+    de chamar os handlers). Jogadores são compartilhados: nome/guild valem
+    para todos os clientes.
+    """
+    
+    def __init__(self, policy: Optional[EvictionPolicy] = None, clock: Callable[[], float] = time.monotonic):
+        self.players = PlayersStorage(clock)
+        
+        self.policy = policy or EvictionPolicy()
+        self.zone_changes = 0
+        self._clock = clock
+        self._last_eviction = 0.0
+        
+        # Estado por conexão (None = mensagens sem conexão, ex: uso direto do storage)
+        self._zones: Dict[Optional[Hashable], ZoneState] = {}
+        self._retired_loots = StoreStats()
+        self._retired_containers = StoreStats()
+        self.zone_key: Optional[Hashable] = None
+        self.loots: LootsStorage
+        self.containers: ContainersStorage
+        self._select(None)
+    
+    def _select(self, key: Optional[Hashable]):
+        zone = self._zones.get(key)
+        if zone is None:
+            zone = self._zones[key] = ZoneState(self._clock)
+        self.zone_key = key
+        self.loots = zone.loots
+        self.containers = zone.containers
+    
+    def select_zone(self, key: Optional[Hashable]):
+        """Passa a usar os loots/containers da conexão key."""
+        if key != self.zone_key:
+            self._select(key)
+    
+    def change_zone(self):
+        """
+        Troca de zona (OpJoin) da conexão selecionada: objectIds de itens e
+        containers só valem dentro da zona, então os loots e containers dessa
+        conexão são descartados. Os de outras conexões (multibox) continuam.
+        
+        O índice de objectId dos jogadores é compartilhado entre conexões e
+        só é limpo quando não há outra conexão com estado (um único cliente);
+        com multibox as entradas antigas são sobrescritas pelos novos ids.
+        """
+        loots, containers = self.loots, self.containers
+        loots.evicted_zone += len(loots)
+        containers.evicted_zone += len(containers)
+        loots.clear()
+        containers.clear()
+        
+        if not any(len(zone) for key, zone in list(self._zones.items()) if key != self.zone_key):
+            self.players.clear_object_ids()
+        self.zone_changes += 1
+    
+    def maintain(self):
+        """Aplica TTL e limites (no máximo uma vez por EVICTION_INTERVAL)."""
+        now = self._clock()
+        if now - self._last_eviction < EVICTION_INTERVAL:
+            return
+        self._last_eviction = now
+        
+        policy = self.policy
+        
+        for key, zone in list(self._zones.items()):
+            self._evict_zone(zone, now)
+            
+            # Conexões que acabaram (cliente fechado, servidor trocado) somem quando esvaziam
+            if not len(zone) and key != self.zone_key:
+                self._retire(key)
+        
+        self.players.evict(now, policy.player_ttl, policy.player_max)
+    
+    def _retire(self, key: Optional[Hashable]):
+        """Remove o estado da conexão guardando os contadores de remoção."""
+        zone = self._zones.pop(key)
+        _add_store_stats(self._retired_loots, zone.loots)
+        _add_store_stats(self._retired_containers, zone.containers)
+        self._retired_loots.size = self._retired_containers.size = 0
+    
+    def _evict_zone(self, zone: ZoneState, now: float):
+        policy = self.policy
+        
+        # Containers primeiro: itens de um container removido deixam de estar protegidos
+        zone.containers.evict(now, policy.container_ttl, policy.container_max)
+        
+        # Itens dentro de containers abertos não saem, mesmo sem acesso recente.
+        # O conjunto só é montado se algum item for candidato à remoção
+        referenced = None
+        
+        def is_referenced(object_id: int) -> bool:
+            nonlocal referenced
+            if referenced is None:
+                referenced = {
+                    loot.object_id
+                    for container in zone.containers.containers.values()
+                    for loot in container.items.values()
+                }
+            return object_id in referenced
+        
+        zone.loots.evict(now, policy.loot_ttl, policy.loot_max, is_referenced)
     
-    def __init__(self):
-        self.players = PlayersStorage()
-        self.loots = LootsStorage()
-        self.containers = ContainersStorage()
+    def stats(self) -> StorageStats:
+        """Ocupação e remoções de cada storage (somando todas as conexões)."""
+        loots = replace(self._retired_loots)
+        containers = replace(self._retired_containers)
+        for zone in list(self._zones.values()):
+            _add_store_stats(loots, zone.loots)
+            _add_store_stats(containers, zone.containers)
+        
+        players = self.players
+        return StorageStats(
+            loots=loots,
+            containers=containers,
+            players=StoreStats(len(players), players.evicted_ttl, players.evicted_lru),
+            zone_changes=self.zone_changes
+        )
     
     def clear(self):
         """Limpa todos os storages."""
         self.players.clear()
-        self.loots.clear()
-        self.containers.clear()
+        for key in list(self._zones):
+            self._retire(key)
+        self._select(None)
 
 
 # Instância global
@@ -3,13 +3,18 @@ Players Storage - Armazena informações dos jogadores
 Baseado em players-storage.js
 """
 
-from typing import Optional, Dict
-from dataclasses import dataclass, field
+import time
+from typing import Callable, Optional, Dict
+from dataclasses import dataclass
 
+from utils import intern_str
 
-@dataclass
+from .recency_index import RecencyIndex
+
+
+@dataclass(frozen=True, slots=True)
 class Player:
-    """Representa um jogador."""
+    """Representa um jogador (imutável: LootEvents antigos mantêm a guild da época)."""
     name: str
     guild: str = ""
     alliance: str = ""
@@ -26,25 +31,69 @@ class Player:
 
 
 class PlayersStorage:
-    """Armazena jogadores detectados."""
+    """Armazena jogadores detectados (indexados por nome e por objectId)."""
     
-    def __init__(self):
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
         self.players: Dict[str, Player] = {}
         self.self_player: Optional[Player] = None
+        self._recency = RecencyIndex(clock)
+        
+        # objectId da entidade na zona atual <-> nome (o Player é trocado no update)
+        self._name_by_object_id: Dict[int, str] = {}
+        self._object_id_by_name: Dict[str, int] = {}
+        
+        # Contadores de remoção (TTL, limite LRU)
+        self.evicted_ttl = 0
+        self.evicted_lru = 0
+    
+    def __len__(self) -> int:
+        return len(self.players)
     
     def add(self, player_name: str, guild_name: str = "", alliance_name: str = "") -> Player:
         """Adiciona um jogador."""
         player = Player(
-            name=player_name,
-            guild=guild_name or "",
-            alliance=alliance_name or ""
+            name=intern_str(player_name),
+            guild=intern_str(guild_name) or "",
+            alliance=intern_str(alliance_name) or ""
         )
-        self.players[player_name] = player
+        self.players[player.name] = player
+        self._recency.touch(player.name)
         return player
     
     def get_by_name(self, player_name: str) -> Optional[Player]:
         """Busca jogador pelo nome."""
-        return self.players.get(player_name)
+        player = self.players.get(player_name)
+        if player is not None:
+            self._recency.touch(player_name)
+        return player
+    
+    def get_by_object_id(self, object_id: int) -> Optional[Player]:
+        """Busca jogador pelo objectId da entidade."""
+        player_name = self._name_by_object_id.get(object_id)
+        if player_name is None:
+            return None
+        return self.get_by_name(player_name)
+    
+    def set_object_id(self, player_name: str, object_id: int):
+        """Associa o objectId atual do personagem ao jogador."""
+        previous = self._object_id_by_name.get(player_name)
+        if previous == object_id:
+            return
+        
+        # Cada lado aponta para um só: id antigo do jogador e dono antigo do id saem
+        if previous is not None:
+            del self._name_by_object_id[previous]
+        previous_name = self._name_by_object_id.get(object_id)
+        if previous_name is not None:
+            del self._object_id_by_name[previous_name]
+        
+        self._name_by_object_id[object_id] = player_name
+        self._object_id_by_name[player_name] = object_id
+    
+    def clear_object_ids(self):
+        """Esquece os objectIds (valem só dentro da zona)."""
+        self._name_by_object_id.clear()
+        self._object_id_by_name.clear()
     
     def get_or_create(self, player_name: str, guild_name: str = "", alliance_name: str = "") -> Player:
         """Busca ou cria jogador."""
@@ -53,12 +102,57 @@ class PlayersStorage:
             player = self.add(player_name, guild_name, alliance_name)
         return player
     
+    def update(self, player_name: str, guild_name: str = "", alliance_name: str = "",
+               object_id: Optional[int] = None) -> Player:
+        """
+        Busca ou cria jogador; guild/alliance informadas (não vazias) que
+        mudaram geram um registro novo no lugar do antigo. Com object_id,
+        atualiza também o índice por objectId.
+        """
+        if object_id is not None:
+            self.set_object_id(intern_str(player_name), object_id)
+        
+        player = self.get_by_name(player_name)
+        if player is None:
+            return self.add(player_name, guild_name, alliance_name)
+        
+        guild = guild_name or player.guild
+        alliance = alliance_name or player.alliance
+        if guild == player.guild and alliance == player.alliance:
+            return player
+        
+        updated = self.add(player_name, guild, alliance)
+        if self.self_player is player:
+            self.self_player = updated
+        return updated
+    
     def set_self(self, player: Player):
         """Define o jogador atual (self)."""
         self.self_player = player
         print(f"[INFO] Jogador identificado: {player.format_name()}")
     
+    def evict(self, now: float, ttl: float, max_size: int) -> int:
+        """Remove jogadores não vistos há mais de ttl e os menos vistos acima do limite (nunca o self)."""
+        self_player = self.self_player
+        
+        def is_self(player_name: str) -> bool:
+            return self_player is not None and player_name == self_player.name
+        
+        expired, excess = self._recency.victims(now, ttl, max_size, is_self)
+        for player_name in expired + excess:
+            del self.players[player_name]
+            self._recency.discard(player_name)
+            object_id = self._object_id_by_name.pop(player_name, None)
+            if object_id is not None:
+                del self._name_by_object_id[object_id]
+        
+        self.evicted_ttl += len(expired)
+        self.evicted_lru += len(excess)
+        return len(expired) + len(excess)
+    
     def clear(self):
         """Limpa todos os jogadores."""
         self.players.clear()
         self.self_player = None
+        self._recency.clear()
+        self.clear_object_ids()
@@ -0,0 +1,64 @@
+"""
+Recency Index - Último acesso de cada chave, do mais antigo ao mais recente
+Usado pelos storages para expirar entradas por TTL e limitar o tamanho (LRU).
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class RecencyIndex:
+    """Chave -> instante do último acesso, em ordem de acesso."""
+    
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._seen: "OrderedDict[Any, float]" = OrderedDict()
+        self._clock = clock
+    
+    def __len__(self) -> int:
+        return len(self._seen)
+    
+    def touch(self, key: Any):
+        """Marca a chave como usada agora."""
+        seen = self._seen
+        seen[key] = self._clock()
+        seen.move_to_end(key)
+    
+    def discard(self, key: Any):
+        self._seen.pop(key, None)
+    
+    def rename(self, old_key: Any, new_key: Any):
+        """Troca a chave (a troca conta como acesso)."""
+        if self._seen.pop(old_key, None) is not None:
+            self.touch(new_key)
+    
+    def clear(self):
+        self._seen.clear()
+    
+    def victims(self, now: float, ttl: float, max_size: int,
+                protected: Optional[Callable[[Any], bool]] = None) -> Tuple[List[Any], List[Any]]:
+        """
+        Chaves a remover: (expiradas pelo TTL, excedentes do limite LRU).
+        
+        Percorre do acesso mais antigo para o mais recente e para na primeira
+        chave que não está expirada quando o tamanho já está dentro do limite.
+        Chaves protegidas nunca são escolhidas. ttl/max_size 0 desativam a regra.
+        """
+        expired: List[Any] = []
+        excess: List[Any] = []
+        overflow = len(self._seen) - max_size if max_size else 0
+        
+        for key, seen in self._seen.items():
+            is_expired = ttl and now - seen > ttl
+            if not is_expired and overflow <= 0:
+                break
+            if protected is not None and protected(key):
+                continue
+            
+            if is_expired:
+                expired.append(key)
+            else:
+                excess.append(key)
+            overflow -= 1
+        
+        return expired, excess
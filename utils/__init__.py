@@ -1,5 +1,7 @@
 """Utils module."""
 
 from .uuid_helper import uuid_stringify
+from .intern_table import intern_str
+from .json_stream import iter_json_array
 
-__all__ = ['uuid_stringify']
+__all__ = ['uuid_stringify', 'intern_str', 'iter_json_array']
@@ -0,0 +1,18 @@
+"""
+Intern Table - Uma única cópia de cada string repetida
+Item ids, nomes de jogador, guilds e alliances se repetem em milhares de
+registros; passar por aqui na entrada (storage, catálogo, ring/daemon) faz
+todos apontarem para o mesmo objeto. Usa a tabela de sys.intern: a string
+sai da tabela quando nenhum registro a referencia mais, então a tabela não
+cresce além do que o storage mantém.
+"""
+
+import sys
+from typing import Optional
+
+
+def intern_str(value: Optional[str]) -> Optional[str]:
+    """Versão compartilhada da string (None e não-strings passam direto)."""
+    if value.__class__ is str:
+        return sys.intern(value)
+    return value
@@ -0,0 +1,83 @@
+"""
+JSON Stream - Elementos de um array JSON lidos em pedaços
+Para arquivos grandes como o items.json do ao-bin-dumps: só o pedaço atual
+e o elemento sendo decodificado ficam em memória, em vez do texto inteiro
+mais a lista inteira já decodificada.
+"""
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+def iter_json_array(chunks: Iterable[bytes], encoding: str = 'utf-8-sig') -> Iterator[Any]:
+    """Gera cada elemento do array JSON de nível superior, na ordem."""
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    source = iter(chunks)
+    
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+    
+    def fill() -> bool:
+        """Acrescenta o próximo pedaço ao buffer (descartando o já consumido)."""
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        for chunk in source:
+            if chunk:
+                buffer = buffer[pos:] + text_decoder.decode(chunk)
+                pos = 0
+                return True
+        buffer = buffer[pos:] + text_decoder.decode(b"", final=True)
+        pos = 0
+        eof = True
+        return False
+    
+    def next_token() -> str:
+        """Primeiro caractere não-branco a partir de pos ("" no fim)."""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return ""
+    
+    if next_token() != "[":
+        raise ValueError("JSON não começa com um array")
+    pos += 1
+    
+    while True:
+        token = next_token()
+        if token == "]":
+            return
+        if token == "":
+            raise ValueError("Array JSON terminou no meio")
+        if started:
+            if token != ",":
+                raise ValueError(f"Esperado ',' ou ']' no array JSON, encontrado {token!r}")
+            pos += 1
+            next_token()
+        started = True
+        
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # Sem delimitador depois, o valor pode estar cortado (ex: "-25" de "-2500.0")
+                if eof or (end < len(buffer) and buffer[end] in _DELIMITERS):
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+        
+        pos = end
+        yield value
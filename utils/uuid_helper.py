@@ -1,24 +1,15 @@
-"""UUID Helper - converte array de bytes para UUID string."""
+"""UUID Helper - converte os 16 bytes de um UUID para string (só para exibição)."""
 
-from typing import List
+from typing import Sequence, Union
+from uuid import UUID
 
 
-def uuid_stringify(arr: List[int], offset: int = 0) -> str:
+def uuid_stringify(arr: Union[bytes, Sequence[int]], offset: int = 0) -> str:
     """
-    Converte array de 16 bytes para formato UUID string.
-    Formato: XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX
+    Converte 16 bytes (bytes ou sequência de ints) para formato UUID string.
+    Formato: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx
     """
     if len(arr) < offset + 16:
         raise ValueError("Array deve ter pelo menos 16 bytes")
     
-    hex_bytes = [f"{arr[offset + i]:02x}" for i in range(16)]
-    
-    uuid = (
-        "".join(hex_bytes[0:4]) + "-" +
-        "".join(hex_bytes[4:6]) + "-" +
-        "".join(hex_bytes[6:8]) + "-" +
-        "".join(hex_bytes[8:10]) + "-" +
-        "".join(hex_bytes[10:16])
-    )
-    
-    return uuid.lower()
+    return str(UUID(bytes=bytes(arr[offset:offset + 16])))